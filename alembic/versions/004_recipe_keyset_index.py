@@ -0,0 +1,25 @@
+"""Add composite index for keyset pagination of recipes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+Cursor pagination seeks on (name, id); this index serves both the
+WHERE (name, id) > (:name, :id) predicate and the ORDER BY.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_recipes_name_id', 'recipes', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipes_name_id', table_name='recipes')
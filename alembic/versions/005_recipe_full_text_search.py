@@ -0,0 +1,66 @@
+"""Add full-text search documents to recipes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+Adds diacritic-folded search_name / search_text columns (maintained by
+RecipeService) and backfills them. On PostgreSQL a stored generated
+tsvector column weights name terms 'A' and the rest 'B', with a GIN index.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.text_utils import build_search_document
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('recipes', sa.Column('search_name', sa.String(length=200), nullable=True))
+    op.add_column('recipes', sa.Column('search_text', sa.Text(), nullable=True))
+
+    # Backfill existing recipes
+    conn = op.get_bind()
+    recipes = conn.execute(sa.text(
+        "SELECT id, name, description, cuisine FROM recipes"
+    )).fetchall()
+    steps = conn.execute(sa.text(
+        "SELECT recipe_id, instruction FROM steps ORDER BY recipe_id, step_number"
+    )).fetchall()
+    instructions = {}
+    for recipe_id, instruction in steps:
+        instructions.setdefault(recipe_id, []).append(instruction)
+
+    for recipe_id, name, description, cuisine in recipes:
+        search_name, search_text = build_search_document(
+            name, description, cuisine, instructions.get(recipe_id, [])
+        )
+        conn.execute(
+            sa.text("UPDATE recipes SET search_name = :search_name, search_text = :search_text WHERE id = :id"),
+            {'id': recipe_id, 'search_name': search_name, 'search_text': search_text}
+        )
+
+    if conn.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE recipes ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(search_name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(search_text, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_recipes_search_vector ON recipes USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_recipes_search_vector")
+        op.drop_column('recipes', 'search_vector')
+    op.drop_column('recipes', 'search_text')
+    op.drop_column('recipes', 'search_name')
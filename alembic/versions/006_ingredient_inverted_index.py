@@ -0,0 +1,43 @@
+"""Add normalized ingredient names for the ingredient -> recipe inverted index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+Stores the diacritic-folded ingredient name and indexes (normalized_name,
+recipe_id) so "which recipes use X" is an index range scan.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.text_utils import fold_text
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingredients', sa.Column('normalized_name', sa.String(length=200), nullable=True))
+
+    # Backfill existing ingredients
+    conn = op.get_bind()
+    names = conn.execute(sa.text("SELECT DISTINCT name FROM ingredients")).fetchall()
+    for (name,) in names:
+        conn.execute(
+            sa.text("UPDATE ingredients SET normalized_name = :normalized_name WHERE name = :name"),
+            {'name': name, 'normalized_name': fold_text(name)}
+        )
+
+    op.create_index(
+        'ix_ingredients_normalized_name_recipe_id', 'ingredients',
+        ['normalized_name', 'recipe_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingredients_normalized_name_recipe_id', table_name='ingredients')
+    op.drop_column('ingredients', 'normalized_name')
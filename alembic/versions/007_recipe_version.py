@@ -0,0 +1,26 @@
+"""Add a version counter to recipes for ETags
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+RecipeService bumps recipes.version whenever a recipe, its ingredients or
+its steps change; conditional GETs compare it without loading children.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('recipes', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('recipes', 'version')
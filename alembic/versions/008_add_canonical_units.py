@@ -0,0 +1,49 @@
+"""Add canonical quantity/unit columns to ingredients and pantry
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+Stores every amount converted to its dimension's canonical unit (g, ml, piece;
+see backend/units.py) so shopping lists add 500 g and 1 kg of the same item and
+subtract pantry stock kept in another unit.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.units import to_canonical
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('ingredients', 'pantry')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('canonical_quantity', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('canonical_unit', sa.String(length=50), nullable=True))
+
+    # Backfill: one UPDATE per distinct unit, the factor applied in SQL
+    conn = op.get_bind()
+    for table in TABLES:
+        units = conn.execute(sa.text(f"SELECT DISTINCT unit FROM {table}")).fetchall()
+        for (unit,) in units:
+            factor, canonical_unit = to_canonical(1.0, unit)
+            conn.execute(
+                sa.text(
+                    f"UPDATE {table} SET canonical_quantity = quantity * :factor, "
+                    f"canonical_unit = :canonical_unit WHERE unit = :unit"
+                ),
+                {'factor': factor, 'canonical_unit': canonical_unit, 'unit': unit}
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'canonical_unit')
+        op.drop_column(table, 'canonical_quantity')
@@ -0,0 +1,140 @@
+"""Add the ingredient catalog and link ingredients and pantry items to it
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+ingredient_catalog holds one row per normalized ingredient ("onion");
+ingredient_aliases maps every folded spelling seen ("onion", "onions") to it.
+ingredients.catalog_id and pantry.catalog_id let matching and aggregation
+group on small integer keys instead of free-text names. Pantry items that turn
+out to be spellings of one entry ("Salt", "salt") are merged into the oldest,
+and pantry.catalog_id is unique from then on.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.text_utils import fold_text, ingredient_key
+from backend.units import from_canonical, to_canonical
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LINKED_TABLES = ('ingredients', 'pantry')
+
+
+def upgrade() -> None:
+    catalog = op.create_table(
+        'ingredient_catalog',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('display_name', sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_ingredient_catalog_id'), 'ingredient_catalog', ['id'], unique=False)
+    aliases = op.create_table(
+        'ingredient_aliases',
+        sa.Column('alias', sa.String(length=200), nullable=False),
+        sa.Column('catalog_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['catalog_id'], ['ingredient_catalog.id']),
+        sa.PrimaryKeyConstraint('alias')
+    )
+
+    conn = op.get_bind()
+    for table in LINKED_TABLES:
+        op.add_column(table, sa.Column('catalog_id', sa.Integer(), nullable=True))
+        # SQLite cannot add a constraint to an existing table; the column still holds the IDs
+        if conn.dialect.name != 'sqlite':
+            op.create_foreign_key(
+                f'fk_{table}_catalog_id', table, 'ingredient_catalog', ['catalog_id'], ['id']
+            )
+
+    # Backfill: every distinct name becomes an alias of its catalog key; the first
+    # spelling seen (recipes first, then pantry) is the display name
+    names = []
+    for table in LINKED_TABLES:
+        names.extend(
+            name for (name,) in
+            conn.execute(sa.text(f"SELECT name FROM {table} GROUP BY name ORDER BY MIN(id)")).fetchall()
+        )
+    catalog_ids, alias_ids, catalog_rows, alias_rows = {}, {}, [], []
+    for name in names:
+        alias, key = fold_text(name), ingredient_key(name)
+        if key not in catalog_ids:
+            catalog_ids[key] = len(catalog_ids) + 1
+            catalog_rows.append({'id': catalog_ids[key], 'name': key, 'display_name': name})
+        if alias not in alias_ids:
+            alias_ids[alias] = catalog_ids[key]
+            alias_rows.append({'alias': alias, 'catalog_id': catalog_ids[key]})
+    if catalog_rows:
+        op.bulk_insert(catalog, catalog_rows)
+        op.bulk_insert(aliases, alias_rows)
+        if conn.dialect.name == 'postgresql':
+            conn.execute(sa.text(
+                "SELECT setval(pg_get_serial_sequence('ingredient_catalog', 'id'), "
+                "(SELECT MAX(id) FROM ingredient_catalog))"
+            ))
+        for table in LINKED_TABLES:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET catalog_id = :catalog_id WHERE name = :name"),
+                [{'name': name, 'catalog_id': alias_ids[fold_text(name)]} for name in set(names)]
+            )
+        merge_pantry_duplicates(conn)
+
+    op.create_index(op.f('ix_ingredients_catalog_id'), 'ingredients', ['catalog_id'], unique=False)
+    op.create_index(op.f('ix_pantry_catalog_id'), 'pantry', ['catalog_id'], unique=True)
+
+
+def merge_pantry_duplicates(conn) -> None:
+    """Fold pantry rows sharing a catalog entry into the oldest, the way upserts would have
+
+    Same dimension: canonical amounts add up, expressed in the later row's unit;
+    otherwise raw quantities add up and the later unit wins.
+    """
+    rows = conn.execute(sa.text(
+        "SELECT id, catalog_id, quantity, unit, canonical_quantity, canonical_unit FROM pantry "
+        "WHERE catalog_id IN (SELECT catalog_id FROM pantry GROUP BY catalog_id HAVING COUNT(*) > 1) "
+        "ORDER BY id"
+    )).fetchall()
+    kept, merged = {}, []
+    for pantry_id, catalog_id, quantity, unit, canonical_quantity, canonical_unit in rows:
+        row = kept.get(catalog_id)
+        if row is None:
+            kept[catalog_id] = {
+                'id': pantry_id, 'quantity': quantity, 'unit': unit,
+                'canonical_quantity': canonical_quantity, 'canonical_unit': canonical_unit
+            }
+            continue
+        if row['canonical_unit'] == canonical_unit:
+            quantity = from_canonical(row['canonical_quantity'] + canonical_quantity, unit)
+        else:
+            quantity = row['quantity'] + quantity
+        row['quantity'], row['unit'] = quantity, unit
+        row['canonical_quantity'], row['canonical_unit'] = to_canonical(quantity, unit)
+        merged.append({'id': pantry_id})
+    if merged:
+        conn.execute(sa.text("DELETE FROM pantry WHERE id = :id"), merged)
+        conn.execute(
+            sa.text(
+                "UPDATE pantry SET quantity = :quantity, unit = :unit, "
+                "canonical_quantity = :canonical_quantity, canonical_unit = :canonical_unit WHERE id = :id"
+            ),
+            list(kept.values())
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table in LINKED_TABLES:
+        if conn.dialect.name != 'sqlite':
+            op.drop_constraint(f'fk_{table}_catalog_id', table, type_='foreignkey')
+        op.drop_index(op.f(f'ix_{table}_catalog_id'), table_name=table)
+        op.drop_column(table, 'catalog_id')
+    op.drop_table('ingredient_aliases')
+    op.drop_index(op.f('ix_ingredient_catalog_id'), table_name='ingredient_catalog')
+    op.drop_table('ingredient_catalog')
@@ -0,0 +1,51 @@
+"""Add stored listing columns and composite indexes for filtered, sorted recipe lists
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+GET /api/recipes filters on cuisine, total time and ingredient count and sorts
+by name, time or newest. total_time_minutes and ingredient_count are stored
+(and maintained by RecipeService) so they can be indexed; every sort key has
+an index of its own and one behind the cuisine equality filter, so a page is
+read in index order and stops at its LIMIT. The ingredient-count range filter
+has the same pair, for the shapes whose sort key cannot narrow it.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns); ix_recipes_name_id (004) and the primary key serve the unfiltered name and newest sorts
+LIST_INDEXES = (
+    ('ix_recipes_cuisine_name_id', ['cuisine', 'name', 'id']),
+    ('ix_recipes_total_time_id', ['total_time_minutes', 'id']),
+    ('ix_recipes_cuisine_total_time_id', ['cuisine', 'total_time_minutes', 'id']),
+    ('ix_recipes_cuisine_id', ['cuisine', 'id']),
+    ('ix_recipes_ingredient_count_id', ['ingredient_count', 'id']),
+    ('ix_recipes_cuisine_ingredient_count_id', ['cuisine', 'ingredient_count', 'id']),
+)
+
+
+def upgrade() -> None:
+    op.add_column('recipes', sa.Column('total_time_minutes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('recipes', sa.Column('ingredient_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        "UPDATE recipes SET "
+        "total_time_minutes = COALESCE(prep_time_minutes, 0) + COALESCE(cook_time_minutes, 0), "
+        "ingredient_count = (SELECT COUNT(*) FROM ingredients WHERE ingredients.recipe_id = recipes.id)"
+    )
+    for name, columns in LIST_INDEXES:
+        op.create_index(name, 'recipes', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(LIST_INDEXES):
+        op.drop_index(name, table_name='recipes')
+    op.drop_column('recipes', 'ingredient_count')
+    op.drop_column('recipes', 'total_time_minutes')
@@ -0,0 +1,48 @@
+"""Add the recipe_facets summary table behind GET /api/recipes/facets
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+One row per (facet, value) with the number of recipes in it: cuisines,
+total-time buckets and ingredient-count buckets (backend.business_layer.facets).
+RecipeService adjusts the counts in the same transaction as each recipe
+write; this migration backfills them once from the existing recipes.
+"""
+from collections import Counter
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from backend.business_layer.facets import facet_keys
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    facets = op.create_table(
+        'recipe_facets',
+        sa.Column('facet', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('facet', 'value')
+    )
+
+    counts = Counter()
+    rows = op.get_bind().execute(sa.text(
+        "SELECT cuisine, total_time_minutes, ingredient_count FROM recipes"
+    )).fetchall()
+    for cuisine, total_time, ingredient_count in rows:
+        counts.update(facet_keys(cuisine, total_time, ingredient_count))
+    if counts:
+        op.bulk_insert(facets, [
+            {'facet': facet, 'value': value, 'count': count} for (facet, value), count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('recipe_facets')
@@ -2,5 +2,7 @@
 from .recipe_service import RecipeService
 from .pantry_service import PantryService
 from .shopping_list_service import ShoppingListService
+from .meal_plan_service import MealPlanService
+from .catalog_service import IngredientCatalogService
 
-__all__ = ['RecipeService', 'PantryService', 'ShoppingListService']
+__all__ = ['RecipeService', 'PantryService', 'ShoppingListService', 'MealPlanService', 'IngredientCatalogService']
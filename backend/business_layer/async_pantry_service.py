@@ -0,0 +1,26 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Async Pantry Service
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from backend.data_layer.async_pantry_repository import AsyncPantryRepository
+from backend.business_layer.pantry_service import PantryService
+from backend.models import Pantry
+
+
+class AsyncPantryService:
+    """Async service for pantry reads"""
+
+    @staticmethod
+    async def get_all_pantry_items(db: AsyncSession) -> List[Pantry]:
+        """Get all pantry items"""
+        return await AsyncPantryRepository.get_all(db)
+
+    @staticmethod
+    async def get_pantry_item(db: AsyncSession, pantry_id: int) -> Optional[Pantry]:
+        """Get pantry item by ID"""
+        return await AsyncPantryRepository.get_by_id(db, pantry_id)
+
+    @staticmethod
+    async def suggest_ingredient_names(db: AsyncSession, prefix: str, limit: int = 10) -> List[str]:
+        """Type-ahead ingredient names used by recipes, ignoring accents"""
+        return await db.run_sync(PantryService.suggest_ingredient_names, prefix, limit)
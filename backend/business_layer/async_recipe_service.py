@@ -0,0 +1,168 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Async Recipe Service
+#
+# Async counterpart of RecipeService for the read endpoints. Plain lookups are
+# awaited natively through AsyncRecipeRepository; the index-backed reads (search,
+# suggestions, ingredient matching, sparse pages) run RecipeService itself on the
+# session's connection with run_sync, so their rules live in one place.
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from backend.data_layer.async_recipe_repository import AsyncRecipeRepository
+from backend.models import Recipe
+from backend import schemas
+from backend.business_layer.recipe_cache import recipe_cache
+from backend.business_layer.recipe_service import MAX_BATCH_IDS, RecipeService, _filter_values
+
+
+class AsyncRecipeService:
+    """Async service for recipe reads"""
+
+    @staticmethod
+    async def get_all_recipes(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> List[Recipe]:
+        """Get all recipes matching `filters` with pagination, by ID unless `sort` is given"""
+        return await AsyncRecipeRepository.get_all(db, skip, limit, filters=_filter_values(filters), sort=sort)
+
+    @staticmethod
+    async def get_recipes_page(
+        db: AsyncSession,
+        cursor: Optional[str],
+        limit: int = 100,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Recipe], Optional[str]]:
+        """Get one keyset page of recipes (see RecipeService.get_recipes_page)"""
+        sort = sort or "name"
+        after = RecipeService._decode_cursor(cursor, sort, limit)
+        recipes = await AsyncRecipeRepository.get_page_after(
+            db, after, limit + 1, filters=_filter_values(filters), sort=sort
+        )
+        if len(recipes) <= limit:
+            return recipes, None
+
+        recipes = recipes[:limit]
+        return recipes, RecipeService._encode_cursor(sort, lambda name: getattr(recipes[-1], name))
+
+    @staticmethod
+    async def get_recipes_versions(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Tuple[int, int]], bool]:
+        """(id, version) pairs of a page, plus whether a next keyset page exists"""
+        if cursor is None:
+            return await AsyncRecipeRepository.get_versions(
+                db, skip, limit, filters=_filter_values(filters), sort=sort
+            ), False
+        sort = sort or "name"
+        after = RecipeService._decode_cursor(cursor, sort, limit)
+        versions = await AsyncRecipeRepository.get_page_versions_after(
+            db, after, limit + 1, filters=_filter_values(filters), sort=sort
+        )
+        return versions[:limit], len(versions) > limit
+
+    @staticmethod
+    async def get_recipe_version(db: AsyncSession, recipe_id: int) -> Optional[int]:
+        """Current version of a recipe, or None if it does not exist"""
+        return await AsyncRecipeRepository.get_version(db, recipe_id)
+
+    @staticmethod
+    async def get_recipe(db: AsyncSession, recipe_id: int) -> Optional[schemas.Recipe]:
+        """Get recipe by ID as a serialized schema, read through the recipe cache"""
+        cached = recipe_cache.get(recipe_id)
+        if cached is not None:
+            return cached
+
+        token = recipe_cache.begin(recipe_id)
+        recipe = await AsyncRecipeRepository.get_by_id(db, recipe_id)
+        if not recipe:
+            return None
+        serialized = schemas.Recipe.model_validate(recipe)
+        recipe_cache.set(recipe_id, serialized, token)
+        return serialized
+
+    @staticmethod
+    async def get_recipes_batch(
+        db: AsyncSession,
+        recipe_ids: List[int]
+    ) -> Tuple[List[schemas.Recipe], List[int]]:
+        """Get many recipes by ID, plus the IDs that do not exist (see RecipeService.get_recipes_batch)"""
+        wanted = list(dict.fromkeys(recipe_ids))
+        if len(wanted) > MAX_BATCH_IDS:
+            raise ValueError(f"At most {MAX_BATCH_IDS} recipe IDs per batch")
+
+        found = {}
+        for recipe_id in wanted:
+            cached = recipe_cache.get(recipe_id)
+            if cached is not None:
+                found[recipe_id] = cached
+
+        tokens = {recipe_id: recipe_cache.begin(recipe_id) for recipe_id in wanted if recipe_id not in found}
+        if tokens:
+            for recipe in await AsyncRecipeRepository.get_many(db, list(tokens)):
+                serialized = schemas.Recipe.model_validate(recipe)
+                recipe_cache.set(recipe.id, serialized, tokens[recipe.id])
+                found[recipe.id] = serialized
+
+        return (
+            [found[recipe_id] for recipe_id in wanted if recipe_id in found],
+            [recipe_id for recipe_id in wanted if recipe_id not in found]
+        )
+
+    @staticmethod
+    async def get_recipe_fields(
+        db: AsyncSession,
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str], List[Tuple[int, int]]]:
+        """Sparse page of recipes (see RecipeService.get_recipe_fields)"""
+        return await db.run_sync(
+            RecipeService.get_recipe_fields, fields, include, skip, limit, cursor, filters, sort
+        )
+
+    @staticmethod
+    async def search_recipes(db: AsyncSession, query: str, skip: int = 0, limit: int = 20) -> List[Recipe]:
+        """Full-text search, best match first (see RecipeService.search_recipes)"""
+        return await db.run_sync(RecipeService.search_recipes, query, skip, limit)
+
+    @staticmethod
+    async def suggest_recipes(db: AsyncSession, prefix: str, limit: int = 10) -> List[schemas.RecipeSuggestion]:
+        """Type-ahead recipe names matching a word prefix"""
+        return await db.run_sync(RecipeService.suggest_recipes, prefix, limit)
+
+    @staticmethod
+    async def find_recipes_by_ingredients(
+        db: AsyncSession,
+        ingredients: List[str],
+        match_all: bool = True,
+        limit: int = 50
+    ) -> List[schemas.RecipeMatch]:
+        """Recipes using all (or any) of the given ingredients"""
+        return await db.run_sync(RecipeService.find_recipes_by_ingredients, ingredients, match_all, limit)
+
+    @staticmethod
+    async def rank_by_pantry_coverage(
+        db: AsyncSession,
+        min_coverage: float = 0.0,
+        limit: int = 20
+    ) -> List[schemas.RecipeMatch]:
+        """Recipes ranked by the fraction of their ingredients already in the pantry"""
+        return await db.run_sync(RecipeService.rank_by_pantry_coverage, min_coverage, limit)
+
+    @staticmethod
+    async def scale_recipe(db: AsyncSession, recipe_id: int, scale_factor: float) -> Optional[Dict]:
+        """Scale recipe ingredients by factor"""
+        return await db.run_sync(RecipeService.scale_recipe, recipe_id, scale_factor)
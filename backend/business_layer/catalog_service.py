@@ -0,0 +1,43 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Ingredient Catalog Service
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List
+from backend.data_layer import IngredientCatalogRepository
+from backend.text_utils import fold_text, ingredient_key
+
+
+class IngredientCatalogService:
+    """Resolves free-text ingredient names to integer catalog IDs.
+
+    A name is looked up by its folded alias ("Onions" -> "onions"); unknown aliases
+    are registered under their catalog key ("onion"), so "Onion", "onion" and
+    "Onions" share one ID.
+    """
+
+    @staticmethod
+    def resolve(db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Catalog ID per name, registering new names (one query when all are known).
+
+        Names are taken in the order given, so a new entry's display name is its
+        first spelling.
+        """
+        aliases = {name: fold_text(name) for name in names}
+        known = IngredientCatalogRepository.get_ids_by_alias(db, set(aliases.values()))
+        missing = {}
+        for name, alias in aliases.items():
+            if alias not in known and alias not in missing:
+                missing[alias] = (ingredient_key(name), name)
+        known.update(IngredientCatalogRepository.add_aliases(db, missing))
+        return {name: known[alias] for name, alias in aliases.items()}
+
+    @staticmethod
+    def link(db: Session, items: List):
+        """Set catalog_id on ingredient or pantry rows that have none yet"""
+        unlinked = [item for item in items if item.catalog_id is None]
+        if not unlinked:
+            return
+        # Pending rows must not be flushed by the lookup before their catalog_id is set
+        with db.no_autoflush:
+            ids = IngredientCatalogService.resolve(db, [item.name for item in unlinked])
+        for item in unlinked:
+            item.catalog_id = ids[item.name]
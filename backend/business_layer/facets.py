@@ -0,0 +1,40 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Recipe facet buckets
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+# Inclusive (low, high) ranges, high None for open-ended; they line up with the
+# min_/max_ list filters so a bucket can be applied as a filter as is
+TIME_BUCKETS = ((0, 15), (16, 30), (31, 60), (61, None))
+INGREDIENT_BUCKETS = ((0, 5), (6, 10), (11, None))
+
+FacetKey = Tuple[str, str]
+
+
+def bucket_label(low: int, high: Optional[int]) -> str:
+    return f"{low}+" if high is None else f"{low}-{high}"
+
+
+def _bucket(value: int, buckets: Tuple) -> str:
+    for low, high in buckets:
+        if high is None or value <= high:
+            return bucket_label(low, high)
+    raise ValueError(f"{value} is outside the buckets")
+
+
+def facet_keys(cuisine: Optional[str], total_time: int, ingredient_count: int) -> List[FacetKey]:
+    """The (facet, value) pairs one recipe counts towards; recipes without a cuisine skip that facet"""
+    keys = [
+        ("total_time", _bucket(total_time, TIME_BUCKETS)),
+        ("ingredient_count", _bucket(ingredient_count, INGREDIENT_BUCKETS)),
+    ]
+    if cuisine:
+        keys.append(("cuisine", cuisine))
+    return keys
+
+
+def facet_deltas(removed: Iterable[FacetKey] = (), added: Iterable[FacetKey] = ()) -> Counter:
+    """Net count change per key, without the keys that cancel out"""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    return Counter({key: delta for key, delta in deltas.items() if delta})
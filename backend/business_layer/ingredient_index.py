@@ -0,0 +1,111 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - In-memory mirror of the ingredient -> recipe inverted index
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class IngredientIndex:
+    """Maps ingredient catalog keys to recipe ids and back.
+
+    Keys are text_utils.ingredient_key of ingredients.normalized_name (indexed with
+    recipe_id in the database), the same key the ingredient catalog uses, so
+    "Onion" and "onions" are one ingredient. Ingredient queries are answered with
+    set operations instead of loading recipes. Built from the database at startup
+    and kept current by RecipeService.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recipes_by_ingredient: Dict[str, Set[int]] = {}
+        self._ingredients_by_recipe: Dict[int, FrozenSet[str]] = {}
+        self.built = False
+
+    def reset(self):
+        """Drop all entries and mark the index as not built"""
+        with self._lock:
+            self._recipes_by_ingredient.clear()
+            self._ingredients_by_recipe.clear()
+            self.built = False
+
+    def rebuild(self, pairs: Iterable[Tuple[int, str]]):
+        """Replace the contents with (recipe_id, ingredient key) pairs"""
+        names_by_recipe: Dict[int, Set[str]] = {}
+        for recipe_id, name in pairs:
+            names_by_recipe.setdefault(recipe_id, set()).add(name)
+        with self._lock:
+            self._recipes_by_ingredient.clear()
+            self._ingredients_by_recipe.clear()
+            for recipe_id, names in names_by_recipe.items():
+                self._set(recipe_id, names)
+            self.built = True
+
+    def set_recipe(self, recipe_id: int, names: Iterable[str]):
+        """Replace the ingredient set indexed for a recipe"""
+        with self._lock:
+            if self.built:
+                self._remove(recipe_id)
+                self._set(recipe_id, set(names))
+
+    def remove_recipe(self, recipe_id: int):
+        """Drop a recipe from the index"""
+        with self._lock:
+            if self.built:
+                self._remove(recipe_id)
+
+    def recipes_with_all(self, names: Iterable[str]) -> Set[int]:
+        """Recipes using every one of `names`"""
+        with self._lock:
+            postings = sorted(
+                (self._recipes_by_ingredient.get(name, set()) for name in set(names)), key=len
+            )
+            if not postings:
+                return set()
+            return postings[0].intersection(*postings[1:])
+
+    def recipes_with_any(self, names: Iterable[str]) -> Dict[int, int]:
+        """Recipes using at least one of `names`, with how many of them each uses"""
+        matches: Dict[int, int] = {}
+        with self._lock:
+            for name in set(names):
+                for recipe_id in self._recipes_by_ingredient.get(name, ()):
+                    matches[recipe_id] = matches.get(recipe_id, 0) + 1
+        return matches
+
+    def ingredients_of(self, recipe_ids: Iterable[int]) -> Dict[int, FrozenSet[str]]:
+        """Ingredient keys of each recipe"""
+        with self._lock:
+            return {
+                recipe_id: self._ingredients_by_recipe.get(recipe_id, frozenset())
+                for recipe_id in recipe_ids
+            }
+
+    def coverage(self, available: Iterable[str]) -> List[Tuple[int, int, int]]:
+        """(recipe_id, covered, total) for recipes sharing an ingredient with `available`"""
+        available = set(available)
+        with self._lock:
+            candidates: Set[int] = set()
+            for name in available:
+                candidates |= self._recipes_by_ingredient.get(name, set())
+            return [
+                (recipe_id, len(self._ingredients_by_recipe[recipe_id] & available),
+                 len(self._ingredients_by_recipe[recipe_id]))
+                for recipe_id in candidates
+            ]
+
+    def _set(self, recipe_id: int, names: Set[str]):
+        if not names:
+            return
+        self._ingredients_by_recipe[recipe_id] = frozenset(names)
+        for name in names:
+            self._recipes_by_ingredient.setdefault(name, set()).add(recipe_id)
+
+    def _remove(self, recipe_id: int):
+        for name in self._ingredients_by_recipe.pop(recipe_id, ()):
+            recipes = self._recipes_by_ingredient.get(name)
+            if recipes is not None:
+                recipes.discard(recipe_id)
+                if not recipes:
+                    del self._recipes_by_ingredient[name]
+
+
+recipe_ingredient_index = IngredientIndex()
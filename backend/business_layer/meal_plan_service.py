@@ -0,0 +1,100 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Meal Plan Service
+from array import array
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from backend.data_layer import RecipeRepository, IngredientRepository, PantryRepository
+from backend.business_layer.meal_planner import RecipeVector, run_search
+from backend.business_layer.recipe_cache import plan_memo
+from backend.business_layer.shopping_list_service import ShoppingListService
+from backend import config, schemas
+
+# Recipes whose ingredient rows are read per statement on a memo miss
+PLAN_LOAD_CHUNK = 1000
+
+
+class MealPlanService:
+    """Service for pantry-aware meal planning"""
+
+    @staticmethod
+    def plan_meals(db: Session, request: schemas.MealPlanRequest) -> schemas.MealPlan:
+        """Pick `days` recipes that use up the pantry and minimize shopping, plus their shopping list"""
+        recipe_ids, vectors, pantry = MealPlanService._encode(db, request.servings)
+        if len(recipe_ids) < request.days:
+            raise ValueError(f"Only {len(recipe_ids)} recipes with ingredients to plan {request.days} days from")
+
+        budget_ms = min(request.time_budget_ms or config.MEAL_PLAN_TIME_BUDGET_MS, config.MEAL_PLAN_TIME_BUDGET_MS)
+        rows = run_search(vectors, pantry, request.days, budget_ms / 1000)
+        planned = [recipe_ids[row] for row in rows]
+
+        entries = [
+            schemas.ShoppingListEntry(recipe_id=recipe_id, servings=request.servings)
+            for recipe_id in planned
+        ]
+        return schemas.MealPlan(
+            recipes=[
+                schemas.RecipeSummary.model_validate(recipe)
+                for recipe in RecipeRepository.get_many(db, planned, profile="bare")
+            ],
+            shopping_list=ShoppingListService.generate_shopping_list(db, entries)
+        )
+
+    @staticmethod
+    def _encode(db: Session, servings: Optional[int]) -> Tuple[List[int], List[RecipeVector], array]:
+        """Recipe x ingredient matrix with (catalog ID, fallback name, canonical unit) mapped to small ints.
+
+        Returns the recipe ID of each row, each row as (keys, quantities) arrays
+        scaled to the target servings, and the pantry stock per key.
+        """
+        keys: Dict[Tuple[Optional[int], Optional[str], str], int] = {}
+        recipe_ids, vectors = [], []
+        for recipe_id, (base_servings, row_keys, quantities) in MealPlanService._load_rows(db).items():
+            weight = servings / (base_servings or 1) if servings else 1
+            recipe_ids.append(recipe_id)
+            vectors.append((
+                array("i", (keys.setdefault(key, len(keys)) for key in row_keys)),
+                array("d", (quantity * weight for quantity in quantities))
+            ))
+
+        pantry = array("d", bytes(8 * len(keys)))
+        for item in PantryRepository.get_all(db):
+            key = keys.get((item.catalog_id, None, item.canonical_unit))
+            if key is not None:
+                pantry[key] = item.canonical_quantity
+        return recipe_ids, vectors, pantry
+
+    @staticmethod
+    def _load_rows(db: Session) -> Dict[int, Tuple]:
+        """(servings, (catalog ID, fallback name, canonical unit) keys, base quantities) per recipe
+        with ingredients, by ID; see IngredientRepository.get_canonical_rows for the keys.
+
+        Rows are memoized per recipe with the version they were read at: a request
+        costs one (id, version) query plus ingredient reads for the recipes added or
+        changed since the last one.
+        """
+        rows: Dict[int, Optional[Tuple]] = {}
+        misses = []
+        for recipe_id, version in RecipeRepository.get_versions_with_ingredients(db):
+            memoized = plan_memo.get(recipe_id)
+            rows[recipe_id] = memoized[1:] if memoized is not None and memoized[0] == version else None
+            if rows[recipe_id] is None:
+                misses.append(recipe_id)
+
+        for start in range(0, len(misses), PLAN_LOAD_CHUNK):
+            chunk = misses[start:start + PLAN_LOAD_CHUNK]
+            tokens = {recipe_id: plan_memo.begin(recipe_id) for recipe_id in chunk}
+            merged: Dict[int, Dict[Tuple[Optional[int], Optional[str], str], float]] = {}
+            headers: Dict[int, Tuple[int, int]] = {}
+            for recipe_id, version, servings, catalog_id, fallback, _, canonical_unit, quantity in (
+                IngredientRepository.get_canonical_rows(db, chunk)
+            ):
+                headers[recipe_id] = (version, servings)
+                row = merged.setdefault(recipe_id, {})
+                key = (catalog_id, fallback, canonical_unit)
+                row[key] = row.get(key, 0) + quantity
+            for recipe_id, row in merged.items():
+                version, servings = headers[recipe_id]
+                rows[recipe_id] = (servings, tuple(row), array("d", row.values()))
+                plan_memo.set(recipe_id, (version,) + rows[recipe_id], tokens[recipe_id])
+        # Recipes deleted (or emptied) between the two reads drop out
+        return {recipe_id: row for recipe_id, row in rows.items() if row is not None}
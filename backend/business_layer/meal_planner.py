@@ -0,0 +1,136 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Meal-plan search over an integer-encoded recipe x ingredient matrix
+import multiprocessing
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+from backend import config
+
+# One recipe row of the matrix: ingredient keys (ints) and their canonical quantities
+RecipeVector = Tuple[array, array]
+
+# Allowance on top of the search budget for a worker to start (a fresh interpreter
+# imports the backend) and hand back its result; past it the request gives up
+RESULT_GRACE_SECONDS = 10.0
+
+# Workers never fork the (threaded) server process
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _cost(needed: float, stock: float) -> float:
+    """Share of an ingredient still to buy, minus the share of its pantry stock used up"""
+    cost = 0.0
+    if needed > 0:
+        cost += max(0.0, needed - stock) / needed
+    if stock > 0:
+        cost -= min(needed, stock) / stock
+    return cost
+
+
+def _delta(needed: List[float], pantry: Sequence[float], vector: RecipeVector, sign: int) -> float:
+    """Change in plan cost from adding (sign=1) or removing (sign=-1) one recipe"""
+    keys, quantities = vector
+    delta = 0.0
+    for key, quantity in zip(keys, quantities):
+        before = needed[key]
+        delta += _cost(before + sign * quantity, pantry[key]) - _cost(before, pantry[key])
+    return delta
+
+
+def _apply(needed: List[float], vector: RecipeVector, sign: int):
+    keys, quantities = vector
+    for key, quantity in zip(keys, quantities):
+        needed[key] += sign * quantity
+
+
+def search_plan(
+    recipes: List[RecipeVector],
+    pantry: array,
+    days: int,
+    time_budget: float,
+    seed: int = 0
+) -> List[int]:
+    """Pick `days` distinct recipe rows that use up the pantry and leave the least to buy.
+
+    Greedy construction (cheapest addition first), then first-improvement swaps
+    of one planned recipe for an unplanned one until no swap helps or the time
+    budget (seconds) runs out. If the budget runs out during construction, each
+    remaining day takes the cheapest row scanned so far (at least the first
+    unplanned one). Runs in a worker process: arguments are plain arrays.
+    """
+    deadline = time.monotonic() + time_budget
+    needed = [0.0] * len(pantry)
+    plan: List[int] = []
+    unplanned = set(range(len(recipes)))
+
+    for _ in range(min(days, len(recipes))):
+        best, best_cost = -1, 0.0
+        for row in range(len(recipes)):
+            if row not in unplanned:
+                continue
+            # Checked per candidate, so a large catalog cannot overrun the budget
+            if best >= 0 and time.monotonic() >= deadline:
+                break
+            cost = _delta(needed, pantry, recipes[row], 1)
+            if best < 0 or cost < best_cost:
+                best, best_cost = row, cost
+        _apply(needed, recipes[best], 1)
+        plan.append(best)
+        unplanned.discard(best)
+
+    rng = random.Random(seed)
+    candidates = sorted(unplanned)
+    stale, max_stale = 0, len(plan) * len(candidates)
+    while candidates and stale < max_stale and time.monotonic() < deadline:
+        slot = rng.randrange(len(plan))
+        index = rng.randrange(len(candidates))
+        out, into = plan[slot], candidates[index]
+        removed = _delta(needed, pantry, recipes[out], -1)
+        _apply(needed, recipes[out], -1)
+        if removed + _delta(needed, pantry, recipes[into], 1) < -1e-9:
+            _apply(needed, recipes[into], 1)
+            plan[slot], candidates[index] = into, out
+            stale = 0
+        else:
+            _apply(needed, recipes[out], 1)
+            stale += 1
+    return plan
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def run_search(recipes: List[RecipeVector], pantry: array, days: int, time_budget: float) -> List[int]:
+    """search_plan in the planner process pool, or inline when MEAL_PLAN_PROCESSES is 0.
+
+    Raises TimeoutError when the pool has no result within the time budget plus
+    RESULT_GRACE_SECONDS (all workers busy, or a worker stuck).
+    """
+    global _pool
+    if config.MEAL_PLAN_PROCESSES <= 0:
+        return search_plan(recipes, pantry, days, time_budget)
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=config.MEAL_PLAN_PROCESSES,
+                mp_context=multiprocessing.get_context(START_METHOD)
+            )
+    future = _pool.submit(search_plan, recipes, pantry, days, time_budget)
+    try:
+        return future.result(timeout=time_budget + RESULT_GRACE_SECONDS)
+    except TimeoutError:
+        future.cancel()
+        raise TimeoutError("Meal planning did not finish in time")
+
+
+def shutdown_pool():
+    """Stop the planner processes (application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
@@ -0,0 +1,25 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Opaque cursors for keyset pagination
+import base64
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(sort: str, key: Tuple[Any, ...]) -> str:
+    """Encode the sort name and the last row's sort key into an opaque cursor"""
+    payload = json.dumps({"s": sort, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    """Decode a cursor produced by encode_cursor; raise ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = tuple(payload["k"])
+        cursor_sort = payload["s"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    return key
@@ -1,12 +1,20 @@
 # Backend 3-Layer Architecture
 # Business Logic Layer - Pantry Service
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from backend.data_layer import PantryRepository
+from typing import Dict, List, Optional, Tuple
+from backend.data_layer import PantryRepository, IngredientRepository, RecipeRepository, UnitOfWork
+from backend.business_layer.catalog_service import IngredientCatalogService
+from backend.business_layer.recipe_service import RecipeService
+from backend.business_layer.suggest_index import ingredient_suggestions
 from backend.models import Pantry
+from backend.units import for_display, from_canonical, to_canonical
 from backend import schemas
 
 
+# Pantry rows per upsert statement in bulk adds
+UPSERT_BATCH_SIZE = 500
+
+
 class PantryService:
     """Service for pantry inventory business logic"""
     
@@ -20,36 +28,137 @@ class PantryService:
         """Get pantry item by ID"""
         return PantryRepository.get_by_id(db, pantry_id)
     
+    @staticmethod
+    def suggest_ingredient_names(db: Session, prefix: str, limit: int = 10) -> List[str]:
+        """Type-ahead for the pantry form: ingredient names used by recipes, ignoring accents"""
+        if not ingredient_suggestions.built:
+            RecipeService.build_indexes(db)
+        return [name for _, name in ingredient_suggestions.suggest(prefix, limit)]
+
     @staticmethod
     def create_pantry_item(db: Session, pantry_data: schemas.PantryCreate) -> Pantry:
-        """Create pantry item or update if exists"""
-        existing = PantryRepository.get_by_name(db, pantry_data.name)
-        if existing:
-            existing.quantity += pantry_data.quantity
-            existing.unit = pantry_data.unit
-            return PantryRepository.update(db, existing)
-        
-        new_pantry = Pantry(
-            name=pantry_data.name,
-            quantity=pantry_data.quantity,
-            unit=pantry_data.unit
-        )
-        return PantryRepository.create(db, new_pantry)
+        """Create pantry item or update if exists (one upsert statement)"""
+        with UnitOfWork(db):
+            return PantryRepository.upsert_many(db, PantryService._combine(db, [pantry_data]))[0]
+
+    @staticmethod
+    def add_pantry_items(db: Session, items: List[schemas.PantryCreate]) -> List[Pantry]:
+        """Add many pantry items in one transaction, a few hundred per upsert statement"""
+        with UnitOfWork(db):
+            rows = PantryService._combine(db, items)
+            return [
+                pantry
+                for start in range(0, len(rows), UPSERT_BATCH_SIZE)
+                for pantry in PantryRepository.upsert_many(db, rows[start:start + UPSERT_BATCH_SIZE])
+            ]
+
+    @staticmethod
+    def _combine(db: Session, items: List[schemas.PantryCreate]) -> List[Dict]:
+        """Upsert rows, one per catalog entry.
+
+        Repeats ("Salt", "salt") merge the way the upsert merges into a stored row,
+        under the first spelling.
+        """
+        catalog_ids = IngredientCatalogService.resolve(db, [item.name for item in items])
+        rows: Dict[int, Dict] = {}
+        for item in items:
+            catalog_id = catalog_ids[item.name]
+            canonical_quantity, canonical_unit = to_canonical(item.quantity, item.unit)
+            row = rows.get(catalog_id)
+            if row is not None:
+                if row["canonical_unit"] == canonical_unit:
+                    # Same dimension: add the amounts, expressed in the unit just entered
+                    quantity = from_canonical(row["canonical_quantity"] + canonical_quantity, item.unit)
+                else:
+                    quantity = row["quantity"] + item.quantity
+                canonical_quantity, canonical_unit = to_canonical(quantity, item.unit)
+            else:
+                quantity = item.quantity
+            rows[catalog_id] = {
+                "name": row["name"] if row is not None else item.name,
+                "quantity": quantity,
+                "unit": item.unit,
+                "canonical_quantity": canonical_quantity,
+                "canonical_unit": canonical_unit,
+                "catalog_id": catalog_id,
+            }
+        return list(rows.values())
     
     @staticmethod
     def update_pantry_item(db: Session, pantry_id: int, pantry_data: schemas.PantryUpdate) -> Optional[Pantry]:
         """Update pantry item"""
-        pantry = PantryRepository.get_by_id(db, pantry_id)
-        if not pantry:
-            return None
-        
-        update_fields = pantry_data.model_dump(exclude_unset=True)
-        for field, value in update_fields.items():
-            setattr(pantry, field, value)
-        
-        return PantryRepository.update(db, pantry)
+        with UnitOfWork(db):
+            pantry = PantryRepository.get_by_id(db, pantry_id)
+            if not pantry:
+                return None
+
+            update_fields = pantry_data.model_dump(exclude_unset=True)
+            for field, value in update_fields.items():
+                setattr(pantry, field, value)
+            PantryService._set_canonical(pantry)
+            IngredientCatalogService.link(db, [pantry])
+
+            return PantryRepository.update(db, pantry)
     
+    @staticmethod
+    def cook_recipe(db: Session, recipe_id: int, servings: Optional[float] = None) -> Optional[schemas.CookResult]:
+        """Take a recipe's ingredients out of the pantry (at `servings`, default the recipe's own).
+
+        The matching pantry rows are locked and decremented in one UPDATE, in one
+        transaction; a used-up item stays in the pantry at 0. What the pantry lacked
+        is returned as the shortfall.
+        """
+        used, used_items, shortfall = {}, [], []
+        with UnitOfWork(db):
+            rows = IngredientRepository.get_canonical_rows(db, [recipe_id])
+            if not rows and not RecipeRepository.get_by_id(db, recipe_id, profile="bare"):
+                return None
+            base_servings = rows[0][2] if rows else 1
+            weight = servings / (base_servings or 1) if servings else 1
+
+            needed: Dict[Tuple[Optional[int], Optional[str], str], float] = {}
+            names: Dict[Tuple[Optional[int], Optional[str]], str] = {}
+            for _, _, _, catalog_id, fallback, name, canonical_unit, quantity in rows:
+                key = (catalog_id, fallback, canonical_unit)
+                needed[key] = needed.get(key, 0) + quantity * weight
+                names[(catalog_id, fallback)] = name
+
+            # One pantry row per catalog entry; unlinked ingredients have none
+            stock = {
+                (pantry.catalog_id, pantry.canonical_unit): pantry
+                for pantry in PantryRepository.lock_by_catalog_ids(
+                    db, [catalog_id for catalog_id, _ in names if catalog_id is not None]
+                )
+            }
+            for (catalog_id, fallback, canonical_unit), amount in needed.items():
+                name = names[(catalog_id, fallback)]
+                pantry = stock.get((catalog_id, canonical_unit))
+                taken = min(amount, pantry.canonical_quantity) if pantry is not None else 0
+                if taken > 0:
+                    used[pantry.id] = (taken * pantry.quantity / pantry.canonical_quantity, taken)
+                    used_items.append(PantryService._amount(name, taken, canonical_unit))
+                if amount > taken:
+                    shortfall.append(PantryService._amount(name, amount - taken, canonical_unit))
+            PantryRepository.consume(db, used)
+
+        return schemas.CookResult(
+            recipe_id=recipe_id,
+            servings=servings or base_servings,
+            used=used_items,
+            shortfall=shortfall
+        )
+
+    @staticmethod
+    def _amount(name: str, canonical_quantity: float, canonical_unit: str) -> schemas.ShoppingItem:
+        quantity, unit = for_display(canonical_quantity, canonical_unit)
+        return schemas.ShoppingItem(name=name, quantity=quantity, unit=unit)
+
+    @staticmethod
+    def _set_canonical(pantry: Pantry):
+        pantry.canonical_quantity, pantry.canonical_unit = to_canonical(pantry.quantity, pantry.unit)
+
     @staticmethod
     def delete_pantry_item(db: Session, pantry_id: int) -> bool:
         """Delete pantry item"""
-        return PantryRepository.delete(db, pantry_id)
+        with UnitOfWork(db):
+            return PantryRepository.delete(db, pantry_id)
@@ -0,0 +1,151 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - Bounded LRU + TTL cache for serialized recipes
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from backend import config
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl_seconds`.
+
+    Readers take a token with `begin(key)` before loading from the database and
+    pass it to `set`; if the key was invalidated in between (a concurrent write),
+    the stale value is dropped instead of being cached. Invalidations are stamped
+    from a counter and only the latest `max_entries` are remembered; a load that
+    began before a forgotten one is dropped too, so the record stays bounded.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # key -> counter value of its last invalidation, oldest first
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._counter = 0
+        # Every invalidation older than those in _invalidated happened at or before this value
+        self._forgotten = 0
+        self._clock = clock
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        """Change limits or switch the cache on/off; clears entries and counters"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            if enabled is not None:
+                self.enabled = enabled
+        self.clear()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None, counting a hit or miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def begin(self, key: Hashable) -> int:
+        """Token to pass to `set` after loading `key`"""
+        with self._lock:
+            return self._counter
+
+    def set(self, key: Hashable, value: Any, token: int):
+        """Cache `value` unless `key` was invalidated since `begin` returned `token`"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._invalidated.get(key, self._forgotten) > token:
+                return
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop `key` and reject any load of it that is still in flight"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counter += 1
+            self._invalidated[key] = self._counter
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                _, self._forgotten = self._invalidated.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            # Loads in flight may predate the clear; reject them without keeping any keys
+            self._invalidated.clear()
+            self._counter += 1
+            self._forgotten = self._counter
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and limits for monitoring"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+recipe_cache = LRUCache(
+    max_entries=config.RECIPE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RECIPE_CACHE_TTL_SECONDS,
+    enabled=config.RECIPE_CACHE_ENABLED
+)
+
+# Meal-plan matrix rows keyed by recipe_id, each holding the version it was read at:
+# an edited recipe replaces its entry, a deleted one is invalidated. Sized for the
+# whole catalog (a plan reads every recipe, so a smaller LRU would never hit) and
+# never expired, since a versioned entry cannot go stale
+plan_memo = LRUCache(
+    max_entries=config.MEAL_PLAN_MEMO_MAX_ENTRIES,
+    ttl_seconds=float("inf"),
+    enabled=config.RECIPE_CACHE_ENABLED
+)
+
+# Scaling base quantities keyed by recipe_id, each holding the version it was built
+# at: an edited recipe replaces its entry, a deleted one is invalidated (SQLite can
+# hand its ID to a new recipe, which starts again at version 1)
+scale_memo = LRUCache(
+    max_entries=config.RECIPE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RECIPE_CACHE_TTL_SECONDS,
+    enabled=config.RECIPE_CACHE_ENABLED
+)
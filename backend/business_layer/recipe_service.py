@@ -1,137 +1,970 @@
 # Backend 3-Layer Architecture
 # Business Logic Layer - Recipe Service
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from typing import Any, Callable, Iterator, List, Optional, Dict, FrozenSet, Set, Tuple
 from backend.data_layer import (
     RecipeRepository, 
     IngredientRepository, 
-    StepRepository
+    StepRepository,
+    PantryRepository,
+    RecipeFacetRepository,
+    UnitOfWork
 )
+from backend.data_layer.recipe_repository import RECIPE_SORTS
 from backend.models import Recipe, Ingredient, Step
 from backend import schemas
+from backend.business_layer.catalog_service import IngredientCatalogService
+from backend.business_layer.facets import (
+    INGREDIENT_BUCKETS, TIME_BUCKETS, bucket_label, facet_deltas, facet_keys
+)
+from backend.business_layer.pagination import encode_cursor, decode_cursor
+from backend.business_layer.search_index import recipe_search_index
+from backend.business_layer.suggest_index import recipe_suggestions, ingredient_suggestions
+from backend.business_layer.ingredient_index import recipe_ingredient_index
+from backend.business_layer.recipe_cache import plan_memo, recipe_cache, scale_memo
+from backend.text_utils import build_search_document, fold_text, ingredient_key, tokenize
+from backend.units import from_canonical, to_canonical
+
+# Sparse fieldsets: child collections a page may include, and the scalar recipe
+# fields it may select, both in the order schemas.Recipe serializes them
+RECIPE_CHILDREN = ("ingredients", "steps")
+RECIPE_FIELDS = tuple(name for name in schemas.Recipe.model_fields if name not in RECIPE_CHILDREN)
+
+# Types of the last-row key a list cursor carries, per sort order (see RECIPE_SORTS)
+CURSOR_KEY_TYPES = {"name": (str, int), "time": (int, int), "newest": (int,)}
+
+# Upper bound on IDs per batch fetch, keeping the IN (...) lists of one request bounded
+MAX_BATCH_IDS = 500
+
+# Recipes validated and inserted per transaction by import_recipes
+IMPORT_BATCH_SIZE = 1000
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'item'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def _filter_values(filters: Optional[schemas.RecipeFilters]) -> Dict[str, Any]:
+    return filters.model_dump(exclude_none=True) if filters else {}
+
+
+def _total_time(prep_time_minutes: Optional[int], cook_time_minutes: Optional[int]) -> int:
+    return (prep_time_minutes or 0) + (cook_time_minutes or 0)
 
 
 class RecipeService:
     """Service for recipe business logic"""
     
     @staticmethod
-    def get_all_recipes(db: Session, skip: int = 0, limit: int = 100) -> List[Recipe]:
-        """Get all recipes with pagination"""
-        return RecipeRepository.get_all(db, skip, limit)
+    def get_all_recipes(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> List[Recipe]:
+        """Get all recipes matching `filters` with pagination, by ID unless `sort` is given"""
+        return RecipeRepository.get_all(db, skip, limit, filters=_filter_values(filters), sort=sort)
+
+    @staticmethod
+    def get_recipes_page(
+        db: Session,
+        cursor: Optional[str],
+        limit: int = 100,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Recipe], Optional[str]]:
+        """Get one keyset page of recipes matching `filters`, ordered by `sort` (default name).
+
+        An empty or missing cursor starts from the beginning. Returns the page and
+        the cursor for the next one (None on the last page). Raises ValueError for
+        a malformed cursor or one issued for another sort.
+        """
+        sort = sort or "name"
+        after = RecipeService._decode_cursor(cursor, sort, limit)
+
+        # Fetch one extra row to learn whether another page exists
+        recipes = RecipeRepository.get_page_after(
+            db, after, limit + 1, filters=_filter_values(filters), sort=sort
+        )
+        if len(recipes) <= limit:
+            return recipes, None
+
+        recipes = recipes[:limit]
+        return recipes, RecipeService._encode_cursor(sort, lambda name: getattr(recipes[-1], name))
 
     @staticmethod
-    def get_recipe(db: Session, recipe_id: int) -> Optional[Recipe]:
-        """Get recipe by ID"""
-        return RecipeRepository.get_by_id(db, recipe_id)
+    def get_recipe_fields(
+        db: Session,
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str], List[Tuple[int, int]]]:
+        """Sparse page of recipes: only `fields` (all scalar fields when None) plus
+        the `include`d child lists, as plain dicts.
+
+        Selects just those columns; each included child table costs one batched
+        query and the others are never touched. Filters and paginates like
+        get_all_recipes, or like get_recipes_page when `cursor` is given. Returns the
+        page, the next cursor and the page's (id, version) pairs. Raises ValueError
+        for unknown names.
+        """
+        fields = list(RECIPE_FIELDS) if fields is None else fields
+        include = include or []
+        unknown = (set(fields) - set(RECIPE_FIELDS)) | (set(include) - set(RECIPE_CHILDREN))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        fields = [name for name in RECIPE_FIELDS if name in fields]
+        # id, version and the sort key are always read: they key the cursor and the ETag
+        sort_columns = RECIPE_SORTS[sort or "name"][0]
+        columns = list(dict.fromkeys(fields + ["id", "version", *sort_columns]))
+
+        next_cursor = None
+        if cursor is None:
+            rows = RecipeRepository.get_columns(
+                db, columns, skip, limit, filters=_filter_values(filters), sort=sort
+            )
+        else:
+            sort = sort or "name"
+            after = RecipeService._decode_cursor(cursor, sort, limit)
+            rows = RecipeRepository.get_columns_page_after(
+                db, columns, after, limit + 1, filters=_filter_values(filters), sort=sort
+            )
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = RecipeService._encode_cursor(sort, rows[-1].__getitem__)
+
+        recipe_ids = [row["id"] for row in rows]
+        children = {}
+        for child in RECIPE_CHILDREN:
+            if child in include:
+                repository = IngredientRepository if child == "ingredients" else StepRepository
+                by_recipe = {}
+                for item in repository.get_rows_by_recipe_ids(db, recipe_ids):
+                    by_recipe.setdefault(item["recipe_id"], []).append(item)
+                children[child] = by_recipe
+
+        page = []
+        for row in rows:
+            item = {name: row[name] for name in fields}
+            for child, by_recipe in children.items():
+                item[child] = by_recipe.get(row["id"], [])
+            page.append(item)
+        return page, next_cursor, [(row["id"], row["version"]) for row in rows]
 
     @staticmethod
-    def search_recipes(db: Session, query: str) -> List[Recipe]:
-        """Search recipes by name"""
-        return RecipeRepository.search_by_name(db, query)
+    def export_recipes(db: Session, chunk_size: int = 500) -> Iterator[List[Recipe]]:
+        """Every recipe with its children, ordered by ID, in chunks of `chunk_size`.
+
+        Each chunk is expunged from the session once the consumer moves on, so
+        memory stays flat however large the catalog is.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        for chunk in RecipeRepository.iter_chunks(db, chunk_size):
+            yield chunk
+            for recipe in chunk:
+                db.expunge(recipe)
 
     @staticmethod
-    def create_recipe(db: Session, recipe_data: schemas.RecipeCreate) -> Recipe:
-        """Create new recipe with ingredients and steps"""
-        new_recipe = Recipe(
-            name=recipe_data.name,
-            description=recipe_data.description,
-            cuisine=recipe_data.cuisine,
-            servings=recipe_data.servings,
-            prep_time_minutes=recipe_data.prep_time_minutes,
-            cook_time_minutes=recipe_data.cook_time_minutes
+    def get_recipes_versions(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[schemas.RecipeFilters] = None,
+        sort: Optional[str] = None
+    ) -> Tuple[List[Tuple[int, int]], bool]:
+        """(id, version) pairs of the page get_all_recipes / get_recipes_page would return,
+        plus whether a next keyset page exists. Loads no recipes or children.
+        """
+        if cursor is None:
+            return RecipeRepository.get_versions(db, skip, limit, filters=_filter_values(filters), sort=sort), False
+        sort = sort or "name"
+        after = RecipeService._decode_cursor(cursor, sort, limit)
+        versions = RecipeRepository.get_page_versions_after(
+            db, after, limit + 1, filters=_filter_values(filters), sort=sort
         )
+        return versions[:limit], len(versions) > limit
 
-        saved_recipe = RecipeRepository.create(db, new_recipe)
+    @staticmethod
+    def get_facets(db: Session) -> schemas.RecipeFacets:
+        """Recipe counts per cuisine, total-time bucket and ingredient-count bucket.
 
-        if recipe_data.ingredients:
-            ingredients = [
-                Ingredient(
-                    recipe_id=saved_recipe.id,
-                    name=ing.name,
-                    quantity=ing.quantity,
-                    unit=ing.unit
-                )
-                for ing in recipe_data.ingredients
-            ]
-            IngredientRepository.create_batch(db, ingredients)
-
-        if recipe_data.steps:
-            steps = [
-                Step(
-                    recipe_id=saved_recipe.id,
-                    step_number=step.step_number,
-                    instruction=step.instruction
+        Read from the recipe_facets summary table that every recipe write adjusts,
+        so the cost does not grow with the catalog. Buckets are listed in range
+        order, empty ones included; cuisines by descending count.
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        for facet, value, count in RecipeFacetRepository.get_counts(db):
+            counts.setdefault(facet, {})[value] = count
+
+        def buckets(facet: str, ranges: Tuple) -> List[schemas.FacetBucket]:
+            return [
+                schemas.FacetBucket(
+                    label=bucket_label(low, high), min=low, max=high,
+                    count=counts.get(facet, {}).get(bucket_label(low, high), 0)
                 )
-                for step in recipe_data.steps
+                for low, high in ranges
             ]
-            StepRepository.create_batch(db, steps)
 
-        return RecipeRepository.get_by_id(db, saved_recipe.id)
+        cuisines = sorted(counts.get("cuisine", {}).items(), key=lambda item: (-item[1], item[0]))
+        return schemas.RecipeFacets(
+            cuisines=[schemas.CuisineCount(cuisine=cuisine, count=count) for cuisine, count in cuisines],
+            total_time=buckets("total_time", TIME_BUCKETS),
+            ingredient_count=buckets("ingredient_count", INGREDIENT_BUCKETS)
+        )
+
+    @staticmethod
+    def get_recipe_version(db: Session, recipe_id: int) -> Optional[int]:
+        """Current version of a recipe, or None if it does not exist"""
+        return RecipeRepository.get_version(db, recipe_id)
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str], sort: str, limit: int) -> Optional[Tuple]:
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        if not cursor:
+            return None
+        after = decode_cursor(cursor, sort)
+        types = CURSOR_KEY_TYPES[sort]
+        if len(after) != len(types) or not all(isinstance(value, kind) for value, kind in zip(after, types)):
+            raise ValueError("Invalid cursor")
+        return after
 
     @staticmethod
-    def update_recipe(db: Session, recipe_id: int, recipe_data: schemas.RecipeUpdate) -> Optional[Recipe]:
-        """Update existing recipe"""
+    def _encode_cursor(sort: str, value: Callable[[str], Any]) -> str:
+        """Cursor past the last row of a page; `value` reads a column of that row by name"""
+        return encode_cursor(sort, tuple(value(name) for name in RECIPE_SORTS[sort][0]))
+
+    @staticmethod
+    def get_recipe(db: Session, recipe_id: int) -> Optional[schemas.Recipe]:
+        """Get recipe by ID as a serialized schema, read through the recipe cache.
+
+        Cached objects are shared between requests and must not be mutated.
+        """
+        cached = recipe_cache.get(recipe_id)
+        if cached is not None:
+            return cached
+
+        token = recipe_cache.begin(recipe_id)
         recipe = RecipeRepository.get_by_id(db, recipe_id)
         if not recipe:
             return None
+        serialized = schemas.Recipe.model_validate(recipe)
+        recipe_cache.set(recipe_id, serialized, token)
+        return serialized
+
+    @staticmethod
+    def get_recipes_batch(db: Session, recipe_ids: List[int]) -> Tuple[List[schemas.Recipe], List[int]]:
+        """Get many recipes by ID, plus the IDs that do not exist.
+
+        Both lists follow the request order with duplicates dropped. Cached recipes
+        come from the recipe cache; the rest are loaded together in a constant number
+        of queries. Raises ValueError for more than MAX_BATCH_IDS distinct IDs.
+        """
+        wanted = list(dict.fromkeys(recipe_ids))
+        if len(wanted) > MAX_BATCH_IDS:
+            raise ValueError(f"At most {MAX_BATCH_IDS} recipe IDs per batch")
+
+        found = {}
+        for recipe_id in wanted:
+            cached = recipe_cache.get(recipe_id)
+            if cached is not None:
+                found[recipe_id] = cached
+
+        tokens = {recipe_id: recipe_cache.begin(recipe_id) for recipe_id in wanted if recipe_id not in found}
+        if tokens:
+            for recipe in RecipeRepository.get_many(db, list(tokens)):
+                serialized = schemas.Recipe.model_validate(recipe)
+                recipe_cache.set(recipe.id, serialized, tokens[recipe.id])
+                found[recipe.id] = serialized
+
+        return (
+            [found[recipe_id] for recipe_id in wanted if recipe_id in found],
+            [recipe_id for recipe_id in wanted if recipe_id not in found]
+        )
+
+    @staticmethod
+    def cache_stats() -> Dict:
+        """Hit/miss/eviction counters and limits of the recipe cache"""
+        return recipe_cache.stats()
+
+    @staticmethod
+    def scale_cache_stats() -> Dict:
+        """Counters and limits of the memoized scaling base quantities"""
+        return scale_memo.stats()
+
+    @staticmethod
+    def search_recipes(db: Session, query: str, skip: int = 0, limit: int = 20) -> List[Recipe]:
+        """Full-text search over name, description, cuisine and steps, best match first.
+
+        Matching ignores case and diacritics ("pho bo" finds "Phở Bò"). PostgreSQL
+        answers from its GIN-indexed tsvector; other databases use the in-process index.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        if RecipeService._uses_postgres(db):
+            recipe_ids = RecipeRepository.full_text_search(db, terms, skip, limit)
+        else:
+            if not recipe_search_index.built:
+                RecipeService.build_indexes(db)
+            recipe_ids = recipe_search_index.search(terms, skip, limit)
+        return RecipeRepository.get_many(db, recipe_ids)
+
+    @staticmethod
+    def suggest_recipes(db: Session, prefix: str, limit: int = 10) -> List[schemas.RecipeSuggestion]:
+        """Type-ahead: recipes with a word starting with `prefix`, ignoring accents"""
+        if not recipe_suggestions.built:
+            RecipeService.build_indexes(db)
+        return [
+            schemas.RecipeSuggestion(id=recipe_id, name=name)
+            for recipe_id, name in recipe_suggestions.suggest(prefix, limit)
+        ]
+
+    @staticmethod
+    def find_recipes_by_ingredients(
+        db: Session,
+        ingredients: List[str],
+        match_all: bool = True,
+        limit: int = 50
+    ) -> List[schemas.RecipeMatch]:
+        """Recipes using all (or any) of the given ingredients, most matches first.
+
+        Answered from the in-memory ingredient index with set intersections on
+        catalog keys, so "Onions" finds recipes using "onion"; `missing_ingredients`
+        lists the requested keys a recipe does not use.
+        """
+        wanted = {ingredient_key(name) for name in ingredients} - {""}
+        if not wanted:
+            return []
+        if not recipe_ingredient_index.built:
+            RecipeService.build_indexes(db)
+
+        if match_all:
+            matched = dict.fromkeys(recipe_ingredient_index.recipes_with_all(wanted), len(wanted))
+        else:
+            matched = recipe_ingredient_index.recipes_with_any(wanted)
+        ingredients_by_recipe = recipe_ingredient_index.ingredients_of(matched)
+        ranked = sorted(
+            matched,
+            key=lambda recipe_id: (
+                -matched[recipe_id], len(ingredients_by_recipe[recipe_id]), recipe_id
+            )
+        )[:limit]
+        return RecipeService._build_matches(
+            db, ranked, {recipe_id: wanted - ingredients_by_recipe[recipe_id] for recipe_id in ranked},
+            ingredients_by_recipe, matched
+        )
+
+    @staticmethod
+    def rank_by_pantry_coverage(
+        db: Session,
+        min_coverage: float = 0.0,
+        limit: int = 20
+    ) -> List[schemas.RecipeMatch]:
+        """Recipes ranked by the fraction of their ingredients already in the pantry.
+
+        Pantry and recipe ingredients are matched on their catalog keys. Only recipes
+        sharing at least one ingredient with the pantry are considered;
+        `missing_ingredients` lists what would still have to be bought.
+        """
+        if not recipe_ingredient_index.built:
+            RecipeService.build_indexes(db)
+        pantry = {ingredient_key(name) for name in PantryRepository.get_names(db)}
+
+        scored = [
+            (covered / total, covered, recipe_id)
+            for recipe_id, covered, total in recipe_ingredient_index.coverage(pantry)
+            if covered / total >= min_coverage
+        ]
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        ranked = [recipe_id for _, _, recipe_id in scored[:limit]]
+        covered_by_recipe = {recipe_id: covered for _, covered, recipe_id in scored[:limit]}
+
+        ingredients_by_recipe = recipe_ingredient_index.ingredients_of(ranked)
+        return RecipeService._build_matches(
+            db, ranked, {recipe_id: ingredients_by_recipe[recipe_id] - pantry for recipe_id in ranked},
+            ingredients_by_recipe, covered_by_recipe
+        )
+
+    @staticmethod
+    def _build_matches(
+        db: Session,
+        ranked: List[int],
+        missing: Dict[int, Set[str]],
+        ingredients_by_recipe: Dict[int, FrozenSet[str]],
+        matched: Dict[int, int]
+    ) -> List[schemas.RecipeMatch]:
+        names = dict(RecipeRepository.get_names(db, ranked))
+        return [
+            schemas.RecipeMatch(
+                id=recipe_id,
+                name=names[recipe_id],
+                matched_ingredients=matched[recipe_id],
+                total_ingredients=len(ingredients_by_recipe[recipe_id]),
+                coverage=matched[recipe_id] / len(ingredients_by_recipe[recipe_id]),
+                missing_ingredients=sorted(missing[recipe_id])
+            )
+            for recipe_id in ranked
+            if recipe_id in names
+        ]
+
+    @staticmethod
+    def build_indexes(db: Session):
+        """(Re)build the in-process indexes from the database"""
+        if not RecipeService._uses_postgres(db):
+            recipe_search_index.rebuild(RecipeRepository.get_search_documents(db))
+        recipe_suggestions.rebuild(
+            (recipe_id, name, 1) for recipe_id, name in RecipeRepository.get_names(db)
+        )
+        ingredient_suggestions.rebuild(
+            (fold_text(name), name, count) for name, count in IngredientRepository.get_name_counts(db)
+        )
+        recipe_ingredient_index.rebuild(
+            (recipe_id, ingredient_key(name)) for recipe_id, name in IngredientRepository.get_normalized_pairs(db)
+        )
+
+    @staticmethod
+    def _uses_postgres(db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def _new_ingredient(recipe_id: Optional[int], ingredient: schemas.IngredientCreate) -> Ingredient:
+        canonical_quantity, canonical_unit = to_canonical(ingredient.quantity, ingredient.unit)
+        return Ingredient(
+            recipe_id=recipe_id,
+            name=ingredient.name,
+            quantity=ingredient.quantity,
+            unit=ingredient.unit,
+            normalized_name=fold_text(ingredient.name),
+            canonical_quantity=canonical_quantity,
+            canonical_unit=canonical_unit
+        )
+
+    @staticmethod
+    def _update_search_document(recipe: Recipe, instructions: List[str]):
+        """Refresh the folded search columns from the recipe's current content"""
+        recipe.search_name, recipe.search_text = build_search_document(
+            recipe.name, recipe.description, recipe.cuisine, instructions
+        )
+
+    @staticmethod
+    def _update_listing_columns(recipe: Recipe):
+        """Refresh the stored filter/sort columns, assigning only real changes"""
+        total_time = _total_time(recipe.prep_time_minutes, recipe.cook_time_minutes)
+        if recipe.total_time_minutes != total_time:
+            recipe.total_time_minutes = total_time
+        if recipe.ingredient_count != len(recipe.ingredients):
+            recipe.ingredient_count = len(recipe.ingredients)
+
+    @staticmethod
+    def _facet_keys(recipe: Recipe) -> List[Tuple[str, str]]:
+        return facet_keys(recipe.cuisine, recipe.total_time_minutes, recipe.ingredient_count)
+
+    @staticmethod
+    def _new_step(recipe_id: Optional[int], step: schemas.StepCreate) -> Step:
+        return Step(recipe_id=recipe_id, step_number=step.step_number, instruction=step.instruction)
+
+    @staticmethod
+    def create_recipe(db: Session, recipe_data: schemas.RecipeCreate) -> schemas.Recipe:
+        """Create new recipe with ingredients and steps.
+
+        The recipe and its children are inserted by a single flush and commit; the
+        result is serialized before the commit, so nothing is read back afterwards.
+        """
+        with UnitOfWork(db):
+            new_recipe = Recipe(
+                name=recipe_data.name,
+                description=recipe_data.description,
+                cuisine=recipe_data.cuisine,
+                servings=recipe_data.servings,
+                prep_time_minutes=recipe_data.prep_time_minutes,
+                cook_time_minutes=recipe_data.cook_time_minutes,
+                ingredients=[RecipeService._new_ingredient(None, ing) for ing in recipe_data.ingredients],
+                steps=[RecipeService._new_step(None, step) for step in recipe_data.steps]
+            )
+            RecipeService._update_search_document(
+                new_recipe, [step.instruction for step in recipe_data.steps]
+            )
+            RecipeService._update_listing_columns(new_recipe)
+            IngredientCatalogService.link(db, new_recipe.ingredients)
+            recipe = RecipeRepository.create(db, new_recipe)
+            RecipeFacetRepository.add_counts(db, facet_deltas(added=RecipeService._facet_keys(recipe)))
+            created = schemas.Recipe.model_validate(recipe)
+            search_name, search_text = recipe.search_name, recipe.search_text
+
+        recipe_search_index.add(created.id, search_name, search_text)
+        recipe_suggestions.add(created.id, created.name)
+        for ingredient in created.ingredients:
+            ingredient_suggestions.add(fold_text(ingredient.name), ingredient.name)
+        recipe_ingredient_index.set_recipe(created.id, [ingredient_key(i.name) for i in created.ingredients])
+        return created
+
+    @staticmethod
+    def import_recipes(
+        db: Session,
+        records: List[Tuple[int, Any]],
+        batch_size: int = IMPORT_BATCH_SIZE
+    ) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Bulk-create recipes from raw (index, record) pairs, batch by batch.
+
+        Records are validated as RecipeCreate; invalid ones are reported as
+        (index, message) and skipped. Each batch is written with multi-row INSERTs
+        and one commit. If the database rejects a batch, its recipes are retried one
+        by one so only the offending ones fail. Returns the new IDs in input order
+        and the errors.
+        """
+        recipe_ids, errors = [], []
+        for start in range(0, len(records), batch_size):
+            batch = []
+            for index, record in records[start:start + batch_size]:
+                try:
+                    batch.append((index, schemas.RecipeCreate.model_validate(record)))
+                except ValidationError as e:
+                    errors.append((index, _validation_message(e)))
+            try:
+                recipe_ids.extend(RecipeService._insert_recipes(db, [data for _, data in batch]))
+            except SQLAlchemyError:
+                for index, data in batch:
+                    try:
+                        recipe_ids.extend(RecipeService._insert_recipes(db, [data]))
+                    except SQLAlchemyError as e:
+                        errors.append((index, str(getattr(e, "orig", None) or e)))
+        return recipe_ids, sorted(errors)
+
+    @staticmethod
+    def _insert_recipes(db: Session, recipes: List[schemas.RecipeCreate]) -> List[int]:
+        """Insert validated recipes in one unit of work and add them to the in-process indexes"""
+        rows, ingredients, steps = [], [], []
+        for data in recipes:
+            row = data.model_dump(exclude={"ingredients", "steps"})
+            row["search_name"], row["search_text"] = build_search_document(
+                data.name, data.description, data.cuisine, [step.instruction for step in data.steps]
+            )
+            row["total_time_minutes"] = _total_time(data.prep_time_minutes, data.cook_time_minutes)
+            row["ingredient_count"] = len(data.ingredients)
+            rows.append(row)
+            ingredients.append([
+                dict(
+                    ing.model_dump(),
+                    normalized_name=fold_text(ing.name),
+                    **dict(zip(("canonical_quantity", "canonical_unit"), to_canonical(ing.quantity, ing.unit)))
+                )
+                for ing in data.ingredients
+            ])
+            steps.append([step.model_dump() for step in data.steps])
+
+        with UnitOfWork(db):
+            catalog_ids = IngredientCatalogService.resolve(
+                db, [ingredient["name"] for recipe_ingredients in ingredients for ingredient in recipe_ingredients]
+            )
+            for recipe_ingredients in ingredients:
+                for ingredient in recipe_ingredients:
+                    ingredient["catalog_id"] = catalog_ids[ingredient["name"]]
+            recipe_ids = RecipeRepository.create_many(db, rows, ingredients, steps)
+            RecipeFacetRepository.add_counts(db, facet_deltas(added=[
+                key for row in rows
+                for key in facet_keys(row["cuisine"], row["total_time_minutes"], row["ingredient_count"])
+            ]))
+        for recipe_id, row, recipe_ingredients in zip(recipe_ids, rows, ingredients):
+            recipe_search_index.add(recipe_id, row["search_name"], row["search_text"])
+            recipe_suggestions.add(recipe_id, row["name"])
+            for ingredient in recipe_ingredients:
+                ingredient_suggestions.add(ingredient["normalized_name"], ingredient["name"])
+            recipe_ingredient_index.set_recipe(
+                recipe_id, [ingredient_key(ingredient["name"]) for ingredient in recipe_ingredients]
+            )
+        return recipe_ids
+
+    @staticmethod
+    def update_recipe(db: Session, recipe_id: int, recipe_data: schemas.RecipeUpdate) -> Optional[schemas.Recipe]:
+        """Update existing recipe.
 
+        Replaced ingredient and step lists are diffed against the stored rows, so only
+        the rows that actually differ are updated, inserted or deleted.
+        """
         update_fields = recipe_data.model_dump(exclude_unset=True)
 
-        for field, value in update_fields.items():
-            if field == "ingredients":
-                IngredientRepository.delete_by_recipe_id(db, recipe_id)
-                if value:
-                    ingredients = [
-                        Ingredient(
-                            recipe_id=recipe_id,
-                            name=ing.name,
-                            quantity=ing.quantity,
-                            unit=ing.unit
-                        )
-                        for ing in value
-                    ]
-                    IngredientRepository.create_batch(db, ingredients)
-            elif field == "steps":
-                StepRepository.delete_by_recipe_id(db, recipe_id)
-                if value:
-                    steps = [
-                        Step(
-                            recipe_id=recipe_id,
-                            step_number=step.step_number,
-                            instruction=step.instruction
-                        )
-                        for step in value
-                    ]
-                    StepRepository.create_batch(db, steps)
-            else:
-                setattr(recipe, field, value)
+        def apply(recipe: Recipe) -> bool:
+            for field in update_fields:
+                # Read from the model so nested items stay IngredientCreate/StepCreate objects
+                value = getattr(recipe_data, field)
+                if field == "ingredients":
+                    RecipeService._sync_children(
+                        recipe.ingredients, value or [],
+                        keys=(
+                            lambda i: (i.name, i.quantity, i.unit),
+                            lambda i: (i.name, i.unit),
+                            lambda i: i.name
+                        ),
+                        copy=RecipeService._copy_ingredient,
+                        create=lambda ing: RecipeService._new_ingredient(recipe_id, ing)
+                    )
+                elif field == "steps":
+                    RecipeService._sync_children(
+                        recipe.steps, value or [],
+                        keys=(lambda s: (s.step_number, s.instruction), lambda s: s.step_number),
+                        copy=RecipeService._copy_step,
+                        create=lambda step: RecipeService._new_step(recipe_id, step)
+                    )
+                elif getattr(recipe, field) != value:
+                    setattr(recipe, field, value)
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def add_ingredient(
+        db: Session,
+        recipe_id: int,
+        ingredient_data: schemas.IngredientCreate
+    ) -> Optional[schemas.Recipe]:
+        """Append one ingredient to a recipe"""
+        def apply(recipe: Recipe) -> bool:
+            recipe.ingredients.append(RecipeService._new_ingredient(recipe_id, ingredient_data))
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def update_ingredient(
+        db: Session,
+        recipe_id: int,
+        ingredient_id: int,
+        ingredient_data: schemas.IngredientUpdate
+    ) -> Optional[schemas.Recipe]:
+        """Edit one ingredient of a recipe; None if either does not exist"""
+        def apply(recipe: Recipe) -> bool:
+            ingredient = next((i for i in recipe.ingredients if i.id == ingredient_id), None)
+            if ingredient is None:
+                return False
+            changes = ingredient_data.model_dump(exclude_unset=True)
+            RecipeService._copy_ingredient(ingredient, schemas.IngredientCreate(
+                name=changes.get("name", ingredient.name),
+                quantity=changes.get("quantity", ingredient.quantity),
+                unit=changes.get("unit", ingredient.unit)
+            ))
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def remove_ingredient(db: Session, recipe_id: int, ingredient_id: int) -> Optional[schemas.Recipe]:
+        """Remove one ingredient from a recipe; None if either does not exist"""
+        def apply(recipe: Recipe) -> bool:
+            ingredient = next((i for i in recipe.ingredients if i.id == ingredient_id), None)
+            if ingredient is None:
+                return False
+            recipe.ingredients.remove(ingredient)
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def add_step(db: Session, recipe_id: int, step_data: schemas.StepCreate) -> Optional[schemas.Recipe]:
+        """Add one step to a recipe. Raises ValueError if its step_number is taken"""
+        def apply(recipe: Recipe) -> bool:
+            if any(step.step_number == step_data.step_number for step in recipe.steps):
+                raise ValueError(f"Step {step_data.step_number} already exists")
+            recipe.steps.append(RecipeService._new_step(recipe_id, step_data))
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def update_step(
+        db: Session,
+        recipe_id: int,
+        step_id: int,
+        step_data: schemas.StepUpdate
+    ) -> Optional[schemas.Recipe]:
+        """Edit one step of a recipe; None if either does not exist.
+
+        Raises ValueError when moving it onto another step's number.
+        """
+        def apply(recipe: Recipe) -> bool:
+            step = next((s for s in recipe.steps if s.id == step_id), None)
+            if step is None:
+                return False
+            changes = step_data.model_dump(exclude_unset=True)
+            step_number = changes.get("step_number", step.step_number)
+            if any(other.step_number == step_number for other in recipe.steps if other is not step):
+                raise ValueError(f"Step {step_number} already exists")
+            RecipeService._copy_step(step, schemas.StepCreate(
+                step_number=step_number,
+                instruction=changes.get("instruction", step.instruction)
+            ))
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def remove_step(db: Session, recipe_id: int, step_id: int) -> Optional[schemas.Recipe]:
+        """Remove one step from a recipe; None if either does not exist"""
+        def apply(recipe: Recipe) -> bool:
+            step = next((s for s in recipe.steps if s.id == step_id), None)
+            if step is None:
+                return False
+            recipe.steps.remove(step)
+            return True
+
+        return RecipeService._change_recipe(db, recipe_id, apply)
+
+    @staticmethod
+    def _change_recipe(
+        db: Session,
+        recipe_id: int,
+        apply: Callable[[Recipe], bool]
+    ) -> Optional[schemas.Recipe]:
+        """Edit a recipe in one unit of work and keep everything derived from it in step.
+
+        `apply` mutates the loaded recipe and returns False when the child it targets
+        does not exist (the call then returns None, like a missing recipe). If anything
+        really changed, the version is bumped and the search document recomputed when
+        needed; after the commit the cache entry is dropped and the indexes updated.
+        """
+        with UnitOfWork(db):
+            recipe = RecipeRepository.get_by_id(db, recipe_id)
+            if not recipe:
+                return None
+            old_name = recipe.name
+            old_ingredient_names = sorted(ingredient.name for ingredient in recipe.ingredients)
+            old_search_fields = RecipeService._search_fields(recipe)
+            old_facet_keys = RecipeService._facet_keys(recipe)
+
+            if not apply(recipe):
+                return None
+            recipe.steps.sort(key=lambda step: step.step_number)
+            IngredientCatalogService.link(db, recipe.ingredients)
+            RecipeService._update_listing_columns(recipe)
+            if not RecipeService._has_changes(db):
+                return schemas.Recipe.model_validate(recipe)
+
+            recipe.version = Recipe.version + 1
+            search_changed = RecipeService._search_fields(recipe) != old_search_fields
+            if search_changed:
+                RecipeService._update_search_document(
+                    recipe, [step.instruction for step in recipe.steps]
+                )
+            updated = RecipeRepository.update(db, recipe)
+            RecipeFacetRepository.add_counts(
+                db, facet_deltas(old_facet_keys, RecipeService._facet_keys(updated))
+            )
+            serialized = schemas.Recipe.model_validate(updated)
+            # search_text is deferred: only touch it when it was just recomputed
+            search_document = (updated.search_name, updated.search_text) if search_changed else None
+
+        recipe_cache.invalidate(recipe_id)
+        if search_document:
+            recipe_search_index.add(recipe_id, *search_document)
+        if serialized.name != old_name:
+            recipe_suggestions.remove(recipe_id)
+            recipe_suggestions.add(recipe_id, serialized.name)
+        if sorted(ingredient.name for ingredient in serialized.ingredients) != old_ingredient_names:
+            for name in old_ingredient_names:
+                ingredient_suggestions.remove(fold_text(name))
+            for ingredient in serialized.ingredients:
+                ingredient_suggestions.add(fold_text(ingredient.name), ingredient.name)
+            recipe_ingredient_index.set_recipe(recipe_id, [ingredient_key(i.name) for i in serialized.ingredients])
+        return serialized
+
+    @staticmethod
+    def _search_fields(recipe: Recipe) -> Tuple:
+        return (
+            recipe.name, recipe.description, recipe.cuisine,
+            tuple(sorted((step.step_number, step.instruction) for step in recipe.steps))
+        )
+
+    @staticmethod
+    def _has_changes(db: Session) -> bool:
+        """Whether the session holds any net change to flush"""
+        return bool(db.new or db.deleted or any(db.is_modified(obj) for obj in db.dirty))
+
+    @staticmethod
+    def _sync_children(
+        collection: List,
+        wanted: List,
+        keys: Tuple[Callable, ...],
+        copy: Callable,
+        create: Callable
+    ):
+        """Make a child collection hold `wanted` with as few row changes as possible.
+
+        Rows are paired with wanted items by each key in turn (strictest first), then
+        any leftovers pairwise; paired rows are updated in place, so unchanged rows
+        cost nothing and edits cost one UPDATE. Only the surplus is inserted, or
+        deleted through the delete-orphan cascade.
+        """
+        rows, items, pairs = list(collection), list(wanted), []
+        for key in keys:
+            candidates = {}
+            for row in rows:
+                candidates.setdefault(key(row), []).append(row)
+            unmatched = []
+            for item in items:
+                matches = candidates.get(key(item))
+                if matches:
+                    pairs.append((matches.pop(0), item))
+                else:
+                    unmatched.append(item)
+            items = unmatched
+            rows = [row for matches in candidates.values() for row in matches]
+        rows.sort(key=collection.index)
+
+        pairs.extend(zip(rows, items))
+        for row, item in pairs:
+            copy(row, item)
+        for row in rows[len(items):]:
+            collection.remove(row)
+        for item in items[len(rows):]:
+            collection.append(create(item))
+
+    @staticmethod
+    def _copy_ingredient(ingredient: Ingredient, data: schemas.IngredientCreate):
+        # Assign only real changes so untouched rows stay out of the UPDATE
+        if ingredient.name != data.name:
+            ingredient.catalog_id = None  # re-resolved by IngredientCatalogService.link
+        for field in ("name", "quantity", "unit"):
+            if getattr(ingredient, field) != getattr(data, field):
+                setattr(ingredient, field, getattr(data, field))
+        if ingredient.normalized_name != fold_text(data.name):
+            ingredient.normalized_name = fold_text(data.name)
+        canonical = to_canonical(data.quantity, data.unit)
+        if (ingredient.canonical_quantity, ingredient.canonical_unit) != canonical:
+            ingredient.canonical_quantity, ingredient.canonical_unit = canonical
 
-        return RecipeRepository.update(db, recipe)
+    @staticmethod
+    def _copy_step(step: Step, data: schemas.StepCreate):
+        for field in ("step_number", "instruction"):
+            if getattr(step, field) != getattr(data, field):
+                setattr(step, field, getattr(data, field))
 
     @staticmethod
     def delete_recipe(db: Session, recipe_id: int) -> bool:
         """Delete recipe"""
-        return RecipeRepository.delete(db, recipe_id)
+        with UnitOfWork(db):
+            recipe = RecipeRepository.get_by_id(db, recipe_id)
+            if not recipe:
+                return False
+            ingredient_names = [ingredient.name for ingredient in recipe.ingredients]
+            RecipeFacetRepository.add_counts(db, facet_deltas(removed=RecipeService._facet_keys(recipe)))
+            RecipeRepository.delete(db, recipe_id)
+
+        recipe_cache.invalidate(recipe_id)
+        plan_memo.invalidate(recipe_id)
+        scale_memo.invalidate(recipe_id)
+        recipe_search_index.remove(recipe_id)
+        recipe_suggestions.remove(recipe_id)
+        for name in ingredient_names:
+            ingredient_suggestions.remove(fold_text(name))
+        recipe_ingredient_index.remove_recipe(recipe_id)
+        return True
 
     @staticmethod
     def scale_recipe(db: Session, recipe_id: int, scale_factor: float) -> Optional[Dict]:
         """Scale recipe ingredients by factor"""
-        recipe = RecipeRepository.get_by_id(db, recipe_id)
-        if not recipe:
-            return None
+        results, _ = RecipeService.scale_recipes(db, [(recipe_id, scale_factor)])
+        return results[0].model_dump(exclude={"recipe_id"}) if results else None
 
-        scaled_ingredients = [
-            {
-                "name": ing.name,
-                "quantity": ing.quantity * scale_factor,
-                "unit": ing.unit
-            }
-            for ing in recipe.ingredients
-        ]
+    @staticmethod
+    def scale_recipes(
+        db: Session,
+        requests: List[Tuple[int, float]]
+    ) -> Tuple[List[schemas.ScaledRecipe], List[int]]:
+        """Scale many (recipe_id, factor) pairs: results in request order, plus the missing IDs.
+
+        A recipe's base quantities (lines of one catalog entry in compatible units
+        merged, in the unit of the first line) are memoized per recipe with the
+        version they were built at, so a new factor only multiplies each line.
+        Versions come from the recipe cache when it holds the recipe, else from one
+        query; bases not memoized yet are built from one prefetched set of
+        ingredient rows. Raises ValueError for more than MAX_BATCH_IDS pairs.
+        """
+        if len(requests) > MAX_BATCH_IDS:
+            raise ValueError(f"At most {MAX_BATCH_IDS} recipes per scaling batch")
+        wanted = list(dict.fromkeys(recipe_id for recipe_id, _ in requests))
+
+        versions, unknown = {}, []
+        for recipe_id in wanted:
+            cached = recipe_cache.get(recipe_id)
+            if cached is not None:
+                versions[recipe_id] = cached.version
+            else:
+                unknown.append(recipe_id)
+        versions.update(RecipeRepository.get_versions_by_ids(db, unknown))
 
-        return {
-            "original_servings": recipe.servings,
-            "scaled_servings": int(recipe.servings * scale_factor),
-            "scale_factor": scale_factor,
-            "ingredients": scaled_ingredients
-        }
\ No newline at end of file
+        bases = {}
+        for recipe_id, version in versions.items():
+            memoized = scale_memo.get(recipe_id)
+            if memoized is not None and memoized[0] == version:
+                bases[recipe_id] = memoized[1:]
+        misses = [recipe_id for recipe_id in versions if recipe_id not in bases]
+        if misses:
+            bases.update(RecipeService._load_scale_bases(db, misses))
+
+        return (
+            [
+                RecipeService._scaled(recipe_id, factor, bases[recipe_id])
+                for recipe_id, factor in requests if recipe_id in bases
+            ],
+            [recipe_id for recipe_id in wanted if recipe_id not in bases]
+        )
+
+    @staticmethod
+    def _load_scale_bases(db: Session, recipe_ids: List[int]) -> Dict[int, Tuple]:
+        """Build and memoize (servings, names, units, base quantities) per recipe"""
+        tokens = {recipe_id: scale_memo.begin(recipe_id) for recipe_id in recipe_ids}
+        lines: Dict[int, Dict[Tuple[Optional[int], Optional[str], str], List]] = {}
+        headers = {}
+        for (recipe_id, version, servings, catalog_id, normalized_name, name, unit,
+             canonical_quantity, canonical_unit) in RecipeRepository.get_scale_rows(db, recipe_ids):
+            headers[recipe_id] = (version, servings)
+            merged = lines.setdefault(recipe_id, {})
+            if name is None:
+                continue
+            # Unlinked lines (no catalog_id) merge only with the same spelling
+            key = (catalog_id, None if catalog_id else normalized_name, canonical_unit)
+            line = merged.get(key)
+            if line is None:
+                merged[key] = [name, unit, canonical_quantity]
+            else:
+                line[2] += canonical_quantity
+
+        bases = {}
+        for recipe_id, (version, servings) in headers.items():
+            merged = list(lines[recipe_id].values())
+            bases[recipe_id] = (
+                servings,
+                tuple(name for name, _, _ in merged),
+                tuple(unit for _, unit, _ in merged),
+                tuple(from_canonical(quantity, unit) for _, unit, quantity in merged)
+            )
+            scale_memo.set(recipe_id, (version,) + bases[recipe_id], tokens[recipe_id])
+        return bases
+
+    @staticmethod
+    def _scaled(recipe_id: int, factor: float, base: Tuple) -> schemas.ScaledRecipe:
+        # Plain per-line multiplication: recipes have a handful of lines
+        servings, names, units, quantities = base
+        return schemas.ScaledRecipe(
+            recipe_id=recipe_id,
+            original_servings=servings,
+            scaled_servings=int(servings * factor),
+            scale_factor=factor,
+            ingredients=[
+                schemas.ScaledIngredient(name=name, quantity=quantity * factor, unit=unit)
+                for name, unit, quantity in zip(names, units, quantities)
+            ]
+        )
@@ -0,0 +1,111 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - In-process full-text index (fallback when not on PostgreSQL)
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Same relative weights PostgreSQL's ts_rank uses for labels A and B
+NAME_WEIGHT = 1.0
+TEXT_WEIGHT = 0.4
+
+
+class RecipeSearchIndex:
+    """Inverted index from folded term to {recipe_id: weight}.
+
+    Mirrors the recipes.search_vector column PostgreSQL maintains: terms from
+    `search_name` weigh NAME_WEIGHT, terms from `search_text` weigh TEXT_WEIGHT,
+    and a recipe matches when it contains every query term. The index lives in
+    this process only, so it is meant for single-process deployments (SQLite).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._terms_by_recipe: Dict[int, Set[str]] = {}
+        self._ranked: Dict[str, List[Tuple[float, int]]] = {}
+        self.built = False
+
+    def reset(self):
+        """Drop all entries and mark the index as not built"""
+        with self._lock:
+            self._postings.clear()
+            self._terms_by_recipe.clear()
+            self._ranked.clear()
+            self.built = False
+
+    def rebuild(self, documents: Iterable[Tuple[int, Optional[str], Optional[str]]]):
+        """Replace the index contents with (recipe_id, search_name, search_text) rows"""
+        with self._lock:
+            self._postings.clear()
+            self._terms_by_recipe.clear()
+            self._ranked.clear()
+            for recipe_id, search_name, search_text in documents:
+                self._add(recipe_id, search_name, search_text)
+            self.built = True
+
+    def add(self, recipe_id: int, search_name: Optional[str], search_text: Optional[str]):
+        """Index a recipe, replacing any previous entry for it"""
+        with self._lock:
+            if not self.built:
+                return
+            self._remove(recipe_id)
+            self._add(recipe_id, search_name, search_text)
+
+    def remove(self, recipe_id: int):
+        """Drop a recipe from the index"""
+        with self._lock:
+            if self.built:
+                self._remove(recipe_id)
+
+    def search(self, terms: List[str], skip: int = 0, limit: int = 20) -> List[int]:
+        """Return recipe ids containing all terms, best match first (ties by id)"""
+        with self._lock:
+            postings = [self._postings.get(term) for term in set(terms)]
+            if not postings or not all(postings):
+                return []
+            if len(postings) == 1:
+                ranked = self._impact_ordered(terms[0])
+                return [recipe_id for _, recipe_id in ranked[skip:skip + limit]]
+
+            postings.sort(key=len)
+            candidates = postings[0].keys() & postings[1].keys()
+            for posting in postings[2:]:
+                candidates &= posting.keys()
+            scored = (
+                (-sum(posting[recipe_id] for posting in postings), recipe_id)
+                for recipe_id in candidates
+            )
+            top = heapq.nsmallest(skip + limit, scored)
+        return [recipe_id for _, recipe_id in top[skip:]]
+
+    def _impact_ordered(self, term: str) -> List[Tuple[float, int]]:
+        """Posting of a single term sorted best-first, cached until the term changes"""
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            ranked = sorted((-weight, recipe_id) for recipe_id, weight in self._postings[term].items())
+            self._ranked[term] = ranked
+        return ranked
+
+    def _add(self, recipe_id: int, search_name: Optional[str], search_text: Optional[str]):
+        weights: Dict[str, float] = {}
+        for term in (search_text or "").split():
+            weights[term] = weights.get(term, 0.0) + TEXT_WEIGHT
+        for term in (search_name or "").split():
+            weights[term] = weights.get(term, 0.0) + NAME_WEIGHT
+        for term, weight in weights.items():
+            self._postings[term][recipe_id] = weight
+            self._ranked.pop(term, None)
+        self._terms_by_recipe[recipe_id] = set(weights)
+
+    def _remove(self, recipe_id: int):
+        for term in self._terms_by_recipe.pop(recipe_id, ()):
+            self._ranked.pop(term, None)
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(recipe_id, None)
+                if not posting:
+                    del self._postings[term]
+
+
+recipe_search_index = RecipeSearchIndex()
@@ -1,40 +1,111 @@
 # Backend 3-Layer Architecture
 # Business Logic Layer - Shopping List Service
 from sqlalchemy.orm import Session
-from typing import List
-from backend.data_layer import RecipeRepository, PantryRepository
+from typing import Dict, List, Tuple, Union
+from backend.data_layer import RecipeRepository, IngredientRepository, PantryRepository, IngredientCatalogRepository
 from backend import schemas
+from backend.units import for_display, to_canonical
 
 
 class ShoppingListService:
     """Service for shopping list generation business logic"""
     
     @staticmethod
-    def generate_shopping_list(db: Session, recipe_ids: List[int]) -> List[schemas.ShoppingItem]:
-        """Generate shopping list from multiple recipes, subtract pantry items"""
+    def generate_shopping_list(
+        db: Session,
+        recipes: List[Union[int, schemas.ShoppingListEntry]]
+    ) -> List[schemas.ShoppingItem]:
+        """Generate shopping list from multiple recipes, subtract pantry items.
+
+        Recipes are IDs (base servings) or entries with target servings or a
+        multiplier. Scaling, aggregation over canonical amounts per catalog entry
+        ("Onion" and "onions" are one item; 500 g and 1 kg of beef become 1.5 kg)
+        and pantry subtraction run in one SQL statement, with the per-recipe weights
+        passed in as a VALUES list; only the display units are chosen here. A recipe
+        listed twice counts twice and unknown IDs are ignored.
+        """
+        multipliers, servings, positions = ShoppingListService._weights(recipes)
+        weights = [
+            (recipe_id, float(multipliers.get(recipe_id, 0)), float(servings.get(recipe_id, 0)), position)
+            for recipe_id, position in positions.items()
+        ]
+        return [
+            ShoppingListService._item(name, quantity, canonical_unit)
+            for name, canonical_unit, quantity in IngredientRepository.get_shopping_totals(db, weights)
+        ]
+
+    @staticmethod
+    def _weights(
+        recipes: List[Union[int, schemas.ShoppingListEntry]]
+    ) -> Tuple[Dict[int, float], Dict[int, float], Dict[int, int]]:
+        """Per recipe: summed multipliers, summed target servings and first position"""
+        multipliers, servings, positions = {}, {}, {}
+        for position, entry in enumerate(recipes):
+            if isinstance(entry, int):
+                entry = schemas.ShoppingListEntry(recipe_id=entry)
+            if entry.servings is not None:
+                servings[entry.recipe_id] = servings.get(entry.recipe_id, 0) + entry.servings
+            else:
+                multiplier = entry.multiplier if entry.multiplier is not None else 1
+                multipliers[entry.recipe_id] = multipliers.get(entry.recipe_id, 0) + multiplier
+            positions.setdefault(entry.recipe_id, position)
+        return multipliers, servings, positions
+
+    @staticmethod
+    def _item(name: str, canonical_quantity: float, canonical_unit: str) -> schemas.ShoppingItem:
+        quantity, unit = for_display(canonical_quantity, canonical_unit)
+        return schemas.ShoppingItem(name=name, quantity=quantity, unit=unit)
+
+    @staticmethod
+    def generate_shopping_list_reference(
+        db: Session,
+        recipes: List[Union[int, schemas.ShoppingListEntry]]
+    ) -> List[schemas.ShoppingItem]:
+        """Pure-Python reference for generate_shopping_list (kept for equivalence tests)"""
+        multipliers, servings, positions = ShoppingListService._weights(recipes)
+        loaded = {recipe.id: recipe for recipe in RecipeRepository.get_many(db, list(positions))}
+        # Unlinked rows resolve through the alias of their normalized name, else key on that name
+        aliases = IngredientCatalogRepository.get_ids_by_alias(db, {
+            ingredient.normalized_name
+            for recipe in loaded.values() for ingredient in recipe.ingredients
+            if ingredient.catalog_id is None
+        })
         ingredient_map = {}
         
-        # Aggregate ingredients from all recipes
-        for recipe_id in recipe_ids:
-            recipe = RecipeRepository.get_by_id(db, recipe_id)
+        # Aggregate ingredients from all recipes, in order of first appearance
+        for recipe_id in sorted(positions, key=positions.get):
+            recipe = loaded.get(recipe_id)
             if not recipe:
                 continue
+            weight = multipliers.get(recipe_id, 0) + servings.get(recipe_id, 0) / (recipe.servings or 1)
             
             for ingredient in recipe.ingredients:
-                key = f"{ingredient.name}_{ingredient.unit}"
+                quantity, unit = to_canonical(ingredient.quantity, ingredient.unit)
+                quantity *= weight
+                catalog_id = ingredient.catalog_id or aliases.get(ingredient.normalized_name)
+                fallback = None if catalog_id else ingredient.normalized_name or ingredient.name
+                key = (catalog_id, fallback, unit)
                 
                 if key in ingredient_map:
-                    ingredient_map[key]["quantity"] += ingredient.quantity
+                    ingredient_map[key]["quantity"] += quantity
+                    ingredient_map[key]["name"] = min(ingredient_map[key]["name"], ingredient.name)
                 else:
                     ingredient_map[key] = {
+                        "catalog_id": catalog_id,
                         "name": ingredient.name,
-                        "quantity": ingredient.quantity,
-                        "unit": ingredient.unit
+                        "quantity": quantity,
+                        "unit": unit
                     }
+        names = IngredientCatalogRepository.get_display_names(
+            db, {item["catalog_id"] for item in ingredient_map.values()} - {None}
+        )
         
         # Get pantry items
         pantry_items = PantryRepository.get_all(db)
-        pantry_map = {f"{p.name}_{p.unit}": p.quantity for p in pantry_items}
+        pantry_map = {}
+        for p in pantry_items:
+            quantity, unit = to_canonical(p.quantity, p.unit)
+            pantry_map[(p.catalog_id, None, unit)] = quantity
         
         # Calculate shopping list (needed - available)
         shopping_list = []
@@ -45,10 +116,8 @@ class ShoppingListService:
             remaining_quantity = max(0, needed_quantity - available_quantity)
             
             if remaining_quantity > 0:
-                shopping_list.append(schemas.ShoppingItem(
-                    name=item["name"],
-                    quantity=remaining_quantity,
-                    unit=item["unit"]
+                shopping_list.append(ShoppingListService._item(
+                    names.get(item["catalog_id"], item["name"]), remaining_quantity, item["unit"]
                 ))
         
         return shopping_list
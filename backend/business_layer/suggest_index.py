@@ -0,0 +1,99 @@
+# Backend 3-Layer Architecture
+# Business Logic Layer - In-process prefix index for type-ahead suggestions
+import bisect
+import threading
+from typing import Dict, Hashable, Iterable, List, Tuple
+from backend.text_utils import fold_text
+
+
+class PrefixIndex:
+    """Sorted array of diacritic-folded word suffixes answering prefix queries by bisection.
+
+    Each label is indexed at every word start, so "bo" suggests "Phở Bò" and
+    "Bún Bò Huế". Keys are reference counted: the same key may be added several
+    times (e.g. an ingredient used by many recipes) and disappears once every
+    add has been matched by a remove.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: List[Tuple[str, Hashable]] = []
+        self._labels: Dict[Hashable, str] = {}
+        self._counts: Dict[Hashable, int] = {}
+        self.built = False
+
+    def reset(self):
+        """Drop all entries and mark the index as not built"""
+        with self._lock:
+            self._entries = []
+            self._labels.clear()
+            self._counts.clear()
+            self.built = False
+
+    def rebuild(self, items: Iterable[Tuple[Hashable, str, int]]):
+        """Replace the contents with (key, label, count) items"""
+        with self._lock:
+            self._labels.clear()
+            self._counts.clear()
+            for key, label, count in items:
+                self._counts[key] = self._counts.get(key, 0) + count
+                self._labels.setdefault(key, label)
+            self._entries = sorted(
+                (suffix, key) for key, label in self._labels.items() for suffix in _word_suffixes(label)
+            )
+            self.built = True
+
+    def add(self, key: Hashable, label: str):
+        """Add one reference to `key`, indexing `label` if the key is new"""
+        with self._lock:
+            if not self.built:
+                return
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count == 0:
+                self._labels[key] = label
+                for suffix in _word_suffixes(label):
+                    bisect.insort(self._entries, (suffix, key))
+
+    def remove(self, key: Hashable):
+        """Drop one reference to `key`, unindexing it when none remain"""
+        with self._lock:
+            if not self.built or key not in self._counts:
+                return
+            self._counts[key] -= 1
+            if self._counts[key] > 0:
+                return
+            del self._counts[key]
+            label = self._labels.pop(key)
+            for suffix in _word_suffixes(label):
+                i = bisect.bisect_left(self._entries, (suffix, key))
+                if i < len(self._entries) and self._entries[i] == (suffix, key):
+                    del self._entries[i]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[Hashable, str]]:
+        """Return up to `limit` distinct (key, label) pairs whose words start with `prefix`"""
+        folded = fold_text(prefix)
+        if not folded:
+            return []
+        results: Dict[Hashable, str] = {}
+        with self._lock:
+            i = bisect.bisect_left(self._entries, (folded,))
+            while i < len(self._entries) and len(results) < limit:
+                suffix, key = self._entries[i]
+                if not suffix.startswith(folded):
+                    break
+                results.setdefault(key, self._labels[key])
+                i += 1
+        return list(results.items())
+
+
+def _word_suffixes(label: str) -> List[str]:
+    """Folded label from each word start: "Bún Bò Huế" -> bun bo hue, bo hue, hue"""
+    words = fold_text(label).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+# id -> recipe name
+recipe_suggestions = PrefixIndex()
+# folded ingredient name -> display name, counted once per ingredient row
+ingredient_suggestions = PrefixIndex()
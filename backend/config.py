@@ -0,0 +1,33 @@
+# Application settings read from the environment (see .env.example)
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Read-through cache of serialized recipes in RecipeService.get_recipe
+RECIPE_CACHE_ENABLED = _env_bool("RECIPE_CACHE_ENABLED", True)
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv("RECIPE_CACHE_MAX_ENTRIES", "1024"))
+RECIPE_CACHE_TTL_SECONDS = float(os.getenv("RECIPE_CACHE_TTL_SECONDS", "300"))
+
+# Serialize hot read endpoints with precompiled serializers instead of response_model validation
+FAST_JSON_RESPONSES = _env_bool("FAST_JSON_RESPONSES", False)
+
+# Serve read endpoints from async handlers on an AsyncSession (needs asyncpg, or aiosqlite for SQLite).
+# Requests waiting on the database then hold no worker thread; writes keep the sync handlers.
+ASYNC_DATABASE = _env_bool("ASYNC_DATABASE", False)
+
+# Meal-plan search runs in this many worker processes (0 = in the request thread),
+# stopping after the time budget unless the request sets a shorter one
+MEAL_PLAN_PROCESSES = int(os.getenv("MEAL_PLAN_PROCESSES", "2"))
+MEAL_PLAN_TIME_BUDGET_MS = int(os.getenv("MEAL_PLAN_TIME_BUDGET_MS", "500"))
+# Memoized meal-plan matrix rows (one per recipe); should exceed the number of recipes,
+# since every plan reads them all and a smaller LRU would evict each row before its reuse
+MEAL_PLAN_MEMO_MAX_ENTRIES = int(os.getenv("MEAL_PLAN_MEMO_MAX_ENTRIES", "100000"))
@@ -3,5 +3,9 @@ from .recipe_repository import RecipeRepository
 from .ingredient_repository import IngredientRepository
 from .step_repository import StepRepository
 from .pantry_repository import PantryRepository
+from .catalog_repository import IngredientCatalogRepository
+from .facet_repository import RecipeFacetRepository
+from .unit_of_work import UnitOfWork
 
-__all__ = ['RecipeRepository', 'IngredientRepository', 'StepRepository', 'PantryRepository']
+__all__ = ['RecipeRepository', 'IngredientRepository', 'StepRepository', 'PantryRepository',
+           'IngredientCatalogRepository', 'RecipeFacetRepository', 'UnitOfWork']
@@ -0,0 +1,20 @@
+# Backend 3-Layer Architecture
+# Data Access Layer - Async Pantry Repository
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from backend.models import Pantry
+
+
+class AsyncPantryRepository:
+    """Async repository for Pantry reads"""
+
+    @staticmethod
+    async def get_all(db: AsyncSession) -> List[Pantry]:
+        """Get all pantry items"""
+        return list((await db.scalars(select(Pantry))).all())
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, pantry_id: int) -> Optional[Pantry]:
+        """Get pantry item by ID"""
+        return await db.scalar(select(Pantry).where(Pantry.id == pantry_id))
@@ -0,0 +1,107 @@
+# Backend 3-Layer Architecture
+# Data Access Layer - Async Recipe Repository
+#
+# asyncio counterparts of RecipeRepository's read paths, for AsyncSession.
+# Queries and loading profiles are the same; only the execution is awaited.
+# Imported only in async mode (config.ASYNC_DATABASE): SQLAlchemy's asyncio
+# extension needs greenlet and an asyncio driver.
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from typing import Any, Dict, List, Optional, Tuple
+from backend.data_layer.recipe_repository import LOAD_PROFILES, RecipeRepository
+from backend.models import Recipe
+
+
+class AsyncRecipeRepository:
+    """Async repository for Recipe reads"""
+
+    @staticmethod
+    def _select(profile: str) -> Select:
+        return select(Recipe).options(*LOAD_PROFILES[profile])
+
+    @staticmethod
+    async def _recipes(db: AsyncSession, statement: Select) -> List[Recipe]:
+        # unique(): the "detail" profile joins a collection into the recipe rows
+        return list((await db.execute(statement)).unique().scalars().all())
+
+    # Filters, sort orders and pages come from RecipeRepository: its helpers only use
+    # filter/order_by/offset/limit, which Select shares with Query
+
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        profile: str = "list",
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> List[Recipe]:
+        """Get all recipes matching `filters` with pagination, ordered by `sort` (default ID)"""
+        statement = RecipeRepository._offset_page(
+            AsyncRecipeRepository._select(profile), skip, limit, filters, sort
+        )
+        return await AsyncRecipeRepository._recipes(db, statement)
+
+    @staticmethod
+    async def get_page_after(
+        db: AsyncSession,
+        after: Optional[Tuple],
+        limit: int = 100,
+        profile: str = "list",
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> List[Recipe]:
+        """Get the next page ordered by `sort`'s key, seeking past the `after` key"""
+        statement = RecipeRepository._keyset_page(
+            AsyncRecipeRepository._select(profile), after, limit, filters, sort
+        )
+        return await AsyncRecipeRepository._recipes(db, statement)
+
+    @staticmethod
+    async def get_versions(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_all would return, without loading recipes"""
+        statement = RecipeRepository._offset_page(select(Recipe.id, Recipe.version), skip, limit, filters, sort)
+        return [tuple(row) for row in (await db.execute(statement)).all()]
+
+    @staticmethod
+    async def get_page_versions_after(
+        db: AsyncSession,
+        after: Optional[Tuple],
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_page_after would return, without loading recipes"""
+        statement = RecipeRepository._keyset_page(select(Recipe.id, Recipe.version), after, limit, filters, sort)
+        return [tuple(row) for row in (await db.execute(statement)).all()]
+
+    @staticmethod
+    async def get_version(db: AsyncSession, recipe_id: int) -> Optional[int]:
+        """Get only the version of a recipe"""
+        return await db.scalar(select(Recipe.version).where(Recipe.id == recipe_id))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, recipe_id: int, profile: str = "detail") -> Optional[Recipe]:
+        """Get recipe by ID"""
+        recipes = await AsyncRecipeRepository._recipes(
+            db, AsyncRecipeRepository._select(profile).where(Recipe.id == recipe_id)
+        )
+        return recipes[0] if recipes else None
+
+    @staticmethod
+    async def get_many(db: AsyncSession, recipe_ids: List[int], profile: str = "list") -> List[Recipe]:
+        """Get recipes by ID, returned in the order of `recipe_ids`"""
+        if not recipe_ids:
+            return []
+        recipes = await AsyncRecipeRepository._recipes(
+            db, AsyncRecipeRepository._select(profile).where(Recipe.id.in_(recipe_ids))
+        )
+        by_id = {recipe.id: recipe for recipe in recipes}
+        return [by_id[recipe_id] for recipe_id in recipe_ids if recipe_id in by_id]
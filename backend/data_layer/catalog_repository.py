@@ -0,0 +1,63 @@
+# Backend 3-Layer Architecture
+# Data Access Layer - Ingredient Catalog Repository
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Tuple
+from backend.data_layer.pantry_repository import UPSERT_INSERTS
+from backend.models import IngredientAlias, IngredientCatalog
+
+
+class IngredientCatalogRepository:
+    """Repository for the ingredient catalog and its aliases"""
+
+    @staticmethod
+    def get_ids_by_alias(db: Session, aliases: Iterable[str]) -> Dict[str, int]:
+        """Map known aliases to their catalog IDs"""
+        aliases = list(aliases)
+        if not aliases:
+            return {}
+        rows = db.query(IngredientAlias.alias, IngredientAlias.catalog_id).filter(
+            IngredientAlias.alias.in_(aliases)
+        ).all()
+        return {alias: catalog_id for alias, catalog_id in rows}
+
+    @staticmethod
+    def get_display_names(db: Session, catalog_ids: Iterable[int]) -> Dict[int, str]:
+        """Display name per catalog ID"""
+        catalog_ids = list(catalog_ids)
+        if not catalog_ids:
+            return {}
+        rows = db.query(IngredientCatalog.id, IngredientCatalog.display_name).filter(
+            IngredientCatalog.id.in_(catalog_ids)
+        ).all()
+        return {catalog_id: name for catalog_id, name in rows}
+
+    @staticmethod
+    def add_aliases(db: Session, entries: Dict[str, Tuple[str, str]]) -> Dict[str, int]:
+        """Register aliases as {alias: (catalog key, display name)}, creating missing catalog entries.
+
+        Both inserts skip rows that already exist (ON CONFLICT DO NOTHING), so a
+        concurrent writer registering the same names wins cleanly; the mapping is
+        read back afterwards. Returns {alias: catalog ID}.
+        """
+        if not entries:
+            return {}
+        insert = UPSERT_INSERTS[db.get_bind().dialect.name]
+        entries_by_key: Dict[str, str] = {}
+        for key, display_name in entries.values():
+            entries_by_key.setdefault(key, display_name)
+        db.execute(
+            insert(IngredientCatalog)
+            .values([{"name": key, "display_name": name} for key, name in entries_by_key.items()])
+            .on_conflict_do_nothing(index_elements=[IngredientCatalog.name])
+        )
+        ids = dict(
+            db.query(IngredientCatalog.name, IngredientCatalog.id)
+            .filter(IngredientCatalog.name.in_(list(entries_by_key)))
+            .all()
+        )
+        db.execute(
+            insert(IngredientAlias)
+            .values([{"alias": alias, "catalog_id": ids[key]} for alias, (key, _) in entries.items()])
+            .on_conflict_do_nothing(index_elements=[IngredientAlias.alias])
+        )
+        return IngredientCatalogRepository.get_ids_by_alias(db, entries)
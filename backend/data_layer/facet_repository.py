@@ -0,0 +1,35 @@
+# Backend 3-Layer Architecture
+# Data Access Layer - Recipe Facet Repository
+from sqlalchemy.orm import Session
+from typing import Dict, List, Tuple
+from backend.data_layer.pantry_repository import UPSERT_INSERTS
+from backend.models import RecipeFacet
+
+
+class RecipeFacetRepository:
+    """Repository for the recipe_facets summary table"""
+
+    @staticmethod
+    def get_counts(db: Session) -> List[Tuple[str, str, int]]:
+        """(facet, value, count) of every value counted by at least one recipe"""
+        rows = db.query(RecipeFacet.facet, RecipeFacet.value, RecipeFacet.count).filter(
+            RecipeFacet.count > 0
+        ).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def add_counts(db: Session, deltas: Dict[Tuple[str, str], int]):
+        """Add signed deltas to the counts of {(facet, value): delta} in one statement.
+
+        Missing rows are inserted; the increment happens in the database, so
+        concurrent writers cannot lose updates.
+        """
+        if not deltas:
+            return
+        stmt = UPSERT_INSERTS[db.get_bind().dialect.name](RecipeFacet).values([
+            {"facet": facet, "value": value, "count": delta} for (facet, value), delta in deltas.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[RecipeFacet.facet, RecipeFacet.value],
+            set_={"count": RecipeFacet.count + stmt.excluded.count}
+        ))
@@ -1,8 +1,9 @@
 # Backend 3-Layer Architecture
 # Data Access Layer - Ingredient Repository
+from sqlalchemy import Float, Integer, and_, case, column, func, values
 from sqlalchemy.orm import Session
-from typing import List
-from backend.models import Ingredient
+from typing import Dict, List, Optional, Tuple
+from backend.models import Ingredient, IngredientAlias, IngredientCatalog, Pantry, Recipe
 
 
 class IngredientRepository:
@@ -13,14 +14,152 @@ class IngredientRepository:
         """Get all ingredients for a recipe"""
         return db.query(Ingredient).filter(Ingredient.recipe_id == recipe_id).all()
     
+    @staticmethod
+    def get_rows_by_recipe_ids(db: Session, recipe_ids: List[int]) -> List[Dict]:
+        """Get the ingredient columns of many recipes as dicts, in one query"""
+        if not recipe_ids:
+            return []
+        rows = (
+            db.query(
+                Ingredient.name, Ingredient.quantity, Ingredient.unit,
+                Ingredient.id, Ingredient.recipe_id
+            )
+            .filter(Ingredient.recipe_id.in_(recipe_ids))
+            .order_by(Ingredient.id)
+            .all()
+        )
+        return [dict(row._mapping) for row in rows]
+
+    @staticmethod
+    def get_name_counts(db: Session) -> List[Tuple[str, int]]:
+        """Get each distinct ingredient name with the number of rows using it"""
+        rows = db.query(Ingredient.name, func.count(Ingredient.id)).group_by(Ingredient.name).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def get_normalized_pairs(db: Session) -> List[Tuple[int, str]]:
+        """Get distinct (recipe_id, normalized_name) pairs, read from the inverted index"""
+        rows = (
+            db.query(Ingredient.recipe_id, Ingredient.normalized_name)
+            .filter(Ingredient.normalized_name.isnot(None))
+            .distinct()
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def _catalog_keys(query):
+        """Outer-join the catalog entry of each ingredient row to `query`.
+
+        Rows written before they were linked (catalog_id NULL) fall back to the
+        alias of their normalized name, and to the normalized name itself when
+        that spelling is not in the catalog either. Returns the joined query, the
+        effective catalog ID, the fallback name (NULL when there is a catalog ID)
+        and the display name.
+        """
+        catalog_id = func.coalesce(Ingredient.catalog_id, IngredientAlias.catalog_id)
+        fallback = case((catalog_id.is_(None), func.coalesce(Ingredient.normalized_name, Ingredient.name)))
+        query = (
+            query
+            .outerjoin(IngredientAlias, and_(
+                Ingredient.catalog_id.is_(None), IngredientAlias.alias == Ingredient.normalized_name
+            ))
+            .outerjoin(IngredientCatalog, IngredientCatalog.id == catalog_id)
+        )
+        return query, catalog_id, fallback, IngredientCatalog.display_name
+
+    @staticmethod
+    def get_shopping_totals(
+        db: Session,
+        weights: List[Tuple[int, float, float, int]]
+    ) -> List[Tuple[str, str, float]]:
+        """(name, canonical unit, still needed) for the given recipes, in one aggregate query.
+
+        `weights` holds (recipe_id, multiplier, target servings, position) per recipe and
+        is joined in as a VALUES list, so each ingredient row counts (multiplier + target
+        servings / recipe servings) times. Canonical quantities are summed per (catalog
+        entry, canonical unit), so "Onion" and "onions" are one item, minus the pantry
+        stock of the same entry and dimension (LEFT JOIN); only positive shortfalls are
+        returned, in order of first appearance (recipe position, then ingredient id).
+        Unlinked rows are grouped as _catalog_keys describes.
+        """
+        if not weights:
+            return []
+        weight = values(
+            column("recipe_id", Integer),
+            column("multiplier", Float),
+            column("servings", Float),
+            column("position", Integer),
+            name="weights"
+        ).data(weights).cte("weights")
+        scale = weight.c.multiplier + weight.c.servings / func.coalesce(func.nullif(Recipe.servings, 0), 1)
+        remaining = (
+            func.sum(Ingredient.canonical_quantity * scale) - func.coalesce(Pantry.canonical_quantity, 0)
+        )
+        query = (
+            db.query(Ingredient)
+            .join(weight, weight.c.recipe_id == Ingredient.recipe_id)
+            .join(Recipe, Recipe.id == Ingredient.recipe_id)
+        )
+        query, catalog_id, fallback, display_name = IngredientRepository._catalog_keys(query)
+        rows = (
+            query
+            .outerjoin(Pantry, and_(
+                Pantry.catalog_id == catalog_id, Pantry.canonical_unit == Ingredient.canonical_unit
+            ))
+            .with_entities(
+                func.coalesce(display_name, func.min(Ingredient.name)),
+                Ingredient.canonical_unit,
+                remaining.label("remaining")
+            )
+            .group_by(catalog_id, fallback, Ingredient.canonical_unit, display_name, Pantry.canonical_quantity)
+            .having(remaining > 0)
+            # First appearance as one sortable number: position, then ingredient id (< 2^32)
+            .order_by(func.min(weight.c.position * 4294967296 + Ingredient.id))
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def get_canonical_rows(
+        db: Session,
+        recipe_ids: List[int]
+    ) -> List[Tuple[int, int, int, Optional[int], Optional[str], str, str, float]]:
+        """(recipe_id, recipe version, recipe servings, catalog ID, fallback name, display name,
+        canonical unit, canonical quantity) of every ingredient of the given recipes, read in
+        one statement so versions match the rows.
+
+        (catalog ID, fallback name) identifies the ingredient; see _catalog_keys.
+        """
+        if not recipe_ids:
+            return []
+        query = db.query(Ingredient).join(Recipe, Recipe.id == Ingredient.recipe_id)
+        query, catalog_id, fallback, display_name = IngredientRepository._catalog_keys(query)
+        rows = (
+            query
+            .with_entities(
+                Ingredient.recipe_id,
+                Recipe.version,
+                Recipe.servings,
+                catalog_id,
+                fallback,
+                func.coalesce(display_name, Ingredient.name),
+                Ingredient.canonical_unit,
+                Ingredient.canonical_quantity
+            )
+            .filter(Ingredient.recipe_id.in_(recipe_ids))
+            .order_by(Ingredient.recipe_id, Ingredient.id)
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
     @staticmethod
     def delete_by_recipe_id(db: Session, recipe_id: int):
         """Delete all ingredients for a recipe"""
         db.query(Ingredient).filter(Ingredient.recipe_id == recipe_id).delete()
-        db.commit()
     
     @staticmethod
     def create_batch(db: Session, ingredients: List[Ingredient]):
         """Create multiple ingredients"""
         db.add_all(ingredients)
-        db.commit()
+        db.flush()
@@ -1,9 +1,14 @@
 # Backend 3-Layer Architecture
 # Data Access Layer - Pantry Repository
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from backend.models import Pantry
 
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
 
 class PantryRepository:
     """Repository for Pantry database operations"""
@@ -13,6 +18,11 @@ class PantryRepository:
         """Get all pantry items"""
         return db.query(Pantry).all()
     
+    @staticmethod
+    def get_names(db: Session) -> List[str]:
+        """Get the names of all pantry items that are not used up"""
+        return [row.name for row in db.query(Pantry.name).filter(Pantry.quantity > 0).all()]
+
     @staticmethod
     def get_by_id(db: Session, pantry_id: int) -> Optional[Pantry]:
         """Get pantry item by ID"""
@@ -25,17 +35,85 @@ class PantryRepository:
     
     @staticmethod
     def create(db: Session, pantry: Pantry) -> Pantry:
-        """Create new pantry item"""
+        """Add a new pantry item and flush to assign its ID"""
         db.add(pantry)
-        db.commit()
-        db.refresh(pantry)
+        db.flush()
         return pantry
     
+    @staticmethod
+    def upsert_many(db: Session, rows: List[Dict]) -> List[Pantry]:
+        """Insert pantry rows, or add them to the stored row of the same catalog entry, in one statement.
+
+        Rows carry name, quantity, unit, canonical quantity/unit and catalog_id, with
+        unique catalog IDs. On conflict the stored name stays, amounts of the same
+        dimension are added up and expressed in the incoming unit; otherwise the raw
+        quantities are added (the incoming unit wins). The increment happens in the
+        database, so concurrent upserts of one ingredient ("Salt" and "salt") cannot
+        lose updates or hit the unique constraint.
+        """
+        if not rows:
+            return []
+        stmt = UPSERT_INSERTS[db.get_bind().dialect.name](Pantry).values(rows)
+        incoming = stmt.excluded
+        same_dimension = Pantry.canonical_unit == incoming.canonical_unit
+        # incoming canonical quantity per incoming unit (quantities are > 0)
+        factor = incoming.canonical_quantity / incoming.quantity
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Pantry.catalog_id],
+            set_={
+                "quantity": case(
+                    (same_dimension, (Pantry.canonical_quantity + incoming.canonical_quantity) / factor),
+                    else_=Pantry.quantity + incoming.quantity
+                ),
+                "unit": incoming.unit,
+                "canonical_quantity": case(
+                    (same_dimension, Pantry.canonical_quantity + incoming.canonical_quantity),
+                    else_=(Pantry.quantity + incoming.quantity) * factor
+                ),
+                "canonical_unit": incoming.canonical_unit,
+            }
+        ).returning(Pantry)
+        pantry = db.scalars(stmt, execution_options={"populate_existing": True}).all()
+        by_catalog_id = {item.catalog_id: item for item in pantry}
+        return [by_catalog_id[row["catalog_id"]] for row in rows]
+
+    @staticmethod
+    def lock_by_catalog_ids(db: Session, catalog_ids: List[int]) -> List[Pantry]:
+        """Pantry items of the given catalog entries, locked (SELECT ... FOR UPDATE) until the transaction ends.
+
+        Rows are locked in ID order so concurrent callers cannot deadlock each other.
+        """
+        if not catalog_ids:
+            return []
+        return (
+            db.query(Pantry)
+            .filter(Pantry.catalog_id.in_(catalog_ids))
+            .order_by(Pantry.id)
+            .with_for_update()
+            .all()
+        )
+
+    @staticmethod
+    def consume(db: Session, used: Dict[int, Tuple[float, float]]):
+        """Subtract (quantity, canonical quantity) per pantry ID in one UPDATE; used-up rows stay at 0"""
+        if not used:
+            return
+        db.query(Pantry).filter(Pantry.id.in_(list(used))).update(
+            {
+                Pantry.quantity: Pantry.quantity - case(
+                    {pantry_id: amounts[0] for pantry_id, amounts in used.items()}, value=Pantry.id
+                ),
+                Pantry.canonical_quantity: Pantry.canonical_quantity - case(
+                    {pantry_id: amounts[1] for pantry_id, amounts in used.items()}, value=Pantry.id
+                ),
+            },
+            synchronize_session="fetch"
+        )
+
     @staticmethod
     def update(db: Session, pantry: Pantry) -> Pantry:
-        """Update existing pantry item"""
-        db.commit()
-        db.refresh(pantry)
+        """Flush changes to an existing pantry item"""
+        db.flush()
         return pantry
     
     @staticmethod
@@ -44,6 +122,6 @@ class PantryRepository:
         pantry = PantryRepository.get_by_id(db, pantry_id)
         if pantry:
             db.delete(pantry)
-            db.commit()
+            db.flush()
             return True
         return False
@@ -1,49 +1,318 @@
 # Backend 3-Layer Architecture
 # Data Access Layer - Recipe Repository
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from backend.models import Recipe
+from sqlalchemy import func, insert, literal_column, tuple_
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from backend.models import Recipe, Ingredient, Step
+
+# Named loading profiles for a recipe's children.
+# "list":   one batched SELECT ... WHERE recipe_id IN (...) per relationship,
+#           so a page of any size costs 3 queries instead of 1 + 2N.
+# "detail": ingredients joined into the recipe row, steps batched separately
+#           (joining both collections would return ingredients x steps rows).
+# "bare":   recipe columns only; children load lazily if touched.
+LOAD_PROFILES = {
+    "list": (selectinload(Recipe.ingredients), selectinload(Recipe.steps)),
+    "detail": (joinedload(Recipe.ingredients), selectinload(Recipe.steps)),
+    "bare": (),
+}
+
+# List filters by name, as predicates on the stored listing columns
+RECIPE_FILTERS = {
+    "cuisine": lambda value: Recipe.cuisine == value,
+    "min_total_time": lambda value: Recipe.total_time_minutes >= value,
+    "max_total_time": lambda value: Recipe.total_time_minutes <= value,
+    "min_ingredients": lambda value: Recipe.ingredient_count >= value,
+    "max_ingredients": lambda value: Recipe.ingredient_count <= value,
+}
+
+# List sort orders: key columns and whether they run descending. Each key is indexed
+# alone and behind cuisine (see models.Recipe), so a filtered page is read in key order.
+RECIPE_SORTS = {
+    "name": (("name", "id"), False),
+    "time": (("total_time_minutes", "id"), False),
+    "newest": (("id",), True),
+}
 
 
 class RecipeRepository:
     """Repository for Recipe database operations"""
+
+    @staticmethod
+    def _query(db: Session, profile: str) -> Query:
+        """Base recipe query with the given loading profile applied"""
+        return db.query(Recipe).options(*LOAD_PROFILES[profile])
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Recipe]:
-        """Get all recipes with pagination"""
-        return db.query(Recipe).offset(skip).limit(limit).all()
+    def _filtered(query: Query, filters: Optional[Dict[str, Any]]) -> Query:
+        for name, value in (filters or {}).items():
+            query = query.filter(RECIPE_FILTERS[name](value))
+        return query
+
+    @staticmethod
+    def _order(sort: str) -> List:
+        columns, descending = RECIPE_SORTS[sort]
+        return [getattr(Recipe, name).desc() if descending else getattr(Recipe, name) for name in columns]
+
+    @staticmethod
+    def _offset_page(
+        query: Query,
+        skip: int,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> Query:
+        order = RecipeRepository._order(sort) if sort else [Recipe.id]
+        return RecipeRepository._filtered(query, filters).order_by(*order).offset(skip).limit(limit)
+
+    @staticmethod
+    def _keyset_page(
+        query: Query,
+        after: Optional[Tuple],
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> Query:
+        # Served by the sort's index, so every page costs the same regardless of depth
+        query = RecipeRepository._filtered(query, filters)
+        if after is not None:
+            columns, descending = RECIPE_SORTS[sort]
+            key = tuple_(*(getattr(Recipe, name) for name in columns))
+            query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+        return query.order_by(*RecipeRepository._order(sort)).limit(limit)
+
+    @staticmethod
+    def get_all(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        profile: str = "list",
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> List[Recipe]:
+        """Get all recipes matching `filters` with pagination, ordered by `sort` (default ID)"""
+        query = RecipeRepository._query(db, profile)
+        return RecipeRepository._offset_page(query, skip, limit, filters, sort).all()
     
     @staticmethod
-    def get_by_id(db: Session, recipe_id: int) -> Optional[Recipe]:
+    def get_page_after(
+        db: Session,
+        after: Optional[Tuple],
+        limit: int = 100,
+        profile: str = "list",
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> List[Recipe]:
+        """Get the next page ordered by `sort`'s key, seeking past the `after` key"""
+        query = RecipeRepository._query(db, profile)
+        return RecipeRepository._keyset_page(query, after, limit, filters, sort).all()
+
+    @staticmethod
+    def get_versions(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_all would return, without loading recipes"""
+        query = db.query(Recipe.id, Recipe.version)
+        return [tuple(row) for row in RecipeRepository._offset_page(query, skip, limit, filters, sort).all()]
+
+    @staticmethod
+    def get_page_versions_after(
+        db: Session,
+        after: Optional[Tuple],
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_page_after would return, without loading recipes"""
+        query = RecipeRepository._keyset_page(db.query(Recipe.id, Recipe.version), after, limit, filters, sort)
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def get_columns(
+        db: Session,
+        columns: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None
+    ) -> List[Dict]:
+        """Only the named recipe columns of the rows get_all would return, as dicts"""
+        query = db.query(*(getattr(Recipe, name) for name in columns))
+        query = RecipeRepository._offset_page(query, skip, limit, filters, sort)
+        return [dict(row._mapping) for row in query.all()]
+
+    @staticmethod
+    def get_columns_page_after(
+        db: Session,
+        columns: List[str],
+        after: Optional[Tuple],
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "name"
+    ) -> List[Dict]:
+        """Only the named recipe columns of the rows get_page_after would return, as dicts"""
+        query = db.query(*(getattr(Recipe, name) for name in columns))
+        query = RecipeRepository._keyset_page(query, after, limit, filters, sort)
+        return [dict(row._mapping) for row in query.all()]
+
+    @staticmethod
+    def get_version(db: Session, recipe_id: int) -> Optional[int]:
+        """Get only the version of a recipe"""
+        row = db.query(Recipe.version).filter(Recipe.id == recipe_id).first()
+        return row.version if row else None
+
+    @staticmethod
+    def get_by_id(db: Session, recipe_id: int, profile: str = "detail") -> Optional[Recipe]:
         """Get recipe by ID"""
-        return db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        return RecipeRepository._query(db, profile).filter(Recipe.id == recipe_id).first()
     
     @staticmethod
-    def search_by_name(db: Session, name: str) -> List[Recipe]:
-        """Search recipes by name"""
-        return db.query(Recipe).filter(Recipe.name.contains(name)).all()
+    def get_versions_with_ingredients(db: Session) -> List[Tuple[int, int]]:
+        """(id, version) of every recipe that has ingredients, ordered by ID"""
+        rows = db.query(Recipe.id, Recipe.version).filter(Recipe.ingredient_count > 0).order_by(Recipe.id).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def get_versions_by_ids(db: Session, recipe_ids: List[int]) -> Dict[int, int]:
+        """Version of each existing recipe among `recipe_ids`, without loading recipes"""
+        if not recipe_ids:
+            return {}
+        return dict(db.query(Recipe.id, Recipe.version).filter(Recipe.id.in_(recipe_ids)).all())
+
+    @staticmethod
+    def get_scale_rows(db: Session, recipe_ids: List[int]) -> List[Tuple]:
+        """(recipe_id, version, servings, catalog_id, normalized name, name, unit, canonical quantity,
+        canonical unit) per ingredient of the given recipes, in one query; a recipe without
+        ingredients yields one row with None ingredient columns.
+        """
+        if not recipe_ids:
+            return []
+        rows = (
+            db.query(
+                Recipe.id,
+                Recipe.version,
+                Recipe.servings,
+                Ingredient.catalog_id,
+                Ingredient.normalized_name,
+                Ingredient.name,
+                Ingredient.unit,
+                Ingredient.canonical_quantity,
+                Ingredient.canonical_unit
+            )
+            .outerjoin(Ingredient, Ingredient.recipe_id == Recipe.id)
+            .filter(Recipe.id.in_(recipe_ids))
+            .order_by(Recipe.id, Ingredient.id)
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def get_many(db: Session, recipe_ids: List[int], profile: str = "list") -> List[Recipe]:
+        """Get recipes by ID, returned in the order of `recipe_ids`"""
+        if not recipe_ids:
+            return []
+        recipes = RecipeRepository._query(db, profile).filter(Recipe.id.in_(recipe_ids)).all()
+        by_id = {recipe.id: recipe for recipe in recipes}
+        return [by_id[recipe_id] for recipe_id in recipe_ids if recipe_id in by_id]
+
+    @staticmethod
+    def iter_chunks(db: Session, chunk_size: int = 500) -> Iterator[List[Recipe]]:
+        """Stream every recipe ordered by ID in lists of `chunk_size`.
+
+        Rows come from a server-side cursor (yield_per), and each chunk's children
+        are loaded with one batched query per relationship as the chunk is fetched.
+        """
+        rows = iter(RecipeRepository._query(db, "list").order_by(Recipe.id).yield_per(chunk_size))
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk
+
+    @staticmethod
+    def full_text_search(db: Session, terms: List[str], skip: int = 0, limit: int = 20) -> List[int]:
+        """Rank recipe IDs matching all terms (PostgreSQL only).
+
+        Uses the GIN-indexed `search_vector` column added by migration 005.
+        """
+        search_vector = literal_column("recipes.search_vector")
+        ts_query = func.to_tsquery("simple", " & ".join(terms))
+        rows = (
+            db.query(Recipe.id)
+            .filter(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(search_vector, ts_query).desc(), Recipe.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [row.id for row in rows]
+
+    @staticmethod
+    def get_search_documents(db: Session) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """Get (id, search_name, search_text) for every recipe"""
+        rows = db.query(Recipe.id, Recipe.search_name, Recipe.search_text).all()
+        return [tuple(row) for row in rows]
     
+    @staticmethod
+    def get_names(db: Session, recipe_ids: Optional[List[int]] = None) -> List[Tuple[int, str]]:
+        """Get (id, name) for every recipe, or only for `recipe_ids`"""
+        query = db.query(Recipe.id, Recipe.name)
+        if recipe_ids is not None:
+            query = query.filter(Recipe.id.in_(recipe_ids))
+        return [tuple(row) for row in query.all()]
+
     @staticmethod
     def create(db: Session, recipe: Recipe) -> Recipe:
-        """Create new recipe"""
+        """Add a new recipe (with any children attached to it) and flush to assign IDs"""
         db.add(recipe)
-        db.commit()
-        db.refresh(recipe)
+        db.flush()
         return recipe
     
+    @staticmethod
+    def create_many(
+        db: Session,
+        recipes: List[Dict],
+        ingredients: List[List[Dict]],
+        steps: List[List[Dict]]
+    ) -> List[int]:
+        """Insert recipes and their children with multi-row INSERTs.
+
+        `ingredients[i]` and `steps[i]` belong to `recipes[i]` and get its recipe_id.
+        Returns the new IDs (via RETURNING) in input order.
+        """
+        if not recipes:
+            return []
+        # render_nulls keeps rows with different None columns in one multi-row INSERT
+        recipe_ids = list(db.scalars(
+            insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True),
+            recipes,
+            execution_options={"render_nulls": True}
+        ))
+        for model, children in ((Ingredient, ingredients), (Step, steps)):
+            rows = [
+                dict(row, recipe_id=recipe_id)
+                for recipe_id, recipe_rows in zip(recipe_ids, children)
+                for row in recipe_rows
+            ]
+            if rows:
+                db.execute(insert(model), rows, execution_options={"render_nulls": True})
+        return recipe_ids
+
     @staticmethod
     def update(db: Session, recipe: Recipe) -> Recipe:
-        """Update existing recipe"""
-        db.commit()
-        db.refresh(recipe)
+        """Flush changes to an existing recipe"""
+        db.flush()
         return recipe
     
     @staticmethod
     def delete(db: Session, recipe_id: int) -> bool:
-        """Delete recipe"""
-        recipe = RecipeRepository.get_by_id(db, recipe_id)
+        """Delete recipe (and its children)"""
+        # Session.get reuses the recipe if this session already loaded it
+        recipe = db.get(Recipe, recipe_id)
         if recipe:
             db.delete(recipe)
-            db.commit()
+            db.flush()
             return True
         return False
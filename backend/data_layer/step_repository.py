@@ -1,7 +1,7 @@
 # Backend 3-Layer Architecture
 # Data Access Layer - Step Repository
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List
 from backend.models import Step
 
 
@@ -13,14 +13,26 @@ class StepRepository:
         """Get all steps for a recipe, ordered by step_number"""
         return db.query(Step).filter(Step.recipe_id == recipe_id).order_by(Step.step_number).all()
     
+    @staticmethod
+    def get_rows_by_recipe_ids(db: Session, recipe_ids: List[int]) -> List[Dict]:
+        """Get the step columns of many recipes as dicts, in one query, ordered by step_number"""
+        if not recipe_ids:
+            return []
+        rows = (
+            db.query(Step.step_number, Step.instruction, Step.id, Step.recipe_id)
+            .filter(Step.recipe_id.in_(recipe_ids))
+            .order_by(Step.recipe_id, Step.step_number)
+            .all()
+        )
+        return [dict(row._mapping) for row in rows]
+
     @staticmethod
     def delete_by_recipe_id(db: Session, recipe_id: int):
         """Delete all steps for a recipe"""
         db.query(Step).filter(Step.recipe_id == recipe_id).delete()
-        db.commit()
     
     @staticmethod
     def create_batch(db: Session, steps: List[Step]):
         """Create multiple steps"""
         db.add_all(steps)
-        db.commit()
+        db.flush()
@@ -0,0 +1,35 @@
+# Backend 3-Layer Architecture
+# Data Access Layer - Unit of Work
+#
+# Repositories only add, change and flush; the service wraps each call in a
+# UnitOfWork so all of its writes land in one transaction with one commit, or
+# roll back together when anything fails. Nested units (a service calling
+# another service) join the outermost one, which alone commits.
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """Transaction boundary of one service call: commit on success, roll back on error"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.outermost = False
+
+    def __enter__(self) -> "UnitOfWork":
+        self.outermost = not self.db.info.get("unit_of_work")
+        self.db.info["unit_of_work"] = True
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if not self.outermost:
+            return False
+        del self.db.info["unit_of_work"]
+        if exc_type is not None:
+            self.db.rollback()
+            return False
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return False
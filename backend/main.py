@@ -1,7 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from backend.presentation_layer import recipe_controller, pantry_controller, shopping_list_controller
+from backend.presentation_layer import recipe_controller, pantry_controller, shopping_list_controller, meal_plan_controller
+from backend.business_layer import RecipeService
+from backend.business_layer.meal_planner import shutdown_pool
+from backend import config
+from backend.database import SessionLocal
 import os
 from pathlib import Path
 
@@ -10,10 +15,24 @@ from pathlib import Path
 # Relying on migrations (similar to Liquibase changesets) allows for reliable schema management in production environments.
 # To apply migrations, run: alembic upgrade head
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the in-process indexes before serving requests; stop the planner processes on shutdown"""
+    db = SessionLocal()
+    try:
+        RecipeService.build_indexes(db)
+    finally:
+        db.close()
+    yield
+    shutdown_pool()
+
+
 app = FastAPI(
     title="Recipe Book API",
     description="3-Layer Architecture Recipe Management System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -23,19 +42,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Async mode: async read handlers go first so they take those routes;
+# writes fall through to the sync controllers below
+if config.ASYNC_DATABASE:
+    from backend.presentation_layer import async_pantry_controller, async_recipe_controller
+
+    app.include_router(async_recipe_controller.router, prefix="/api")
+    app.include_router(async_pantry_controller.router, prefix="/api")
+
 # API routes - separate controllers for better organization
 app.include_router(recipe_controller.router, prefix="/api")
 app.include_router(pantry_controller.router, prefix="/api")
 app.include_router(shopping_list_controller.router, prefix="/api")
-
-# Serve frontend static files. If a production build exists in frontend/dist use it,
-# otherwise fall back to the development frontend folder so legacy files still work.
-frontend_static = "frontend/dist" if Path("frontend/dist").exists() else "frontend"
-app.mount("/", StaticFiles(directory=frontend_static, html=True), name="frontend")
+app.include_router(meal_plan_controller.router, prefix="/api")
 
 
 @app.get("/api/health")
 def health_check():
     return {"status": "healthy", "architecture": "3-layer"}
+
+
+@app.get("/api/health/cache")
+def cache_stats():
+    return {"recipes": RecipeService.cache_stats(), "scaling": RecipeService.scale_cache_stats()}
+
+
+# Serve frontend static files. If a production build exists in frontend/dist use it,
+# otherwise fall back to the development frontend folder so legacy files still work.
+# The catch-all mount must come after every API route, or it shadows them.
+frontend_static = "frontend/dist" if Path("frontend/dist").exists() else "frontend"
+app.mount("/", StaticFiles(directory=frontend_static, html=True), name="frontend")
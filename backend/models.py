@@ -1,10 +1,41 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, deferred
 from backend.database import Base
 
 
+class IngredientCatalog(Base):
+    __tablename__ = "ingredient_catalog"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # text_utils.ingredient_key: folded, singular ("Onions" -> "onion")
+    name = Column(String(200), nullable=False, unique=True)
+    # The name as first typed, shown in shopping lists
+    display_name = Column(String(200), nullable=False)
+
+
+class IngredientAlias(Base):
+    __tablename__ = "ingredient_aliases"
+
+    # text_utils.fold_text of a name as typed ("onions", "onion", "hanh tay", ...)
+    alias = Column(String(200), primary_key=True)
+    catalog_id = Column(Integer, ForeignKey("ingredient_catalog.id"), nullable=False)
+
+
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination seeks on (name, id)
+        Index("ix_recipes_name_id", "name", "id"),
+        # List filters and sorts (RecipeRepository RECIPE_SORTS): each sort key alone,
+        # and behind the cuisine equality filter; "newest" alone walks the primary key.
+        # The ingredient-count range gets the same pair (see migration 010)
+        Index("ix_recipes_cuisine_name_id", "cuisine", "name", "id"),
+        Index("ix_recipes_total_time_id", "total_time_minutes", "id"),
+        Index("ix_recipes_cuisine_total_time_id", "cuisine", "total_time_minutes", "id"),
+        Index("ix_recipes_cuisine_id", "cuisine", "id"),
+        Index("ix_recipes_ingredient_count_id", "ingredient_count", "id"),
+        Index("ix_recipes_cuisine_ingredient_count_id", "cuisine", "ingredient_count", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
@@ -13,19 +44,45 @@ class Recipe(Base):
     servings = Column(Integer, default=1)
     prep_time_minutes = Column(Integer)
     cook_time_minutes = Column(Integer)
+    # Bumped by RecipeService on every change to the recipe or its children; drives ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Stored for filtering and sorting the list, maintained by RecipeService:
+    # prep + cook time (a missing part counts as 0) and the number of ingredients
+    total_time_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    ingredient_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Diacritic-folded search documents maintained by RecipeService (see text_utils.fold_text).
+    # On PostgreSQL migration 005 also derives a GIN-indexed `search_vector` tsvector from them.
+    search_name = Column(String(200))
+    search_text = deferred(Column(Text))
 
-    ingredients = relationship("Ingredient", back_populates="recipe", cascade="all, delete-orphan")
-    steps = relationship("Step", back_populates="recipe", cascade="all, delete-orphan")
+    ingredients = relationship(
+        "Ingredient", back_populates="recipe", cascade="all, delete-orphan", order_by="Ingredient.id"
+    )
+    steps = relationship(
+        "Step", back_populates="recipe", cascade="all, delete-orphan", order_by="Step.step_number"
+    )
 
 
 class Ingredient(Base):
     __tablename__ = "ingredients"
+    __table_args__ = (
+        # Inverted index: normalized ingredient name -> recipe ids
+        Index("ix_ingredients_normalized_name_recipe_id", "normalized_name", "recipe_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=False)
     name = Column(String(200), nullable=False)
     quantity = Column(Float, nullable=False)
     unit = Column(String(50), nullable=False)
+    # text_utils.fold_text(name), maintained by RecipeService
+    normalized_name = Column(String(200))
+    # units.to_canonical(quantity, unit): grams, millilitres or pieces, so amounts add up across units
+    canonical_quantity = Column(Float)
+    canonical_unit = Column(String(50))
+    # Catalog entry the name resolves to (IngredientCatalogService), the join key for pantry matching
+    catalog_id = Column(Integer, ForeignKey("ingredient_catalog.id"), index=True)
 
     recipe = relationship("Recipe", back_populates="ingredients")
 
@@ -48,3 +105,18 @@ class Pantry(Base):
     name = Column(String(200), nullable=False, unique=True, index=True)
     quantity = Column(Float, nullable=False)
     unit = Column(String(50), nullable=False)
+    # units.to_canonical(quantity, unit), maintained by PantryService
+    canonical_quantity = Column(Float)
+    canonical_unit = Column(String(50))
+    # One row per catalog entry, so "Salt" and "salt" stock up the same item
+    catalog_id = Column(Integer, ForeignKey("ingredient_catalog.id"), index=True, unique=True)
+
+
+class RecipeFacet(Base):
+    __tablename__ = "recipe_facets"
+
+    # Recipe counts per facet value ("cuisine"/"Vietnamese", "total_time"/"16-30", ...),
+    # adjusted by RecipeService in the same transaction as each recipe write (see facets.py)
+    facet = Column(String(20), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
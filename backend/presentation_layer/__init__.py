@@ -2,5 +2,6 @@
 from . import recipe_controller
 from . import pantry_controller
 from . import shopping_list_controller
+from . import meal_plan_controller
 
-__all__ = ['recipe_controller', 'pantry_controller', 'shopping_list_controller']
+__all__ = ['recipe_controller', 'pantry_controller', 'shopping_list_controller', 'meal_plan_controller']
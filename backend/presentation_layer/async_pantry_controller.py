@@ -0,0 +1,44 @@
+# Backend 3-Layer Architecture
+# Presentation Layer - Async Pantry Controller
+#
+# `async def` handlers for the pantry reads, registered ahead of pantry_controller
+# when ASYNC_DATABASE is on (see async_recipe_controller).
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from backend.database import get_async_db
+from backend import config, schemas
+from backend.business_layer.async_pantry_service import AsyncPantryService
+from backend.presentation_layer.fast_json import fast_json_response, serialize_many, serialize_pantry
+
+router = APIRouter(prefix="/pantry", tags=["pantry"])
+
+
+@router.get("", response_model=List[schemas.Pantry])
+async def get_pantry_items(db: AsyncSession = Depends(get_async_db)):
+    """Get all pantry items"""
+    items = await AsyncPantryService.get_all_pantry_items(db)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_pantry, items))
+    return items
+
+
+@router.get("/suggest", response_model=List[str])
+async def suggest_ingredient_names(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Type-ahead ingredient names for the pantry form"""
+    return await AsyncPantryService.suggest_ingredient_names(db, prefix, limit)
+
+
+@router.get("/{pantry_id}", response_model=schemas.Pantry)
+async def get_pantry_item(pantry_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get pantry item by ID"""
+    pantry = await AsyncPantryService.get_pantry_item(db, pantry_id)
+    if not pantry:
+        raise HTTPException(status_code=404, detail="Pantry item not found")
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_pantry(pantry))
+    return pantry
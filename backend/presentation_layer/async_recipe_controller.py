@@ -0,0 +1,245 @@
+# Backend 3-Layer Architecture
+# Presentation Layer - Async Recipe Controller
+#
+# `async def` handlers for the recipe read endpoints, used when ASYNC_DATABASE is
+# on. main.py registers this router ahead of recipe_controller, so these routes
+# win for GET (and the batch POST) while writes fall through to the sync handlers.
+# A request waiting on the database holds no worker thread here.
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from backend.database import get_async_db
+from backend import config, schemas
+from backend.business_layer.async_recipe_service import AsyncRecipeService
+from backend.presentation_layer import recipe_controller
+from backend.presentation_layer.recipe_controller import _list_filters, _split
+from backend.presentation_layer.http_cache import etag_matches, list_etag, not_modified, recipe_etag
+from backend.presentation_layer.fast_json import fast_json_response, serialize_many, serialize_recipe
+
+router = APIRouter(prefix="/recipes", tags=["recipes"])
+
+
+async def _sparse_page(
+    response: Response,
+    fields: Optional[List[str]],
+    include: Optional[List[str]],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    filters: schemas.RecipeFilters,
+    sort: Optional[str],
+    if_none_match: Optional[str],
+    db: AsyncSession
+):
+    """Async recipe_controller._sparse_page"""
+    selected = ",".join(sorted(fields)) if fields is not None else "*"
+    variant = f"fields={selected};include={','.join(sorted(include or []))}"
+    try:
+        if if_none_match:
+            versions, has_more = await AsyncRecipeService.get_recipes_versions(
+                db, skip, limit, cursor, filters, sort
+            )
+            etag = list_etag(versions, has_more, variant)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        page, next_cursor, versions = await AsyncRecipeService.get_recipe_fields(
+            db, fields, include, skip, limit, cursor, filters, sort
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = list_etag(versions, next_cursor is not None, variant)
+    return fast_json_response(page, response)
+
+
+@router.get("", response_model=List[schemas.Recipe])
+async def get_recipes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    filters: schemas.RecipeFilters = Depends(_list_filters),
+    sort: Optional[schemas.RecipeSort] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all recipes with offset or keyset pagination (see recipe_controller.get_recipes)"""
+    if fields is not None or include is not None:
+        return await _sparse_page(
+            response, _split(fields), _split(include), skip, limit, cursor, filters, sort, if_none_match, db
+        )
+
+    try:
+        if if_none_match:
+            versions, has_more = await AsyncRecipeService.get_recipes_versions(
+                db, skip, limit, cursor, filters, sort
+            )
+            etag = list_etag(versions, has_more)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if cursor is None:
+            recipes, next_cursor = await AsyncRecipeService.get_all_recipes(db, skip, limit, filters, sort), None
+        else:
+            recipes, next_cursor = await AsyncRecipeService.get_recipes_page(db, cursor, limit, filters, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = list_etag(
+        [(recipe.id, recipe.version) for recipe in recipes], next_cursor is not None
+    )
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_recipe, recipes), response)
+    return recipes
+
+
+@router.get("/summary", response_model=List[schemas.RecipeSummary])
+async def get_recipe_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    filters: schemas.RecipeFilters = Depends(_list_filters),
+    sort: Optional[schemas.RecipeSort] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lightweight recipe cards: id, name, cuisine, servings and times, no children"""
+    return await _sparse_page(
+        response, list(schemas.RecipeSummary.model_fields), None,
+        skip, limit, cursor, filters, sort, if_none_match, db
+    )
+
+
+# The export stream already runs off the event loop on its own session
+router.add_api_route(
+    "/export", recipe_controller.export_recipes, methods=["GET"], response_class=StreamingResponse
+)
+# Facets read one small summary table; the sync handler runs in the threadpool. Registered
+# here so the async /{recipe_id} route below does not capture the path
+router.add_api_route(
+    "/facets", recipe_controller.get_recipe_facets, methods=["GET"], response_model=schemas.RecipeFacets
+)
+
+
+async def _batch_response(recipe_ids: List[int], db: AsyncSession):
+    try:
+        recipes, missing = await AsyncRecipeService.get_recipes_batch(db, recipe_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response({
+            "recipes": serialize_many(serialize_recipe, recipes),
+            "missing": missing
+        })
+    return schemas.RecipeBatch(recipes=recipes, missing=missing)
+
+
+@router.get("/batch", response_model=schemas.RecipeBatch)
+async def get_recipes_batch(
+    ids: str = Query(..., description="Comma-separated recipe IDs, e.g. 1,2,3"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get many recipes in one request; IDs that do not exist are listed in `missing`"""
+    try:
+        recipe_ids = [int(part) for part in _split(ids)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    return await _batch_response(recipe_ids, db)
+
+
+@router.post("/batch", response_model=schemas.RecipeBatch)
+async def post_recipes_batch(
+    recipe_ids: List[int],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Batch get for ID lists too long for a query string (body: array of recipe IDs)"""
+    return await _batch_response(recipe_ids, db)
+
+
+@router.get("/search", response_model=List[schemas.Recipe])
+async def search_recipes(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search (accent-insensitive) over name, description, cuisine and steps"""
+    recipes = await AsyncRecipeService.search_recipes(db, q, skip, limit)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_recipe, recipes))
+    return recipes
+
+
+@router.get("/suggest", response_model=List[schemas.RecipeSuggestion])
+async def suggest_recipes(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Type-ahead recipe names (id + name only) matching a word prefix"""
+    return await AsyncRecipeService.suggest_recipes(db, prefix, limit)
+
+
+@router.get("/by-ingredients", response_model=List[schemas.RecipeMatch])
+async def find_recipes_by_ingredients(
+    ingredients: List[str] = Query(..., min_length=1, description="Repeat for each ingredient"),
+    match: Literal["all", "any"] = "all",
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recipes using all (or any) of the given ingredients"""
+    return await AsyncRecipeService.find_recipes_by_ingredients(db, ingredients, match == "all", limit)
+
+
+@router.get("/cookable", response_model=List[schemas.RecipeMatch])
+async def get_cookable_recipes(
+    min_coverage: float = Query(0.0, ge=0, le=1),
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recipes ranked by the fraction of their ingredients covered by the pantry"""
+    return await AsyncRecipeService.rank_by_pantry_coverage(db, min_coverage, limit)
+
+
+@router.get("/{recipe_id}", response_model=schemas.Recipe)
+async def get_recipe(
+    recipe_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get recipe by ID; a matching If-None-Match gets 304 after a version-only query"""
+    if if_none_match:
+        version = await AsyncRecipeService.get_recipe_version(db, recipe_id)
+        if version is not None and etag_matches(if_none_match, recipe_etag(recipe_id, version)):
+            return not_modified(recipe_etag(recipe_id, version))
+
+    recipe = await AsyncRecipeService.get_recipe(db, recipe_id)
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    response.headers["ETag"] = recipe_etag(recipe.id, recipe.version)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_recipe(recipe), response)
+    return recipe
+
+
+@router.get("/{recipe_id}/scale")
+async def scale_recipe(
+    recipe_id: int,
+    factor: float = Query(..., gt=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Scale recipe ingredients by factor"""
+    scaled = await AsyncRecipeService.scale_recipe(db, recipe_id, factor)
+    if not scaled:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return scaled
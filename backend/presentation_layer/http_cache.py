@@ -0,0 +1,39 @@
+# Backend 3-Layer Architecture
+# Presentation Layer - ETag helpers for conditional GETs
+import hashlib
+from typing import List, Optional, Tuple
+from fastapi import Response
+
+
+def recipe_etag(recipe_id: int, version: int) -> str:
+    """Strong ETag of a single recipe"""
+    return f'"recipe-{recipe_id}-v{version}"'
+
+
+def list_etag(versions: List[Tuple[int, int]], has_more: bool = False, variant: str = "") -> str:
+    """Strong ETag of a page of recipes from its (id, version) pairs.
+
+    `variant` tells apart different representations of the same page (sparse fieldsets).
+    """
+    digest = hashlib.sha1(variant.encode("utf-8"))
+    for recipe_id, version in versions:
+        digest.update(f"{recipe_id}:{version};".encode("ascii"))
+    digest.update(b"+" if has_more else b".")
+    return f'"recipes-{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    return Response(status_code=304, headers={"ETag": etag})
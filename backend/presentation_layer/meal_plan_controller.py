@@ -0,0 +1,23 @@
+# Backend 3-Layer Architecture
+# Presentation Layer - Meal Plan Controller
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from backend.database import get_db
+from backend import schemas
+from backend.business_layer import MealPlanService
+
+router = APIRouter(prefix="/meal-plan", tags=["meal-plan"])
+
+
+@router.post("", response_model=schemas.MealPlan)
+def plan_meals(
+    request: schemas.MealPlanRequest,
+    db: Session = Depends(get_db)
+):
+    """Plan meals that use up the pantry, with the shopping list for the rest"""
+    try:
+        return MealPlanService.plan_meals(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -1,11 +1,12 @@
 # Backend 3-Layer Architecture
 # Presentation Layer - Pantry Controller
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from backend.database import get_db
-from backend import schemas
+from backend import config, schemas
 from backend.business_layer import PantryService
+from backend.presentation_layer.fast_json import fast_json_response, serialize_many, serialize_pantry
 
 router = APIRouter(prefix="/pantry", tags=["pantry"])
 
@@ -13,7 +14,20 @@ router = APIRouter(prefix="/pantry", tags=["pantry"])
 @router.get("", response_model=List[schemas.Pantry])
 def get_pantry_items(db: Session = Depends(get_db)):
     """Get all pantry items"""
-    return PantryService.get_all_pantry_items(db)
+    items = PantryService.get_all_pantry_items(db)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_pantry, items))
+    return items
+
+
+@router.get("/suggest", response_model=List[str])
+def suggest_ingredient_names(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Type-ahead ingredient names for the pantry form"""
+    return PantryService.suggest_ingredient_names(db, prefix, limit)
 
 
 @router.get("/{pantry_id}", response_model=schemas.Pantry)
@@ -22,6 +36,8 @@ def get_pantry_item(pantry_id: int, db: Session = Depends(get_db)):
     pantry = PantryService.get_pantry_item(db, pantry_id)
     if not pantry:
         raise HTTPException(status_code=404, detail="Pantry item not found")
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_pantry(pantry))
     return pantry
 
 
@@ -31,6 +47,12 @@ def create_pantry_item(pantry: schemas.PantryCreate, db: Session = Depends(get_d
     return PantryService.create_pantry_item(db, pantry)
 
 
+@router.post("/bulk", response_model=List[schemas.Pantry])
+def add_pantry_items(items: List[schemas.PantryCreate], db: Session = Depends(get_db)):
+    """Add many pantry items at once; names already stocked have the quantities added"""
+    return PantryService.add_pantry_items(db, items)
+
+
 @router.put("/{pantry_id}", response_model=schemas.Pantry)
 def update_pantry_item(
     pantry_id: int, 
@@ -1,40 +1,300 @@
 # Backend 3-Layer Architecture
 # Presentation Layer - Recipe Controller
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List
-from backend.database import get_db
-from backend import schemas
-from backend.business_layer import RecipeService
+from typing import Any, Iterator, List, Literal, Optional, Tuple
+from backend.database import SessionLocal, get_db
+from backend import config, schemas
+from backend.business_layer import PantryService, RecipeService
+from backend.presentation_layer.http_cache import etag_matches, list_etag, not_modified, recipe_etag
+from backend.presentation_layer.fast_json import (
+    fast_json_response, ndjson_lines, serialize_many, serialize_recipe
+)
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
 
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query value as a list (None when absent)"""
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _list_filters(
+    cuisine: Optional[str] = Query(None, description="Only recipes of this cuisine"),
+    min_total_time: Optional[int] = Query(None, description="Minimum prep + cook minutes"),
+    max_total_time: Optional[int] = Query(None, description="Maximum prep + cook minutes"),
+    min_ingredients: Optional[int] = Query(None, description="Minimum number of ingredients"),
+    max_ingredients: Optional[int] = Query(None, description="Maximum number of ingredients")
+) -> schemas.RecipeFilters:
+    """List filter query parameters as RecipeFilters (400 when out of range)"""
+    try:
+        return schemas.RecipeFilters(
+            cuisine=cuisine,
+            min_total_time=min_total_time,
+            max_total_time=max_total_time,
+            min_ingredients=min_ingredients,
+            max_ingredients=max_ingredients
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail="; ".join(error["msg"] for error in e.errors()))
+
+
+def _sparse_page(
+    response: Response,
+    fields: Optional[List[str]],
+    include: Optional[List[str]],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    filters: schemas.RecipeFilters,
+    sort: Optional[str],
+    if_none_match: Optional[str],
+    db: Session
+):
+    """Sparse-fieldset page with the same pagination, ETag and 304 handling as the full list"""
+    selected = ",".join(sorted(fields)) if fields is not None else "*"
+    variant = f"fields={selected};include={','.join(sorted(include or []))}"
+    try:
+        if if_none_match:
+            versions, has_more = RecipeService.get_recipes_versions(db, skip, limit, cursor, filters, sort)
+            etag = list_etag(versions, has_more, variant)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        page, next_cursor, versions = RecipeService.get_recipe_fields(
+            db, fields, include, skip, limit, cursor, filters, sort
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = list_etag(versions, next_cursor is not None, variant)
+    # Sparse rows are already plain dicts; response_model validation would reject them
+    return fast_json_response(page, response)
+
+
 @router.get("", response_model=List[schemas.Recipe])
 def get_recipes(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination: pass an empty value for the first page, "
+                    "then the X-Next-Cursor header of the previous response"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated recipe fields to return, e.g. id,name,cuisine"
+    ),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated child lists to embed: ingredients, steps"
+    ),
+    filters: schemas.RecipeFilters = Depends(_list_filters),
+    sort: Optional[schemas.RecipeSort] = Query(
+        None,
+        description="name, time (quickest first) or newest; default ID order, or name with a cursor"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get all recipes with offset pagination, or keyset pagination when `cursor` is given.
+
+    Filters and sort orders are served by composite indexes on the stored listing columns.
+    The page carries an ETag; a matching If-None-Match gets 304 after a version-only query.
+    With `fields` and/or `include` only those columns and child tables are read.
+    """
+    if fields is not None or include is not None:
+        return _sparse_page(
+            response, _split(fields), _split(include), skip, limit, cursor, filters, sort, if_none_match, db
+        )
+
+    try:
+        if if_none_match:
+            versions, has_more = RecipeService.get_recipes_versions(db, skip, limit, cursor, filters, sort)
+            etag = list_etag(versions, has_more)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if cursor is None:
+            recipes, next_cursor = RecipeService.get_all_recipes(db, skip, limit, filters, sort), None
+        else:
+            recipes, next_cursor = RecipeService.get_recipes_page(db, cursor, limit, filters, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = list_etag(
+        [(recipe.id, recipe.version) for recipe in recipes], next_cursor is not None
+    )
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_recipe, recipes), response)
+    return recipes
+
+
+@router.get("/summary", response_model=List[schemas.RecipeSummary])
+def get_recipe_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Keyset pagination, as for the recipe list"),
+    filters: schemas.RecipeFilters = Depends(_list_filters),
+    sort: Optional[schemas.RecipeSort] = Query(None, description="As for the recipe list"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Lightweight recipe cards: id, name, cuisine, servings and times, no children"""
+    return _sparse_page(
+        response, list(schemas.RecipeSummary.model_fields), None,
+        skip, limit, cursor, filters, sort, if_none_match, db
+    )
+
+
+@router.get("/facets", response_model=schemas.RecipeFacets)
+def get_recipe_facets(db: Session = Depends(get_db)):
+    """Recipe counts per cuisine, total-time bucket and ingredient-count bucket, for filter menus"""
+    return RecipeService.get_facets(db)
+
+
+def _export_lines(chunk_size: int) -> Iterator[bytes]:
+    # The stream outlives the request (and its get_db session), so it owns a session
+    db = SessionLocal()
+    try:
+        for chunk in RecipeService.export_recipes(db, chunk_size):
+            yield ndjson_lines(serialize_recipe, chunk)
+    finally:
+        db.close()
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_recipes(chunk_size: int = Query(500, ge=1, le=5000)):
+    """Stream the whole catalog as NDJSON, one recipe per line, ordered by ID"""
+    return StreamingResponse(_export_lines(chunk_size), media_type="application/x-ndjson")
+
+
+def _batch_response(recipe_ids: List[int], db: Session):
+    try:
+        recipes, missing = RecipeService.get_recipes_batch(db, recipe_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response({
+            "recipes": serialize_many(serialize_recipe, recipes),
+            "missing": missing
+        })
+    return schemas.RecipeBatch(recipes=recipes, missing=missing)
+
+
+@router.get("/batch", response_model=schemas.RecipeBatch)
+def get_recipes_batch(
+    ids: str = Query(..., description="Comma-separated recipe IDs, e.g. 1,2,3"),
     db: Session = Depends(get_db)
 ):
-    """Get all recipes with pagination"""
-    return RecipeService.get_all_recipes(db, skip, limit)
+    """Get many recipes in one request; IDs that do not exist are listed in `missing`"""
+    try:
+        recipe_ids = [int(part) for part in _split(ids)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    return _batch_response(recipe_ids, db)
+
+
+@router.post("/batch", response_model=schemas.RecipeBatch)
+def post_recipes_batch(
+    recipe_ids: List[int],
+    db: Session = Depends(get_db)
+):
+    """Batch get for ID lists too long for a query string (body: array of recipe IDs)"""
+    return _batch_response(recipe_ids, db)
+
+
+@router.post("/scale", response_model=schemas.ScaleBatch)
+def scale_recipes(
+    requests: List[schemas.ScaleRequest],
+    db: Session = Depends(get_db)
+):
+    """Scale many recipes at once (body: array of {"recipe_id", "factor"})"""
+    try:
+        results, missing = RecipeService.scale_recipes(
+            db, [(request.recipe_id, request.factor) for request in requests]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.ScaleBatch(results=results, missing=missing)
 
 
 @router.get("/search", response_model=List[schemas.Recipe])
 def search_recipes(
     q: str = Query(..., min_length=1), 
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    """Search recipes by name"""
-    return RecipeService.search_recipes(db, q)
+    """Full-text search (accent-insensitive) over name, description, cuisine and steps"""
+    recipes = RecipeService.search_recipes(db, q, skip, limit)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_many(serialize_recipe, recipes))
+    return recipes
+
+
+@router.get("/suggest", response_model=List[schemas.RecipeSuggestion])
+def suggest_recipes(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Type-ahead recipe names (id + name only) matching a word prefix"""
+    return RecipeService.suggest_recipes(db, prefix, limit)
+
+
+@router.get("/by-ingredients", response_model=List[schemas.RecipeMatch])
+def find_recipes_by_ingredients(
+    ingredients: List[str] = Query(..., min_length=1, description="Repeat for each ingredient"),
+    match: Literal["all", "any"] = "all",
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Recipes using all (or any) of the given ingredients"""
+    return RecipeService.find_recipes_by_ingredients(db, ingredients, match == "all", limit)
+
+
+@router.get("/cookable", response_model=List[schemas.RecipeMatch])
+def get_cookable_recipes(
+    min_coverage: float = Query(0.0, ge=0, le=1),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Recipes ranked by the fraction of their ingredients covered by the pantry"""
+    return RecipeService.rank_by_pantry_coverage(db, min_coverage, limit)
 
 
 @router.get("/{recipe_id}", response_model=schemas.Recipe)
-def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
-    """Get recipe by ID"""
+def get_recipe(
+    recipe_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get recipe by ID; a matching If-None-Match gets 304 after a version-only query"""
+    if if_none_match:
+        version = RecipeService.get_recipe_version(db, recipe_id)
+        if version is not None and etag_matches(if_none_match, recipe_etag(recipe_id, version)):
+            return not_modified(recipe_etag(recipe_id, version))
+
     recipe = RecipeService.get_recipe(db, recipe_id)
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
+    response.headers["ETag"] = recipe_etag(recipe.id, recipe.version)
+    if config.FAST_JSON_RESPONSES:
+        return fast_json_response(serialize_recipe(recipe), response)
     return recipe
 
 
@@ -44,6 +304,48 @@ def create_recipe(recipe: schemas.RecipeCreate, db: Session = Depends(get_db)):
     return RecipeService.create_recipe(db, recipe)
 
 
+def _parse_import_body(body: bytes, content_type: str) -> Tuple[List[Tuple[int, Any]], List[Tuple[int, str]]]:
+    """(index, record) pairs from a JSON array or NDJSON body, plus unparseable NDJSON lines"""
+    if content_type.split(";")[0].strip() in ("application/x-ndjson", "application/jsonl"):
+        records, errors = [], []
+        lines = [line for line in body.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                records.append((index, json.loads(line)))
+            except ValueError as e:
+                errors.append((index, f"Invalid JSON: {e}"))
+        return records, errors
+
+    try:
+        items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of recipes")
+    return list(enumerate(items)), []
+
+
+@router.post("/import", response_model=schemas.RecipeImportResult)
+async def import_recipes(request: Request, db: Session = Depends(get_db)):
+    """Bulk-create recipes from a JSON array, or NDJSON with Content-Type application/x-ndjson.
+
+    Items that fail validation or insertion are listed in `errors` by position;
+    the rest are still imported.
+    """
+    records, parse_errors = _parse_import_body(
+        await request.body(), request.headers.get("content-type", "")
+    )
+    recipe_ids, errors = await run_in_threadpool(RecipeService.import_recipes, db, records)
+    return schemas.RecipeImportResult(
+        imported=len(recipe_ids),
+        ids=recipe_ids,
+        errors=[
+            schemas.RecipeImportError(index=index, error=error)
+            for index, error in sorted(parse_errors + errors)
+        ]
+    )
+
+
 @router.put("/{recipe_id}", response_model=schemas.Recipe)
 def update_recipe(
     recipe_id: int, 
@@ -65,6 +367,80 @@ def delete_recipe(recipe_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Recipe not found")
 
 
+@router.post("/{recipe_id}/ingredients", response_model=schemas.Recipe, status_code=201)
+def add_ingredient(
+    recipe_id: int,
+    ingredient: schemas.IngredientCreate,
+    db: Session = Depends(get_db)
+):
+    """Add one ingredient; returns the updated recipe"""
+    updated = RecipeService.add_ingredient(db, recipe_id, ingredient)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return updated
+
+
+@router.patch("/{recipe_id}/ingredients/{ingredient_id}", response_model=schemas.Recipe)
+def update_ingredient(
+    recipe_id: int,
+    ingredient_id: int,
+    ingredient: schemas.IngredientUpdate,
+    db: Session = Depends(get_db)
+):
+    """Edit one ingredient (only the fields sent); returns the updated recipe"""
+    updated = RecipeService.update_ingredient(db, recipe_id, ingredient_id, ingredient)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe or ingredient not found")
+    return updated
+
+
+@router.delete("/{recipe_id}/ingredients/{ingredient_id}", response_model=schemas.Recipe)
+def remove_ingredient(recipe_id: int, ingredient_id: int, db: Session = Depends(get_db)):
+    """Remove one ingredient; returns the updated recipe"""
+    updated = RecipeService.remove_ingredient(db, recipe_id, ingredient_id)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe or ingredient not found")
+    return updated
+
+
+@router.post("/{recipe_id}/steps", response_model=schemas.Recipe, status_code=201)
+def add_step(recipe_id: int, step: schemas.StepCreate, db: Session = Depends(get_db)):
+    """Add one step; returns the updated recipe"""
+    try:
+        updated = RecipeService.add_step(db, recipe_id, step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return updated
+
+
+@router.patch("/{recipe_id}/steps/{step_id}", response_model=schemas.Recipe)
+def update_step(
+    recipe_id: int,
+    step_id: int,
+    step: schemas.StepUpdate,
+    db: Session = Depends(get_db)
+):
+    """Edit one step (only the fields sent); returns the updated recipe"""
+    try:
+        updated = RecipeService.update_step(db, recipe_id, step_id, step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe or step not found")
+    return updated
+
+
+@router.delete("/{recipe_id}/steps/{step_id}", response_model=schemas.Recipe)
+def remove_step(recipe_id: int, step_id: int, db: Session = Depends(get_db)):
+    """Remove one step; returns the updated recipe"""
+    updated = RecipeService.remove_step(db, recipe_id, step_id)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Recipe or step not found")
+    return updated
+
+
 @router.get("/{recipe_id}/scale")
 def scale_recipe(
     recipe_id: int, 
@@ -76,3 +452,16 @@ def scale_recipe(
     if not scaled:
         raise HTTPException(status_code=404, detail="Recipe not found")
     return scaled
+
+
+@router.post("/{recipe_id}/cook", response_model=schemas.CookResult)
+def cook_recipe(
+    recipe_id: int,
+    servings: Optional[float] = Query(None, gt=0),
+    db: Session = Depends(get_db)
+):
+    """Subtract the recipe's ingredients from the pantry; returns what was used and what was missing"""
+    cooked = PantryService.cook_recipe(db, recipe_id, servings)
+    if not cooked:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return cooked
@@ -2,7 +2,7 @@
 # Presentation Layer - Shopping List Controller
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from backend.database import get_db
 from backend import schemas
 from backend.business_layer import ShoppingListService
@@ -12,8 +12,11 @@ router = APIRouter(prefix="/shopping-list", tags=["shopping-list"])
 
 @router.post("", response_model=List[schemas.ShoppingItem])
 def generate_shopping_list(
-    recipe_ids: List[int], 
+    recipes: List[Union[int, schemas.ShoppingListEntry]],
     db: Session = Depends(get_db)
 ):
-    """Generate shopping list from selected recipes, subtract pantry items"""
-    return ShoppingListService.generate_shopping_list(db, recipe_ids)
+    """Generate shopping list from selected recipes, subtract pantry items.
+
+    Items are recipe IDs (base servings) or {"recipe_id", "servings" | "multiplier"}.
+    """
+    return ShoppingListService.generate_shopping_list(db, recipes)
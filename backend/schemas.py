@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 
 
 class IngredientBase(BaseModel):
@@ -12,6 +12,12 @@ class IngredientCreate(IngredientBase):
     pass
 
 
+class IngredientUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    quantity: Optional[float] = Field(None, gt=0)
+    unit: Optional[str] = Field(None, min_length=1, max_length=50)
+
+
 class Ingredient(IngredientBase):
     id: int
     recipe_id: int
@@ -29,6 +35,11 @@ class StepCreate(StepBase):
     pass
 
 
+class StepUpdate(BaseModel):
+    step_number: Optional[int] = Field(None, gt=0)
+    instruction: Optional[str] = Field(None, min_length=1)
+
+
 class Step(StepBase):
     id: int
     recipe_id: int
@@ -64,6 +75,7 @@ class RecipeUpdate(BaseModel):
 
 class Recipe(RecipeBase):
     id: int
+    version: int = 1
     ingredients: List[Ingredient] = []
     steps: List[Step] = []
 
@@ -71,6 +83,87 @@ class Recipe(RecipeBase):
         from_attributes = True
 
 
+class RecipeSummary(BaseModel):
+    name: str
+    cuisine: Optional[str] = None
+    servings: int = 1
+    prep_time_minutes: Optional[int] = None
+    cook_time_minutes: Optional[int] = None
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class RecipeFilters(BaseModel):
+    """Recipe list filters; total time is prep + cook, a missing part counting as 0"""
+    cuisine: Optional[str] = Field(None, max_length=100)
+    min_total_time: Optional[int] = Field(None, ge=0)
+    max_total_time: Optional[int] = Field(None, ge=0)
+    min_ingredients: Optional[int] = Field(None, ge=0)
+    max_ingredients: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def _ordered_ranges(self):
+        for low, high in (("min_total_time", "max_total_time"), ("min_ingredients", "max_ingredients")):
+            if None not in (getattr(self, low), getattr(self, high)) and getattr(self, low) > getattr(self, high):
+                raise ValueError(f"{low} must not exceed {high}")
+        return self
+
+
+# Recipe list sort orders: name A-Z, quickest first, newest first
+RecipeSort = Literal["name", "time", "newest"]
+
+
+class CuisineCount(BaseModel):
+    cuisine: str
+    count: int
+
+
+class FacetBucket(BaseModel):
+    """A range of a list filter (max None: open-ended) and how many recipes fall in it"""
+    label: str
+    min: int
+    max: Optional[int] = None
+    count: int
+
+
+class RecipeFacets(BaseModel):
+    cuisines: List[CuisineCount] = []
+    total_time: List[FacetBucket] = []
+    ingredient_count: List[FacetBucket] = []
+
+
+class RecipeBatch(BaseModel):
+    recipes: List[Recipe] = []
+    missing: List[int] = []
+
+
+class RecipeImportError(BaseModel):
+    index: int
+    error: str
+
+
+class RecipeImportResult(BaseModel):
+    imported: int
+    ids: List[int] = []
+    errors: List[RecipeImportError] = []
+
+
+class RecipeSuggestion(BaseModel):
+    id: int
+    name: str
+
+
+class RecipeMatch(BaseModel):
+    id: int
+    name: str
+    matched_ingredients: int
+    total_ingredients: int
+    coverage: float
+    missing_ingredients: List[str] = []
+
+
 class PantryBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
     quantity: float = Field(..., gt=0)
@@ -93,7 +186,62 @@ class Pantry(PantryBase):
         from_attributes = True
 
 
+class ShoppingListEntry(BaseModel):
+    """A recipe to shop for, at target servings or scaled by a multiplier (default: as written)"""
+    recipe_id: int
+    servings: Optional[float] = Field(None, gt=0)
+    multiplier: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def _one_scale(self):
+        if self.servings is not None and self.multiplier is not None:
+            raise ValueError("give servings or multiplier, not both")
+        return self
+
+
 class ShoppingItem(BaseModel):
     name: str
     quantity: float
     unit: str
+
+
+class ScaleRequest(BaseModel):
+    recipe_id: int
+    factor: float = Field(..., gt=0)
+
+
+class ScaledIngredient(BaseModel):
+    name: str
+    quantity: float
+    unit: str
+
+
+class ScaledRecipe(BaseModel):
+    recipe_id: int
+    original_servings: int
+    scaled_servings: int
+    scale_factor: float
+    ingredients: List[ScaledIngredient]
+
+
+class ScaleBatch(BaseModel):
+    results: List[ScaledRecipe]
+    missing: List[int]
+
+
+class CookResult(BaseModel):
+    recipe_id: int
+    servings: float
+    used: List[ShoppingItem]
+    shortfall: List[ShoppingItem]
+
+
+class MealPlanRequest(BaseModel):
+    days: int = Field(7, gt=0, le=31)
+    servings: Optional[int] = Field(None, gt=0)
+    time_budget_ms: Optional[int] = Field(None, gt=0, le=5000)
+
+
+class MealPlan(BaseModel):
+    recipes: List[RecipeSummary]
+    shopping_list: List[ShoppingItem]
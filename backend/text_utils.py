@@ -0,0 +1,56 @@
+# Text normalization shared by search, suggestions and ingredient matching
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+# Letters that do not decompose into base letter + combining mark under NFKD
+_NON_DECOMPOSING = str.maketrans({"đ": "d", "Đ": "D", "ø": "o", "Ø": "O", "ł": "l", "Ł": "L"})
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold_text(text: str) -> str:
+    """Lowercase, strip diacritics and collapse punctuation to single spaces.
+
+    "Phở Bò" and "pho bo" both fold to "pho bo".
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_NON_DECOMPOSING))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_WORD_RE.findall(stripped.lower()))
+
+
+def singular(word: str) -> str:
+    """Naive English singular of a folded word: onions -> onion, tomatoes -> tomato, berries -> berry"""
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def ingredient_key(name: str) -> str:
+    """Catalog key of an ingredient name: folded, last word singular ("Red Onions" -> "red onion")"""
+    words = fold_text(name).split()
+    if words:
+        words[-1] = singular(words[-1])
+    return " ".join(words)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into folded search terms"""
+    return fold_text(text).split()
+
+
+def build_search_document(
+    name: str,
+    description: Optional[str],
+    cuisine: Optional[str],
+    instructions: Iterable[str]
+) -> Tuple[str, str]:
+    """Return the folded (search_name, search_text) pair stored on a recipe"""
+    body = [description or "", cuisine or ""]
+    body.extend(instructions)
+    return fold_text(name), fold_text(" ".join(body))
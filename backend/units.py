@@ -0,0 +1,86 @@
+# Unit registry: every known unit belongs to a dimension (mass, volume, count) and
+# converts to that dimension's canonical unit by a constant factor. Quantities are
+# stored canonicalized next to the unit the user typed, so aggregation is a plain
+# SUM per (name, canonical_unit) and 500 g + 1 kg of beef become 1.5 kg.
+from typing import Dict, Optional, Tuple
+
+MASS, VOLUME, COUNT = "mass", "volume", "count"
+
+CANONICAL_UNITS: Dict[str, str] = {MASS: "g", VOLUME: "ml", COUNT: "piece"}
+
+# unit (normalized) -> (dimension, factor to the canonical unit)
+UNITS: Dict[str, Tuple[str, float]] = {}
+
+
+def _register(dimension: str, factor: float, *names: str):
+    for name in names:
+        UNITS[name] = (dimension, factor)
+
+
+_register(MASS, 1.0, "g", "gr", "gram", "grams", "gramme", "grammes")
+_register(MASS, 1000.0, "kg", "kilo", "kilos", "kilogram", "kilograms")
+_register(MASS, 0.001, "mg", "milligram", "milligrams")
+_register(MASS, 28.349523125, "oz", "ounce", "ounces")
+_register(MASS, 453.59237, "lb", "lbs", "pound", "pounds")
+_register(VOLUME, 1.0, "ml", "milliliter", "milliliters", "millilitre", "millilitres")
+_register(VOLUME, 10.0, "cl", "centiliter", "centiliters", "centilitre", "centilitres")
+_register(VOLUME, 100.0, "dl", "deciliter", "deciliters", "decilitre", "decilitres")
+_register(VOLUME, 1000.0, "l", "liter", "liters", "litre", "litres")
+_register(VOLUME, 4.92892159375, "tsp", "teaspoon", "teaspoons")
+_register(VOLUME, 14.78676478125, "tbsp", "tablespoon", "tablespoons")
+_register(VOLUME, 29.5735295625, "fl oz", "fluid ounce", "fluid ounces")
+_register(VOLUME, 236.5882365, "cup", "cups")
+_register(VOLUME, 473.176473, "pint", "pints")
+_register(VOLUME, 946.352946, "quart", "quarts")
+_register(VOLUME, 3785.411784, "gallon", "gallons")
+_register(COUNT, 1.0, "piece", "pieces", "pc", "pcs", "unit", "units", "each", "whole")
+_register(COUNT, 12.0, "dozen")
+
+# Largest-first display units per dimension; a total is shown in the first one it reaches
+DISPLAY_UNITS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    MASS: (("kg", 1000.0), ("g", 1.0)),
+    VOLUME: (("l", 1000.0), ("ml", 1.0)),
+    COUNT: (("piece", 1.0),),
+}
+
+_DIMENSION_OF_CANONICAL = {unit: dimension for dimension, unit in CANONICAL_UNITS.items()}
+
+
+def normalize_unit(unit: str) -> str:
+    """Lowercase, drop dots and collapse whitespace: "Tbsp." -> "tbsp" """
+    return " ".join((unit or "").lower().replace(".", " ").split())
+
+
+def lookup(unit: str) -> Optional[Tuple[str, float]]:
+    """(dimension, factor to canonical) of a known unit, else None"""
+    return UNITS.get(normalize_unit(unit))
+
+
+def to_canonical(quantity: float, unit: str) -> Tuple[float, str]:
+    """Quantity in its dimension's canonical unit.
+
+    Unknown units ("stalks", "bunch") are their own dimension: the quantity is kept
+    and the normalized unit name serves as the canonical unit.
+    """
+    known = lookup(unit)
+    if known is None:
+        return quantity, normalize_unit(unit)
+    dimension, factor = known
+    return quantity * factor, CANONICAL_UNITS[dimension]
+
+
+def from_canonical(canonical_quantity: float, unit: str) -> float:
+    """Inverse of to_canonical: the canonical quantity expressed in `unit`"""
+    known = lookup(unit)
+    return canonical_quantity / known[1] if known else canonical_quantity
+
+
+def for_display(quantity: float, canonical_unit: str) -> Tuple[float, str]:
+    """Express a canonical quantity in the largest display unit it fills (1500 g -> 1.5 kg)"""
+    dimension = _DIMENSION_OF_CANONICAL.get(canonical_unit)
+    if dimension is None:
+        return quantity, canonical_unit
+    for unit, factor in DISPLAY_UNITS[dimension]:
+        if quantity >= factor:
+            return quantity / factor, unit
+    return quantity, canonical_unit
@@ -0,0 +1,63 @@
+# Micro-benchmark: response_model serialization vs the fast JSON path
+# Usage: python bench_serialization.py [recipes] [repeats]
+import os
+import sys
+import tempfile
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+# No queries are run; any engine URL whose driver is installed will do
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_serialization.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+from backend import schemas  # noqa: E402
+from backend.models import Recipe, Ingredient, Step  # noqa: E402
+from backend.presentation_layer.fast_json import FastJSONResponse, serialize_many, serialize_recipe  # noqa: E402
+
+
+def build_recipes(count: int) -> List[Recipe]:
+    """Transient ORM recipes shaped like the seeded catalog (8 ingredients, 6 steps)"""
+    recipes = []
+    for recipe_id in range(1, count + 1):
+        recipe = Recipe(
+            id=recipe_id, name=f"Phở Bò {recipe_id}", description="Vietnamese beef noodle soup",
+            cuisine="Vietnamese", servings=4, prep_time_minutes=30, cook_time_minutes=180, version=1
+        )
+        recipe.ingredients = [
+            Ingredient(id=recipe_id * 10 + i, recipe_id=recipe_id, name=f"Ingredient {i}",
+                       quantity=100.0 + i, unit="g")
+            for i in range(8)
+        ]
+        recipe.steps = [
+            Step(id=recipe_id * 10 + i, recipe_id=recipe_id, step_number=i + 1,
+                 instruction="Simmer the bones with charred onion and ginger for three hours")
+            for i in range(6)
+        ]
+        recipes.append(recipe)
+    return recipes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    recipes = build_recipes(count)
+    adapter = TypeAdapter(List[schemas.Recipe])
+
+    def response_model_path() -> bytes:
+        # What FastAPI does for response_model=List[schemas.Recipe]
+        return adapter.dump_json(adapter.validate_python(recipes, from_attributes=True), by_alias=True)
+
+    def fast_path() -> bytes:
+        return FastJSONResponse(serialize_many(serialize_recipe, recipes)).body
+
+    assert response_model_path() == fast_path(), "fast path output differs"
+    slow = min(timeit.repeat(response_model_path, number=repeats, repeat=3)) / repeats
+    fast = min(timeit.repeat(fast_path, number=repeats, repeat=3)) / repeats
+    print(f"{count} recipes, {len(fast_path())} bytes")
+    print(f"response_model: {slow * 1000:8.3f} ms")
+    print(f"fast json:      {fast * 1000:8.3f} ms  ({slow / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
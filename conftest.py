@@ -0,0 +1,65 @@
+# Shared pytest fixtures for the Recipe Book test suite
+import os
+import sys
+import tempfile
+
+# Tests never touch the application database: point backend.database at
+# TEST_DATABASE_URL (e.g. a disposable PostgreSQL) or a throwaway SQLite file
+# before any backend module is imported.
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+_default_test_db = os.path.join(tempfile.mkdtemp(prefix="recipe_book_tests_"), "test.db")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_default_test_db}")
+# Caches are switched off so tests observe the database; cache tests enable them explicitly
+os.environ["RECIPE_CACHE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Yield a session bound to a freshly created schema, dropped afterwards"""
+    from backend.database import Base, SessionLocal, engine
+    from backend import models  # noqa: F401  (register tables)
+    from backend.business_layer.search_index import recipe_search_index
+    from backend.business_layer.suggest_index import recipe_suggestions, ingredient_suggestions
+    from backend.business_layer.ingredient_index import recipe_ingredient_index
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        recipe_search_index.reset()
+        recipe_suggestions.reset()
+        ingredient_suggestions.reset()
+        recipe_ingredient_index.reset()
+
+
+@pytest.fixture
+def query_counter(db):
+    """Count SQL statements executed on the test engine"""
+    from sqlalchemy import event
+
+    class QueryCounter:
+        def __init__(self):
+            self.count = 0
+            self.statements = []
+
+        def reset(self):
+            self.count = 0
+            self.statements = []
+
+    counter = QueryCounter()
+    engine = db.get_bind()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter.count += 1
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
@@ -0,0 +1,892 @@
+# Recipe endpoint tests (run against the SQLite test database from conftest.py)
+import asyncio
+import json
+from typing import List
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from pydantic import TypeAdapter
+
+from backend import config, schemas
+from backend.business_layer import PantryService, RecipeService
+from backend.business_layer.recipe_cache import LRUCache, recipe_cache
+from backend.presentation_layer import pantry_controller, recipe_controller
+
+
+def make_recipe(db, name="Phở Bò", cuisine="Vietnamese", ingredients=None, steps=None, **fields):
+    """Create a recipe through the service layer"""
+    if ingredients is None:
+        ingredients = [("Beef", 300.0, "g"), ("Rice noodles", 200.0, "g")]
+    if steps is None:
+        steps = ["Simmer the broth", "Assemble the bowls"]
+    data = schemas.RecipeCreate(
+        name=name,
+        cuisine=cuisine,
+        ingredients=[
+            schemas.IngredientCreate(name=n, quantity=q, unit=u) for n, q, u in ingredients
+        ],
+        steps=[
+            schemas.StepCreate(step_number=i, instruction=text)
+            for i, text in enumerate(steps, start=1)
+        ],
+        **fields,
+    )
+    return RecipeService.create_recipe(db, data)
+
+
+def list_recipes(db, response=None, skip=0, limit=100, cursor=None, if_none_match=None,
+                 fields=None, include=None, filters=None, sort=None):
+    """Call the list endpoint with every parameter explicit, as FastAPI would"""
+    return recipe_controller.get_recipes(
+        response if response is not None else Response(),
+        skip=skip, limit=limit, cursor=cursor, fields=fields, include=include,
+        filters=filters or schemas.RecipeFilters(), sort=sort,
+        if_none_match=if_none_match, db=db
+    )
+
+
+def serialize(result):
+    """Serialize a controller result the way FastAPI's response_model does"""
+    if isinstance(result, list):
+        return [schemas.Recipe.model_validate(r) for r in result]
+    return schemas.Recipe.model_validate(result)
+
+
+def test_recipe_endpoints_use_constant_query_count(db, query_counter):
+    """List, search and detail cost a fixed number of queries, however many recipes"""
+    RecipeService.build_indexes(db)
+    created = 0
+    for n_recipes in (3, 30):
+        while created < n_recipes:
+            make_recipe(db, name=f"Soup {created}")
+            created += 1
+        db.expire_all()
+
+        query_counter.reset()
+        recipes = serialize(list_recipes(db))
+        assert len(recipes) == n_recipes
+        assert query_counter.count == 3
+
+        db.expire_all()
+        query_counter.reset()
+        found = serialize(recipe_controller.search_recipes(q="Soup", skip=0, limit=100, db=db))
+        assert len(found) == n_recipes
+        assert query_counter.count == 3
+
+        db.expire_all()
+        query_counter.reset()
+        recipe = serialize(recipe_controller.get_recipe(recipes[0].id, Response(), if_none_match=None, db=db))
+        assert len(recipe.ingredients) == 2 and len(recipe.steps) == 2
+        assert query_counter.count == 2
+
+
+def test_keyset_pagination_walks_catalog_without_gaps(db):
+    """Cursor pages are ordered by name, never repeat rows and survive inserts mid-scroll"""
+    for name in ["Bánh Mì", "Gỏi Cuốn", "Ramen", "Tacos", "Curry"]:
+        make_recipe(db, name=name)
+
+    response = Response()
+    page = list_recipes(db, response, limit=2, cursor="")
+    seen = [r.name for r in page]
+    assert seen == ["Bánh Mì", "Curry"]
+
+    # A recipe sorting before the cursor must not shift the following pages
+    make_recipe(db, name="Apple Pie")
+    while "X-Next-Cursor" in response.headers:
+        cursor = response.headers["X-Next-Cursor"]
+        response = Response()
+        seen += [r.name for r in list_recipes(db, response, limit=2, cursor=cursor)]
+
+    assert seen == ["Bánh Mì", "Curry", "Gỏi Cuốn", "Ramen", "Tacos"]
+
+
+def test_keyset_pagination_rejects_malformed_cursor(db):
+    """A cursor that was not issued by the API is a client error"""
+    with pytest.raises(HTTPException) as exc_info:
+        list_recipes(db, limit=2, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+def walk_pages(db, limit, **params):
+    """Names of every recipe the list endpoint returns, following X-Next-Cursor"""
+    response, cursor, names = Response(), "", []
+    while cursor is not None:
+        names += [r.name for r in list_recipes(db, response, limit=limit, cursor=cursor, **params)]
+        cursor, response = response.headers.get("X-Next-Cursor"), Response()
+    return names
+
+
+def seed_listing(db):
+    """Recipes with varied cuisines, total times and ingredient counts"""
+    beef, noodles, lime = ("Beef", 300.0, "g"), ("Rice noodles", 200.0, "g"), ("Lime", 1.0, "piece")
+    make_recipe(db, name="Phở Bò", prep_time_minutes=30, cook_time_minutes=180, ingredients=[beef, noodles, lime])
+    make_recipe(db, name="Gỏi Cuốn", prep_time_minutes=20, ingredients=[noodles, lime])
+    make_recipe(db, name="Tacos", cuisine="Mexican", prep_time_minutes=15, cook_time_minutes=10,
+                ingredients=[beef, lime])
+    make_recipe(db, name="Bánh Mì", prep_time_minutes=10, cook_time_minutes=5, ingredients=[beef])
+    RecipeService.import_recipes(db, [(0, {
+        "name": "Cà Ri Gà", "cuisine": "Vietnamese", "prep_time_minutes": 15, "cook_time_minutes": 45,
+        "ingredients": [{"name": "Chicken", "quantity": 1, "unit": "kg"}], "steps": []
+    })])
+
+
+def test_list_filters_and_sorts_page_through_matches(db):
+    """Filters combine, every sort order pages without gaps, and the stored columns follow writes"""
+    seed_listing(db)
+    vietnamese = schemas.RecipeFilters(cuisine="Vietnamese")
+
+    assert walk_pages(db, 2, filters=vietnamese) == ["Bánh Mì", "Cà Ri Gà", "Gỏi Cuốn", "Phở Bò"]
+    assert walk_pages(db, 2, filters=vietnamese, sort="time") == ["Bánh Mì", "Gỏi Cuốn", "Cà Ri Gà", "Phở Bò"]
+    assert walk_pages(db, 2, sort="newest") == ["Cà Ri Gà", "Bánh Mì", "Tacos", "Gỏi Cuốn", "Phở Bò"]
+    assert walk_pages(
+        db, 1, filters=schemas.RecipeFilters(min_total_time=20, max_total_time=60, min_ingredients=2), sort="time"
+    ) == ["Gỏi Cuốn", "Tacos"]
+    assert [r.name for r in list_recipes(db, skip=1, limit=2, sort="time")] == ["Gỏi Cuốn", "Tacos"]
+    assert [row["name"] for row in json.loads(list_recipes(
+        db, fields="name", filters=schemas.RecipeFilters(max_ingredients=1), sort="name"
+    ).body)] == ["Bánh Mì", "Cà Ri Gà"]
+
+    quick = schemas.RecipeFilters(max_total_time=15)
+    banh_mi = next(r for r in list_recipes(db) if r.name == "Bánh Mì")
+    assert walk_pages(db, 5, filters=quick) == ["Bánh Mì"]
+    RecipeService.update_recipe(db, banh_mi.id, schemas.RecipeUpdate(cook_time_minutes=20))
+    assert walk_pages(db, 5, filters=quick) == []
+    RecipeService.add_ingredient(db, banh_mi.id, schemas.IngredientCreate(name="Pâté", quantity=50, unit="g"))
+    assert "Bánh Mì" not in walk_pages(db, 5, filters=schemas.RecipeFilters(max_ingredients=1))
+
+    # A cursor is tied to the sort it was issued for
+    response = Response()
+    list_recipes(db, response, limit=1, cursor="", sort="time")
+    with pytest.raises(HTTPException) as exc_info:
+        list_recipes(db, limit=1, cursor=response.headers["X-Next-Cursor"], sort="name")
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException) as exc_info:
+        recipe_controller._list_filters(None, 30, 10, None, None)
+    assert exc_info.value.status_code == 400
+
+
+def test_list_query_shapes_use_indexes(db):
+    """Every filter/sort shape reads recipes through the index built for it, never a full table scan.
+
+    Each shape runs an offset page, a first cursor page and the next cursor page
+    (the default sort is ID order for offset pages and name order for cursors). On
+    SQLite (the default test database) EXPLAIN QUERY PLAN must name the expected
+    index for each of the three. The integer primary key is the expected access
+    path for ID-order seeks, and a plain "SCAN recipes" (WALK) only for unfiltered
+    pages in ID order: SQLite keeps the table in a b-tree keyed by that primary
+    key, so the walk stops at the LIMIT. With TEST_DATABASE_URL pointing at
+    PostgreSQL the plan must contain no Seq Scan (sequential scans are priced out
+    so the tiny test table behaves like a large one).
+    """
+    from sqlalchemy import event
+
+    seed_listing(db)
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM recipes" in statement:
+            captured.append((statement, parameters))
+
+    cuisine, times = dict(cuisine="Vietnamese"), dict(min_total_time=10, max_total_time=60)
+    filter_sets = {
+        "none": {}, "cuisine": cuisine, "times": times, "cuisine+times": dict(cuisine, **times),
+        "ingredients": dict(min_ingredients=2, max_ingredients=5),
+    }
+    WALK, PK = "SCAN recipes", "INTEGER PRIMARY KEY"
+    # SQLite appends the rowid (the id) to every index, so the plain name index is (name, id) too
+    name, time = {"ix_recipes_name_id", "ix_recipes_name"}, "ix_recipes_total_time_id"
+    by_cuisine, cuisine_name = "ix_recipes_cuisine_id", "ix_recipes_cuisine_name_id"
+    cuisine_time, ingredients = "ix_recipes_cuisine_total_time_id", "ix_recipes_ingredient_count_id"
+    # (filters, sort) -> access path of the offset page, first cursor page and next cursor page
+    expected = {
+        ("none", None): (WALK, name, name),
+        ("none", "name"): (name, name, name),
+        ("none", "time"): (time, time, time),
+        ("none", "newest"): (WALK, WALK, PK),
+        ("cuisine", None): (by_cuisine, cuisine_name, cuisine_name),
+        ("cuisine", "name"): (cuisine_name, cuisine_name, cuisine_name),
+        ("cuisine", "time"): (cuisine_time, cuisine_time, cuisine_time),
+        ("cuisine", "newest"): (by_cuisine, by_cuisine, by_cuisine),
+        ("times", None): (time, time, time),
+        ("times", "name"): (time, time, time),
+        ("times", "time"): (time, time, time),
+        ("times", "newest"): (time, time, PK),
+        ("cuisine+times", None): (cuisine_time, cuisine_time, cuisine_name),
+        ("cuisine+times", "name"): (cuisine_time, cuisine_time, cuisine_name),
+        ("cuisine+times", "time"): (cuisine_time, cuisine_time, cuisine_time),
+        ("cuisine+times", "newest"): (cuisine_time, cuisine_time, by_cuisine),
+        ("ingredients", None): (ingredients, ingredients, ingredients),
+        ("ingredients", "name"): (ingredients, ingredients, ingredients),
+        ("ingredients", "time"): (ingredients, ingredients, ingredients),
+        ("ingredients", "newest"): (ingredients, ingredients, PK),
+    }
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for label, sort in expected:
+            filters = schemas.RecipeFilters(**filter_sets[label])
+            list_recipes(db, limit=2, filters=filters, sort=sort)
+            response = Response()
+            list_recipes(db, response, limit=1, cursor="", filters=filters, sort=sort)
+            list_recipes(db, limit=1, cursor=response.headers["X-Next-Cursor"], filters=filters, sort=sort)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    access_paths = [path for paths in expected.values() for path in paths]
+    assert len(captured) == len(access_paths)
+
+    connection = db.connection()
+    if engine.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    for (statement, parameters), path in zip(captured, access_paths):
+        if engine.dialect.name == "postgresql":
+            plan = json.dumps(connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            ).scalar())
+            assert "Seq Scan" not in plan, (statement, plan)
+        else:
+            plan = [row[3] for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            ).fetchall()]
+            access = [line for line in plan if "recipes" in line]
+            if path == WALK:
+                assert "WHERE" not in statement and plan == [WALK], (statement, plan)
+            elif path == PK:
+                assert access and all(f"USING {PK}" in line for line in access), (statement, plan)
+            else:
+                accepted = {path} if isinstance(path, str) else path
+                assert access and all(
+                    accepted & set(line.split()) and "INDEX" in line.split() for line in access
+                ), (path, statement, plan)
+
+
+def recount_facets(db):
+    """Facet counts recomputed from scratch, as {(facet, value): count}"""
+    from collections import Counter
+    from backend.business_layer.facets import facet_keys
+    from backend.models import Recipe
+
+    counts = Counter()
+    for row in db.query(Recipe.cuisine, Recipe.total_time_minutes, Recipe.ingredient_count):
+        counts.update(facet_keys(*row))
+    return dict(counts)
+
+
+def served_facets(facets):
+    counts = {("cuisine", item.cuisine): item.count for item in facets.cuisines}
+    for facet in ("total_time", "ingredient_count"):
+        counts.update({(facet, bucket.label): bucket.count for bucket in getattr(facets, facet) if bucket.count})
+    return counts
+
+
+def test_facets_follow_every_write_and_read_in_one_query(db, query_counter):
+    """Facet counts are adjusted by creates, imports, edits and deletes, never recomputed"""
+    seed_listing(db)
+    facets = recipe_controller.get_recipe_facets(db=db)
+    assert [(item.cuisine, item.count) for item in facets.cuisines] == [("Vietnamese", 4), ("Mexican", 1)]
+    assert [(b.label, b.min, b.max, b.count) for b in facets.total_time] == [
+        ("0-15", 0, 15, 1), ("16-30", 16, 30, 2), ("31-60", 31, 60, 1), ("61+", 61, None, 1)
+    ]
+    assert served_facets(facets) == recount_facets(db)
+
+    tacos = next(r for r in list_recipes(db) if r.name == "Tacos")
+    RecipeService.update_recipe(db, tacos.id, schemas.RecipeUpdate(cuisine="Tex-Mex", cook_time_minutes=60))
+    RecipeService.add_ingredient(db, tacos.id, schemas.IngredientCreate(name="Salsa", quantity=100, unit="g"))
+    pho = next(r for r in list_recipes(db) if r.name == "Phở Bò")
+    RecipeService.delete_recipe(db, pho.id)
+    make_recipe(db, name="Ramen", cuisine="Japanese", ingredients=[("Noodles", 100.0, "g")] * 12)
+
+    query_counter.reset()
+    facets = recipe_controller.get_recipe_facets(db=db)
+    assert query_counter.count == 1
+    assert served_facets(facets) == recount_facets(db)
+    assert {item.cuisine for item in facets.cuisines} == {"Vietnamese", "Tex-Mex", "Japanese"}
+    assert [b.count for b in facets.ingredient_count] == [4, 0, 1]
+
+    # Edits that leave every bucket unchanged write nothing to the summary table
+    query_counter.reset()
+    RecipeService.update_recipe(db, tacos.id, schemas.RecipeUpdate(description="Crispy"))
+    assert not [sql for sql in query_counter.statements if "recipe_facets" in sql]
+
+
+def test_facets_route_is_reachable_in_async_mode(db, monkeypatch):
+    """With ASYNC_DATABASE on, /api/recipes/facets is not captured by the async /{recipe_id} route"""
+    import importlib
+    from fastapi.testclient import TestClient
+    import backend.main
+
+    seed_listing(db)
+    monkeypatch.setattr(config, "ASYNC_DATABASE", True)
+    try:
+        app = importlib.reload(backend.main).app
+        response = TestClient(app).get("/api/recipes/facets")
+    finally:
+        monkeypatch.undo()
+        importlib.reload(backend.main)
+
+    assert response.status_code == 200
+    assert response.json() == RecipeService.get_facets(db).model_dump()
+
+
+def test_search_is_accent_insensitive_and_ranked(db):
+    """Folded terms match diacritics; name matches outrank step/description matches"""
+    pho = make_recipe(db, name="Phở Bò", steps=["Char the onion and ginger"])
+    bun = make_recipe(db, name="Bún Bò Huế", description="Spicy beef noodle soup, like phở")
+    ramen = make_recipe(db, name="Ramen", cuisine="Japanese")
+
+    assert [r.id for r in RecipeService.search_recipes(db, "pho bo")] == [pho.id, bun.id]
+    assert [r.id for r in RecipeService.search_recipes(db, "BO")] == [pho.id, bun.id]
+    assert [r.id for r in RecipeService.search_recipes(db, "ginger")] == [pho.id]
+    assert [r.id for r in RecipeService.search_recipes(db, "japanese")] == [ramen.id]
+    assert RecipeService.search_recipes(db, "pho sushi") == []
+    assert [r.id for r in RecipeService.search_recipes(db, "bo", skip=1, limit=1)] == [bun.id]
+
+
+def test_search_index_follows_writes(db):
+    """Updates and deletes are reflected in search results immediately"""
+    recipe = make_recipe(db, name="Gỏi Cuốn")
+    assert [r.id for r in RecipeService.search_recipes(db, "goi cuon")] == [recipe.id]
+
+    RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(
+        name="Fresh Spring Rolls",
+        steps=[schemas.StepCreate(step_number=1, instruction="Roll with shrimp")],
+    ))
+    assert RecipeService.search_recipes(db, "goi cuon") == []
+    assert [r.id for r in RecipeService.search_recipes(db, "spring shrimp")] == [recipe.id]
+
+    RecipeService.delete_recipe(db, recipe.id)
+    assert RecipeService.search_recipes(db, "spring") == []
+
+
+def test_suggestions_match_word_prefixes_and_follow_writes(db):
+    """Type-ahead ignores accents, matches any word start and tracks creates/updates/deletes"""
+    pho = make_recipe(db, name="Phở Bò", ingredients=[("Beef brisket", 300.0, "g")])
+    bun = make_recipe(db, name="Bún Bò Huế", ingredients=[("Beef shank", 300.0, "g"), ("Lemongrass", 2.0, "stalks")])
+    RecipeService.build_indexes(db)
+
+    assert RecipeService.suggest_recipes(db, "bo") == [
+        schemas.RecipeSuggestion(id=pho.id, name="Phở Bò"),
+        schemas.RecipeSuggestion(id=bun.id, name="Bún Bò Huế"),
+    ]
+    assert [s.id for s in RecipeService.suggest_recipes(db, "PHO")] == [pho.id]
+    assert PantryService.suggest_ingredient_names(db, "bee") == ["Beef brisket", "Beef shank"]
+
+    RecipeService.update_recipe(db, pho.id, schemas.RecipeUpdate(name="Phở Gà", ingredients=[
+        schemas.IngredientCreate(name="Chicken", quantity=1.0, unit="kg"),
+    ]))
+    assert [s.name for s in RecipeService.suggest_recipes(db, "pho")] == ["Phở Gà"]
+    assert PantryService.suggest_ingredient_names(db, "bee") == ["Beef shank"]
+
+    RecipeService.delete_recipe(db, bun.id)
+    assert RecipeService.suggest_recipes(db, "bo") == []
+    assert PantryService.suggest_ingredient_names(db, "lemon") == []
+
+
+def test_find_recipes_by_ingredients(db):
+    """All/any ingredient queries ignore case and accents and rank by matches"""
+    com_tam = make_recipe(db, name="Cơm Tấm", ingredients=[
+        ("Pork chops", 400.0, "g"), ("Lemongrass", 2.0, "stalks"), ("Fish sauce", 3.0, "tbsp"),
+    ])
+    ga_xa = make_recipe(db, name="Gà Xào Sả Ớt", ingredients=[
+        ("Chicken thighs", 500.0, "g"), ("Lemongrass", 3.0, "stalks"), ("Chili", 2.0, "pieces"),
+    ])
+    make_recipe(db, name="Ramen", ingredients=[("Ramen noodles", 200.0, "g")])
+
+    both = RecipeService.find_recipes_by_ingredients(db, ["LEMONGRASS", "chili"])
+    assert [(m.id, m.matched_ingredients, m.total_ingredients) for m in both] == [(ga_xa.id, 2, 3)]
+
+    either = RecipeService.find_recipes_by_ingredients(db, ["lemongrass", "chili"], match_all=False)
+    assert [m.id for m in either] == [ga_xa.id, com_tam.id]
+    assert either[1].missing_ingredients == ["chili"]
+
+
+def test_rank_by_pantry_coverage(db):
+    """Recipes are ranked by the share of their ingredients found in the pantry"""
+    salad = make_recipe(db, name="Salad", ingredients=[("Lettuce", 1.0, "head"), ("Olive oil", 2.0, "tbsp")])
+    soup = make_recipe(db, name="Soup", ingredients=[
+        ("Onion", 1.0, "pieces"), ("Carrot", 2.0, "pieces"), ("Olive oil", 1.0, "tbsp"), ("Stock", 1.0, "l"),
+    ])
+    make_recipe(db, name="Toast", ingredients=[("Bread", 2.0, "slices")])
+    for name in ["Olive Oil", "lettuce", "Onion"]:
+        PantryService.create_pantry_item(db, schemas.PantryCreate(name=name, quantity=1.0, unit="pieces"))
+
+    ranked = RecipeService.rank_by_pantry_coverage(db)
+    assert [(m.id, m.coverage) for m in ranked] == [(salad.id, 1.0), (soup.id, 0.5)]
+    assert ranked[1].missing_ingredients == ["carrot", "stock"]
+    assert [m.id for m in RecipeService.rank_by_pantry_coverage(db, min_coverage=0.75)] == [salad.id]
+
+
+def test_lru_cache_evicts_expires_and_rejects_stale_loads():
+    """LRU order, TTL expiry and in-flight invalidation are all counted"""
+    now = [0.0]
+    cache = LRUCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    for key in ("a", "b"):
+        cache.set(key, key.upper(), cache.begin(key))
+    assert cache.get("a") == "A"
+    cache.set("c", "C", cache.begin("c"))  # evicts "b", the least recently used
+    assert cache.get("b") is None
+
+    token = cache.begin("a")
+    cache.invalidate("a")  # a write lands while "a" is being reloaded
+    cache.set("a", "stale", token)
+    assert cache.get("a") is None
+
+    now[0] = 11.0
+    assert cache.get("c") is None
+    assert cache.stats() == {
+        "enabled": True, "size": 0, "max_entries": 2, "ttl_seconds": 10,
+        "hits": 1, "misses": 3, "evictions": 1, "expirations": 1,
+    }
+
+
+def test_lru_cache_invalidation_record_stays_bounded():
+    """Writes to many keys do not grow the cache; loads older than a forgotten write are dropped"""
+    cache = LRUCache(max_entries=2, ttl_seconds=10)
+
+    token = cache.begin("a")
+    for key in range(1000):
+        cache.invalidate(key)
+    assert len(cache._invalidated) == 2
+    cache.set("a", "stale", token)  # "a" was never invalidated, but the record cannot prove it
+    assert cache.get("a") is None
+
+    cache.set("a", "A", cache.begin("a"))
+    assert cache.get("a") == "A"
+
+    token = cache.begin("b")
+    cache.clear()
+    cache.set("b", "stale", token)
+    assert cache.get("b") is None
+
+
+def test_get_recipe_reads_through_cache_and_invalidates_on_write(db, query_counter):
+    """Repeated reads skip the database until the recipe is updated or deleted"""
+    recipe_cache.configure(enabled=True)
+    try:
+        recipe = make_recipe(db, name="Phở Bò")
+        assert RecipeService.get_recipe(db, recipe.id).name == "Phở Bò"
+
+        query_counter.reset()
+        assert RecipeService.get_recipe(db, recipe.id).name == "Phở Bò"
+        assert query_counter.count == 0
+
+        RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(name="Phở Gà"))
+        assert RecipeService.get_recipe(db, recipe.id).name == "Phở Gà"
+
+        RecipeService.delete_recipe(db, recipe.id)
+        assert RecipeService.get_recipe(db, recipe.id) is None
+        assert recipe_cache.stats()["hits"] == 1
+    finally:
+        recipe_cache.configure(enabled=False)
+
+
+def test_conditional_get_returns_304_after_version_only_query(db, query_counter):
+    """Matching If-None-Match short-circuits with one query; any change bumps the ETag"""
+    recipe = make_recipe(db, name="Phở Bò")
+    response = Response()
+    recipe_controller.get_recipe(recipe.id, response, if_none_match=None, db=db)
+    etag = response.headers["ETag"]
+
+    query_counter.reset()
+    result = recipe_controller.get_recipe(recipe.id, Response(), if_none_match=etag, db=db)
+    assert result.status_code == 304 and result.headers["ETag"] == etag
+    assert query_counter.count == 1
+
+    RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(
+        ingredients=[schemas.IngredientCreate(name="Beef", quantity=500.0, unit="g")]
+    ))
+    response = Response()
+    result = recipe_controller.get_recipe(recipe.id, response, if_none_match=etag, db=db)
+    assert result.version == 2 and response.headers["ETag"] != etag
+
+
+def test_list_etag_matches_version_only_query(db, query_counter):
+    """The list ETag computed from loaded recipes equals the cheap version-only one"""
+    for name in ["Phở Bò", "Bún Chả", "Ramen"]:
+        make_recipe(db, name=name)
+    for params in ({"limit": 2}, {"limit": 2, "cursor": ""}):
+        response = Response()
+        list_recipes(db, response, **params)
+        etag = response.headers["ETag"]
+
+        query_counter.reset()
+        assert list_recipes(db, if_none_match=etag, **params).status_code == 304
+        assert query_counter.count == 1
+
+    response = Response()
+    first_page = list_recipes(db, response, limit=2)
+    RecipeService.update_recipe(db, first_page[0].id, schemas.RecipeUpdate(servings=4))
+    assert isinstance(list_recipes(db, limit=2, if_none_match=response.headers["ETag"]), list)
+
+
+def fastapi_json(response_model, value):
+    """Bytes FastAPI produces for `value` under `response_model`: validate, then dump"""
+    adapter = TypeAdapter(response_model)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True), by_alias=True)
+
+
+def test_fast_json_path_is_byte_identical(db, monkeypatch):
+    """Precompiled serializers produce exactly the bytes of the response_model path"""
+    recipe = make_recipe(db, name="Phở Bò", description=None, ingredients=[
+        ("Bánh phở", 2, "kg"), ("Star anise", 0.1, "pieces"), ("Beef", 1e16, "g"),
+    ])
+    make_recipe(db, name="Bún Bò Huế", description="Cay \"nồng\" 🌶", prep_time_minutes=0)
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Đường", quantity=3, unit="kg"))
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", True)
+
+    expected = fastapi_json(List[schemas.Recipe], RecipeService.get_all_recipes(db))
+    assert list_recipes(db).body == expected
+    expected = fastapi_json(List[schemas.Recipe], RecipeService.search_recipes(db, "bo"))
+    assert recipe_controller.search_recipes(q="bo", skip=0, limit=20, db=db).body == expected
+    expected = fastapi_json(schemas.Recipe, RecipeService.get_recipe(db, recipe.id))
+    assert recipe_controller.get_recipe(recipe.id, Response(), if_none_match=None, db=db).body == expected
+
+    expected = fastapi_json(List[schemas.Pantry], PantryService.get_all_pantry_items(db))
+    assert pantry_controller.get_pantry_items(db=db).body == expected
+    expected = fastapi_json(schemas.Pantry, PantryService.get_pantry_item(db, 1))
+    assert pantry_controller.get_pantry_item(1, db=db).body == expected
+
+
+def test_sparse_fieldsets_select_only_requested_columns(db, query_counter):
+    """fields= reads only recipe columns; include= adds one batched query per child table"""
+    for name in ["Phở Bò", "Bún Chả", "Ramen"]:
+        make_recipe(db, name=name, prep_time_minutes=15)
+    query_counter.reset()
+    response = Response()
+    result = list_recipes(db, response, fields="name,id", cursor="", limit=2)
+    assert query_counter.count == 1
+    assert "ingredients" not in query_counter.statements[0]
+    assert json.loads(result.body) == [{"name": "Bún Chả", "id": 2}, {"name": "Phở Bò", "id": 1}]
+    assert "X-Next-Cursor" in response.headers
+
+    query_counter.reset()
+    result = json.loads(list_recipes(db, fields="id", include="steps").body)
+    assert query_counter.count == 2
+    assert result[0] == {"id": 1, "steps": [
+        {"step_number": 1, "instruction": "Simmer the broth", "id": 1, "recipe_id": 1},
+        {"step_number": 2, "instruction": "Assemble the bowls", "id": 2, "recipe_id": 1},
+    ]}
+
+    # Every field plus both children is exactly the full representation
+    sparse = list_recipes(db, include="ingredients,steps")
+    assert sparse.body == fastapi_json(List[schemas.Recipe], RecipeService.get_all_recipes(db))
+
+    summaries = recipe_controller.get_recipe_summaries(
+        Response(), skip=0, limit=100, cursor=None, filters=schemas.RecipeFilters(), sort=None,
+        if_none_match=None, db=db
+    )
+    assert summaries.body == fastapi_json(
+        List[schemas.RecipeSummary], RecipeService.get_all_recipes(db)
+    )
+
+    with pytest.raises(HTTPException) as error:
+        list_recipes(db, fields="id,search_text")
+    assert error.value.status_code == 400
+
+
+def test_sparse_fieldsets_have_their_own_etag(db, query_counter):
+    """Each representation gets its own ETag, still checkable with a version-only query"""
+    make_recipe(db, name="Phở Bò")
+    full, sparse = Response(), Response()
+    list_recipes(db, full)
+    list_recipes(db, sparse, fields="id,name")
+    assert full.headers["ETag"] != sparse.headers["ETag"]
+
+    query_counter.reset()
+    result = list_recipes(db, fields="name,id", if_none_match=sparse.headers["ETag"])
+    assert result.status_code == 304 and query_counter.count == 1
+    assert list_recipes(db, fields="id", if_none_match=sparse.headers["ETag"]).status_code == 200
+
+
+def test_batch_get_uses_constant_queries_and_reports_missing(db, query_counter, monkeypatch):
+    """Any number of IDs costs the same queries; order is kept and unknown IDs listed"""
+    ids = [make_recipe(db, name=f"Recipe {i}").id for i in range(6)]
+
+    query_counter.reset()
+    result = recipe_controller.get_recipes_batch(ids=f"{ids[3]},999,{ids[0]},{ids[3]}", db=db)
+    assert query_counter.count == 3
+    assert [recipe.id for recipe in result.recipes] == [ids[3], ids[0]]
+    assert result.missing == [999]
+
+    query_counter.reset()
+    result = recipe_controller.post_recipes_batch(ids, db=db)
+    assert query_counter.count == 3 and len(result.recipes) == 6
+
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", True)
+    expected = fastapi_json(schemas.RecipeBatch, {
+        "recipes": RecipeService.get_recipes_batch(db, [ids[1], 0])[0], "missing": [0]
+    })
+    assert recipe_controller.post_recipes_batch([ids[1], 0], db=db).body == expected
+
+    with pytest.raises(HTTPException) as error:
+        recipe_controller.get_recipes_batch(ids="1,two", db=db)
+    assert error.value.status_code == 400
+
+    recipe_cache.configure(enabled=True)
+    try:
+        RecipeService.get_recipes_batch(db, ids)
+        query_counter.reset()
+        assert len(RecipeService.get_recipes_batch(db, ids)[0]) == 6
+        assert query_counter.count == 0
+    finally:
+        recipe_cache.configure(enabled=False)
+
+
+def test_export_streams_ndjson_in_chunks(db, query_counter):
+    """Each chunk costs one fetch plus one batched query per child table"""
+    for i in range(5):
+        make_recipe(db, name=f"Recipe {i}")
+    expected = b"".join(
+        fastapi_json(schemas.Recipe, recipe) + b"\n" for recipe in RecipeService.get_all_recipes(db)
+    )
+
+    async def read(response):
+        return [chunk async for chunk in response.body_iterator]
+
+    query_counter.reset()
+    response = recipe_controller.export_recipes(chunk_size=2)
+    assert response.media_type == "application/x-ndjson"
+    chunks = asyncio.run(read(response))
+    assert len(chunks) == 3 and b"".join(chunks) == expected
+    assert query_counter.count == 1 + 3 * 2
+
+
+def without_catalog(statements):
+    """Drop the ingredient-catalog lookups and registrations that accompany ingredient writes"""
+    return [sql for sql in statements if "ingredient_aliases" not in sql and "ingredient_catalog" not in sql]
+
+
+def import_request(body, content_type="application/json"):
+    """A raw POST request as the import endpoint receives it"""
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    scope = {"type": "http", "method": "POST", "headers": [(b"content-type", content_type.encode())]}
+    return Request(scope, receive)
+
+
+def test_bulk_import_reports_per_item_errors(db, query_counter):
+    """Valid items are inserted a batch at a time; invalid ones are reported by index"""
+    items = [
+        {"name": "Phở Bò", "cuisine": "Vietnamese", "steps": [{"step_number": 1, "instruction": "Simmer"}],
+         "ingredients": [{"name": "Beef", "quantity": 300, "unit": "g"}]},
+        {"name": "", "servings": 2},
+        {"name": "Bún Chả", "ingredients": [{"name": "Pork", "quantity": 0, "unit": "g"}]},
+        {"name": "Ramen", "servings": 2, "ingredients": [{"name": "Noodles", "quantity": 1, "unit": "pack"}]},
+    ]
+    query_counter.reset()
+    result = asyncio.run(recipe_controller.import_recipes(import_request(json.dumps(items).encode()), db=db))
+    assert result.imported == 2 and [e.index for e in result.errors] == [1, 2]
+    assert "ingredients.0.quantity" in result.errors[1].error
+    # Children go in as one multi-row INSERT per table and nothing is read back
+    # (SQLite returns ordered recipe IDs one row per statement; PostgreSQL batches those too)
+    statements = [sql.split("(")[0].strip() for sql in without_catalog(query_counter.statements)]
+    assert statements.count("INSERT INTO ingredients") == 1
+    assert statements.count("INSERT INTO steps") == 1
+    assert all(sql.startswith("INSERT") for sql in statements)
+
+    recipe = RecipeService.get_recipe(db, result.ids[0])
+    assert recipe.version == 1 and [s.instruction for s in recipe.steps] == ["Simmer"]
+    assert [r.id for r in RecipeService.search_recipes(db, "pho")] == [result.ids[0]]
+    assert [m.id for m in RecipeService.find_recipes_by_ingredients(db, ["noodles"])] == [result.ids[1]]
+
+    body = '{"name": "Gỏi Cuốn"}\n\nnot json\n{"name": "Chè"}\n'.encode()
+    result = asyncio.run(recipe_controller.import_recipes(
+        import_request(body, "application/x-ndjson"), db=db
+    ))
+    assert result.imported == 2 and [e.index for e in result.errors] == [1]
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(recipe_controller.import_recipes(import_request(b'{"name": "x"}'), db=db))
+    assert error.value.status_code == 400
+
+
+def test_async_service_reads_match_sync_service(db):
+    """AsyncRecipeService returns what RecipeService does (needs greenlet and the async driver)"""
+    pytest.importorskip("greenlet")
+    pytest.importorskip("asyncpg" if RecipeService._uses_postgres(db) else "aiosqlite")
+    from backend.database import get_async_sessionmaker
+    from backend.business_layer.async_recipe_service import AsyncRecipeService
+
+    for name in ["Phở Bò", "Bún Chả", "Ramen"]:
+        make_recipe(db, name=name)
+    seed_listing(db)
+    quick = schemas.RecipeFilters(cuisine="Vietnamese", max_total_time=60)
+
+    async def read():
+        sessionmaker = get_async_sessionmaker()
+        try:
+            async with sessionmaker() as session:
+                page, next_cursor = await AsyncRecipeService.get_recipes_page(session, "", 2)
+                filtered = await AsyncRecipeService.get_recipes_page(session, "", 2, quick, "time")
+                filtered_next = await AsyncRecipeService.get_recipes_page(session, filtered[1], 2, quick, "time")
+                offset = await AsyncRecipeService.get_all_recipes(session, 1, 3, quick, "newest")
+                versions = await AsyncRecipeService.get_recipes_versions(session, 0, 2, "", quick, "time")
+                batch, missing = await AsyncRecipeService.get_recipes_batch(session, [3, 99, 1])
+                found = await AsyncRecipeService.search_recipes(session, "pho")
+                return (serialize(page), next_cursor,
+                        [(serialize(p), cursor) for p, cursor in (filtered, filtered_next)],
+                        serialize(offset), versions, batch, missing, serialize(found),
+                        await AsyncRecipeService.get_recipe(session, 2))
+        finally:
+            await sessionmaker.kw["bind"].dispose()
+
+    page, next_cursor, filtered, offset, versions, batch, missing, found, recipe = asyncio.run(read())
+    assert (page, next_cursor) == (serialize(RecipeService.get_recipes_page(db, "", 2)[0]),
+                                   RecipeService.get_recipes_page(db, "", 2)[1])
+    first = RecipeService.get_recipes_page(db, "", 2, quick, "time")
+    second = RecipeService.get_recipes_page(db, first[1], 2, quick, "time")
+    assert filtered == [(serialize(p), cursor) for p, cursor in (first, second)]
+    assert [r.name for r in filtered[0][0] + filtered[1][0]] == ["Phở Bò", "Bún Chả", "Ramen", "Bánh Mì"]
+    assert offset == serialize(RecipeService.get_all_recipes(db, 1, 3, quick, "newest"))
+    assert versions == RecipeService.get_recipes_versions(db, 0, 2, "", quick, "time")
+    assert (batch, missing) == RecipeService.get_recipes_batch(db, [3, 99, 1])
+    assert found == serialize(RecipeService.search_recipes(db, "pho"))
+    assert recipe == RecipeService.get_recipe(db, 2)
+
+
+def test_async_list_endpoint_applies_filters_and_sort(db, monkeypatch):
+    """In async mode GET /api/recipes filters and sorts like the sync endpoint"""
+    pytest.importorskip("greenlet")
+    pytest.importorskip("asyncpg" if RecipeService._uses_postgres(db) else "aiosqlite")
+    import importlib
+    from fastapi.testclient import TestClient
+    import backend.database
+    import backend.main
+
+    seed_listing(db)
+    monkeypatch.setattr(config, "ASYNC_DATABASE", True)
+    monkeypatch.setattr(backend.database, "_async_sessionmaker", None)
+    try:
+        with TestClient(importlib.reload(backend.main).app) as client:
+            response = client.get("/api/recipes", params={"cuisine": "Vietnamese", "sort": "time", "limit": 2,
+                                                          "cursor": "", "max_total_time": 60})
+            pages = [response.json()]
+            pages.append(client.get("/api/recipes", params={
+                "cuisine": "Vietnamese", "sort": "time", "limit": 2, "max_total_time": 60,
+                "cursor": response.headers["X-Next-Cursor"]
+            }).json())
+            bad_range = client.get("/api/recipes", params={"min_total_time": 30, "max_total_time": 10})
+            client.portal.call(backend.database.get_async_sessionmaker().kw["bind"].dispose)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(backend.main)
+
+    assert [[r["name"] for r in page] for page in pages] == [["Bánh Mì", "Gỏi Cuốn"], ["Cà Ri Gà"]]
+    assert bad_range.status_code == 400
+
+
+def test_service_writes_commit_once_and_roll_back_atomically(db, query_counter):
+    """Each write is one transaction: one commit, no read-back, nothing left on failure"""
+    from sqlalchemy import event
+
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+
+    query_counter.reset()
+    recipe = make_recipe(db, name="Phở Bò")
+    assert len(commits) == 1
+    assert all(sql.startswith("INSERT") for sql in without_catalog(query_counter.statements))
+    assert [i.id for i in recipe.ingredients] and recipe.version == 1
+
+    commits.clear()
+    RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(
+        servings=4, ingredients=[schemas.IngredientCreate(name="Chicken", quantity=1, unit="kg")],
+        steps=[schemas.StepCreate(step_number=1, instruction="Poach")]
+    ))
+    assert len(commits) == 1
+
+    def fail(session, context):
+        raise RuntimeError("connection lost")
+
+    event.listen(db, "after_flush", fail)
+    with pytest.raises(RuntimeError):
+        RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(
+            name="Phở Gà", ingredients=[schemas.IngredientCreate(name="Duck", quantity=1, unit="kg")]
+        ))
+    with pytest.raises(RuntimeError):
+        make_recipe(db, name="Bún Chả")
+    event.remove(db, "after_flush", fail)
+
+    stored = RecipeService.get_recipe(db, recipe.id)
+    assert (stored.name, stored.servings, stored.version) == ("Phở Bò", 4, 2)
+    assert [i.name for i in stored.ingredients] == ["Chicken"]
+    assert [r.name for r in RecipeService.get_all_recipes(db)] == ["Phở Bò"]
+    assert RecipeService.search_recipes(db, "ga") == []
+
+
+def written_tables(statements):
+    """Sorted 'VERB table' of every write among the recorded statements"""
+    return sorted(
+        " ".join(sql.replace("INSERT INTO", "INSERT").replace("DELETE FROM", "DELETE").split()[:2])
+        for sql in statements if not sql.startswith("SELECT")
+    )
+
+
+def test_update_writes_only_the_rows_that_changed(db, query_counter):
+    """PUT diffs children: one changed quantity is one UPDATE, ids survive, no-ops keep the version"""
+    recipe = make_recipe(db, name="Phở Bò", ingredients=[
+        ("Beef", 300.0, "g"), ("Rice noodles", 200.0, "g"), ("Star anise", 3.0, "pieces"),
+    ], steps=["Char the onions", "Simmer the broth", "Assemble the bowls"])
+    ingredients = [(i.name, i.quantity, i.unit) for i in recipe.ingredients]
+    steps = [schemas.StepCreate(step_number=s.step_number, instruction=s.instruction) for s in recipe.steps]
+
+    query_counter.reset()
+    ingredients[1] = ("Rice noodles", 400.0, "g")
+    updated = RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(
+        ingredients=[schemas.IngredientCreate(name=n, quantity=q, unit=u) for n, q, u in ingredients],
+        steps=steps
+    ))
+    assert written_tables(query_counter.statements) == ["UPDATE ingredients", "UPDATE recipes"]
+    assert [i.id for i in updated.ingredients] == [i.id for i in recipe.ingredients]
+    assert updated.ingredients[1].quantity == 400.0 and updated.version == 2
+
+    # Dropping one step and rewording another touches just those two rows
+    query_counter.reset()
+    steps = [steps[0], schemas.StepCreate(step_number=2, instruction="Simmer for six hours")]
+    updated = RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(steps=steps))
+    assert written_tables(query_counter.statements) == ["DELETE steps", "UPDATE recipes", "UPDATE steps"]
+    assert [s.instruction for s in updated.steps] == ["Char the onions", "Simmer for six hours"]
+    assert [r.id for r in RecipeService.search_recipes(db, "six hours")] == [recipe.id]
+
+    unchanged = RecipeService.update_recipe(db, recipe.id, schemas.RecipeUpdate(name="Phở Bò", steps=steps))
+    assert unchanged.version == 3
+
+
+def test_single_ingredient_and_step_endpoints(db):
+    """Add, edit and remove one child at a time; each bumps the version"""
+    recipe = make_recipe(db, name="Phở Bò")
+    updated = recipe_controller.add_ingredient(
+        recipe.id, schemas.IngredientCreate(name="Quế", quantity=1, unit="stick"), db=db
+    )
+    assert [i.name for i in updated.ingredients][-1] == "Quế" and updated.version == 2
+    assert [m.id for m in RecipeService.find_recipes_by_ingredients(db, ["que"])] == [recipe.id]
+
+    cinnamon = updated.ingredients[-1].id
+    updated = recipe_controller.update_ingredient(
+        recipe.id, cinnamon, schemas.IngredientUpdate(quantity=2), db=db
+    )
+    assert (updated.ingredients[-1].name, updated.ingredients[-1].quantity) == ("Quế", 2)
+    updated = recipe_controller.remove_ingredient(recipe.id, cinnamon, db=db)
+    assert "Quế" not in [i.name for i in updated.ingredients] and updated.version == 4
+
+    updated = recipe_controller.add_step(
+        recipe.id, schemas.StepCreate(step_number=3, instruction="Garnish with basil"), db=db
+    )
+    basil = updated.steps[-1].id
+    updated = recipe_controller.update_step(recipe.id, basil, schemas.StepUpdate(step_number=4), db=db)
+    assert [s.step_number for s in updated.steps] == [1, 2, 4]
+    updated = recipe_controller.remove_step(recipe.id, updated.steps[0].id, db=db)
+    assert [s.instruction for s in RecipeService.get_recipe(db, recipe.id).steps] == [
+        "Assemble the bowls", "Garnish with basil"
+    ]
+
+    for call, status in [
+        (lambda: recipe_controller.add_step(
+            recipe.id, schemas.StepCreate(step_number=2, instruction="Again"), db=db), 400),
+        (lambda: recipe_controller.update_ingredient(
+            recipe.id, 999, schemas.IngredientUpdate(quantity=1), db=db), 404),
+        (lambda: recipe_controller.remove_step(999, basil, db=db), 404),
+    ]:
+        with pytest.raises(HTTPException) as error:
+            call()
+        assert error.value.status_code == status
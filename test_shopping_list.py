@@ -0,0 +1,409 @@
+# Shopping list and pantry tests (run against the SQLite test database from conftest.py)
+import random
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from backend import schemas
+from backend.database import SessionLocal
+from backend.models import Ingredient
+from backend.business_layer import MealPlanService, PantryService, RecipeService, ShoppingListService
+from backend.business_layer import meal_planner
+from backend.business_layer.meal_planner import search_plan, shutdown_pool
+from backend.business_layer.recipe_cache import plan_memo, recipe_cache, scale_memo
+from backend.presentation_layer import meal_plan_controller
+from backend.text_utils import ingredient_key
+from backend.units import for_display, from_canonical, to_canonical
+from test_recipes import make_recipe, without_catalog
+
+
+def as_tuples(items):
+    return [(item.name, item.unit, pytest.approx(item.quantity)) for item in items]
+
+
+def test_shopping_list_sql_matches_reference(db, query_counter):
+    """One aggregate query gives what the pure-Python reference computes"""
+    rng = random.Random(16)
+    names = ["Beef", "Onion", "Fish sauce", "Rice noodles", "Basil", "Lime", "Sugar", "onions"]
+    units = ["g", "kg", "tbsp"]
+    recipe_ids = [
+        make_recipe(db, name=f"Recipe {i}", ingredients=[
+            (rng.choice(names), round(rng.uniform(0.5, 500), 2), rng.choice(units))
+            for _ in range(rng.randint(1, 6))
+        ]).id
+        for i in range(12)
+    ]
+    for name in names[:5]:
+        PantryService.create_pantry_item(db, schemas.PantryCreate(
+            name=name, quantity=round(rng.uniform(1, 400), 2), unit=rng.choice(units)
+        ))
+
+    Entry = schemas.ShoppingListEntry
+    requests = [
+        recipe_ids,
+        [recipe_ids[3], recipe_ids[3], recipe_ids[0], 999],
+        rng.sample(recipe_ids, 5) * 2,
+        [],
+        [Entry(recipe_id=recipe_ids[1], servings=6), recipe_ids[2], Entry(recipe_id=recipe_ids[1], multiplier=0.5)],
+        [Entry(recipe_id=recipe_id, multiplier=rng.uniform(0.2, 3)) for recipe_id in recipe_ids],
+    ]
+    for requested in requests:
+        expected = ShoppingListService.generate_shopping_list_reference(db, requested)
+        query_counter.reset()
+        result = ShoppingListService.generate_shopping_list(db, requested)
+        assert query_counter.count == (1 if requested else 0)
+        assert as_tuples(result) == as_tuples(expected)
+
+
+def test_units_convert_within_a_dimension():
+    assert to_canonical(1.5, "kg") == (1500.0, "g")
+    assert to_canonical(2, "Tbsp.") == (pytest.approx(29.5735), "ml")
+    assert to_canonical(3, "Stalks") == (3, "stalks")
+    assert for_display(1500.0, "g") == (1.5, "kg")
+    assert for_display(250.0, "ml") == (250.0, "ml")
+    assert from_canonical(1500.0, "kg") == 1.5
+
+
+def test_shopping_list_adds_compatible_units(db):
+    """500 g + 1 kg of beef is 1.5 kg; pantry stock in kg offsets a recipe in g"""
+    first = make_recipe(db, name="Bò kho", ingredients=[("Beef", 500.0, "g"), ("Onion", 2.0, "pieces")])
+    second = make_recipe(db, name="Phở Bò", ingredients=[("Beef", 1.0, "kg"), ("Onion", 1.0, "piece")])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Onion", quantity=1.0, unit="pc"))
+
+    result = ShoppingListService.generate_shopping_list(db, [first.id, second.id])
+    assert as_tuples(result) == [("Beef", "kg", 1.5), ("Onion", "piece", 2.0)]
+
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Beef", quantity=0.5, unit="kg"))
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Beef", quantity=200.0, unit="g"))
+    result = ShoppingListService.generate_shopping_list(db, [first.id, second.id])
+    assert as_tuples(result) == [("Beef", "g", 800.0), ("Onion", "piece", 2.0)]
+
+
+def test_scale_recipe_merges_lines_in_compatible_units(db):
+    recipe = make_recipe(db, ingredients=[
+        ("Beef", 300.0, "g"), ("Fish sauce", 2.0, "tbsp"), ("Beef", 0.2, "kg")
+    ])
+    scaled = RecipeService.scale_recipe(db, recipe.id, 2.0)
+    assert [(i["name"], i["unit"], pytest.approx(i["quantity"])) for i in scaled["ingredients"]] == [
+        ("Beef", "g", 1000.0), ("Fish sauce", "tbsp", 4.0)
+    ]
+
+
+def test_shopping_list_scales_by_servings_or_multiplier(db):
+    recipe = make_recipe(db, servings=4, ingredients=[("Beef", 400.0, "g"), ("Lime", 2.0, "pieces")])
+    Entry = schemas.ShoppingListEntry
+
+    result = ShoppingListService.generate_shopping_list(db, [Entry(recipe_id=recipe.id, servings=6)])
+    assert as_tuples(result) == [("Beef", "g", 600.0), ("Lime", "piece", 3.0)]
+
+    result = ShoppingListService.generate_shopping_list(db, [recipe.id, Entry(recipe_id=recipe.id, multiplier=2.5)])
+    assert as_tuples(result) == [("Beef", "kg", 1.4), ("Lime", "piece", 7.0)]
+
+    with pytest.raises(ValueError):
+        Entry(recipe_id=recipe.id, servings=2, multiplier=2)
+
+
+def test_meal_plan_sized_shopping_list_is_one_query(db, query_counter):
+    """Hundreds of recipes and thousands of ingredient rows still aggregate in a single statement"""
+    rng = random.Random(18)
+    rows = [
+        {"name": f"Plan {i}", "servings": rng.randint(1, 6), "ingredients": [
+            {"name": f"Item {rng.randrange(150)}", "quantity": rng.randint(1, 500), "unit": rng.choice(["g", "kg", "ml"])}
+            for _ in range(10)
+        ], "steps": []}
+        for i in range(300)
+    ]
+    recipe_ids, errors = RecipeService.import_recipes(db, list(enumerate(rows)))
+    assert not errors
+    plan = [schemas.ShoppingListEntry(recipe_id=recipe_id, servings=rng.randint(1, 8)) for recipe_id in recipe_ids]
+
+    expected = ShoppingListService.generate_shopping_list_reference(db, plan)
+    query_counter.reset()
+    result = ShoppingListService.generate_shopping_list(db, plan)
+    assert query_counter.count == 1
+    assert as_tuples(result) == as_tuples(expected)
+
+
+def test_search_plan_prefers_recipes_that_use_the_pantry():
+    # keys: 0 beef (in pantry), 1 basil (in pantry), 2 saffron, 3 lobster
+    recipes = [
+        (array("i", [2, 3]), array("d", [1.0, 500.0])),
+        (array("i", [0]), array("d", [400.0])),
+        (array("i", [0, 1]), array("d", [300.0, 20.0])),
+        (array("i", [3]), array("d", [800.0])),
+    ]
+    pantry = array("d", [700.0, 20.0, 0.0, 0.0])
+    assert sorted(search_plan(recipes, pantry, days=2, time_budget=0.5)) == [1, 2]
+
+
+def test_search_plan_fills_every_day_when_out_of_time():
+    recipes = [(array("i", [row % 3]), array("d", [float(row + 1)])) for row in range(6)]
+    plan = search_plan(recipes, array("d", [1.0, 1.0, 1.0]), days=4, time_budget=0)
+    assert plan == [0, 1, 2, 3]
+
+
+def test_search_plan_checks_the_deadline_per_candidate(monkeypatch):
+    """A large catalog cannot overrun the budget inside one day's candidate scan"""
+    from types import SimpleNamespace
+
+    clock, scored = [0.0], []
+
+    def tick():
+        clock[0] += 1.0
+        return clock[0]
+
+    def delta(needed, pantry, recipe, sign):
+        scored.append(recipe)
+        return 0.0
+
+    monkeypatch.setattr(meal_planner, "time", SimpleNamespace(monotonic=tick))
+    monkeypatch.setattr(meal_planner, "_delta", delta)
+    recipes = [(array("i", [0]), array("d", [1.0])) for _ in range(5000)]
+    plan = search_plan(recipes, array("d", [1.0]), days=3, time_budget=10)
+    assert len(set(plan)) == 3
+    assert len(scored) < 20
+
+
+def matrix_reads(statements):
+    """The planner's ingredient-row reads (they select the recipe version alongside)"""
+    return [sql for sql in statements if "FROM ingredients JOIN recipes" in sql and "recipes.version" in sql]
+
+
+def test_meal_plan_rereads_only_changed_recipes(db, query_counter, monkeypatch):
+    from backend import config
+
+    monkeypatch.setattr(config, "MEAL_PLAN_PROCESSES", 0)
+    recipes = [
+        make_recipe(db, name=f"Plan {i}", ingredients=[("Beef", 100.0 * (i + 1), "g"), ("Lime", 1.0, "piece")])
+        for i in range(4)
+    ]
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Beef", quantity=0.2, unit="kg"))
+    request = schemas.MealPlanRequest(days=2, servings=2)
+    uncached = MealPlanService.plan_meals(db, request)
+
+    plan_memo.configure(enabled=True)
+    try:
+        assert MealPlanService.plan_meals(db, request) == uncached
+        query_counter.reset()
+        assert MealPlanService.plan_meals(db, request) == uncached
+        assert not matrix_reads(query_counter.statements)
+
+        RecipeService.add_ingredient(db, recipes[3].id, schemas.IngredientCreate(name="Basil", quantity=5, unit="g"))
+        RecipeService.delete_recipe(db, recipes[0].id)
+        query_counter.reset()
+        plan = MealPlanService.plan_meals(db, request)
+        reads = matrix_reads(query_counter.statements)
+        assert len(reads) == 1 and reads[0].count("?") + reads[0].count("%(") == 1
+        assert recipes[0].id not in [recipe.id for recipe in plan.recipes]
+        assert plan_memo.stats()["size"] == 3  # one entry per recipe: replaced on edit, dropped on delete
+    finally:
+        plan_memo.configure(enabled=False)
+
+
+def test_meal_plan_timeout_is_a_503(db, monkeypatch):
+    make_recipe(db, name="Bò lúc lắc", ingredients=[("Beef", 400.0, "g")])
+    monkeypatch.setattr(meal_planner, "RESULT_GRACE_SECONDS", 0)
+    try:
+        # A fresh worker process cannot even start within a 1 ms allowance
+        with pytest.raises(HTTPException) as exc_info:
+            meal_plan_controller.plan_meals(schemas.MealPlanRequest(days=1, time_budget_ms=1), db=db)
+        assert exc_info.value.status_code == 503
+    finally:
+        shutdown_pool()
+
+
+def test_meal_plan_runs_in_the_process_pool(db):
+    beef = make_recipe(db, name="Bò lúc lắc", ingredients=[("Beef", 400.0, "g"), ("Garlic", 2.0, "pieces")])
+    make_recipe(db, name="Tôm hùm", ingredients=[("Lobster", 1.0, "kg"), ("Butter", 50.0, "g")])
+    basil = make_recipe(db, name="Phở Bò", servings=2, ingredients=[("Beef", 0.3, "kg"), ("Basil", 20.0, "g")])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Beef", quantity=1.0, unit="kg"))
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Basil", quantity=10.0, unit="g"))
+
+    try:
+        plan = MealPlanService.plan_meals(db, schemas.MealPlanRequest(days=2, time_budget_ms=200))
+        assert sorted(recipe.id for recipe in plan.recipes) == sorted([beef.id, basil.id])
+        assert as_tuples(plan.shopping_list) == as_tuples(
+            ShoppingListService.generate_shopping_list(db, [recipe.id for recipe in plan.recipes])
+        )
+
+        with pytest.raises(ValueError):
+            MealPlanService.plan_meals(db, schemas.MealPlanRequest(days=4))
+    finally:
+        shutdown_pool()
+
+
+def test_bulk_pantry_add_is_one_upsert(db, query_counter):
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Beef", quantity=0.5, unit="kg"))
+    items = [schemas.PantryCreate(name=f"Item {i}", quantity=1.0, unit="g") for i in range(300)]
+    items += [
+        schemas.PantryCreate(name="Beef", quantity=200.0, unit="g"),
+        schemas.PantryCreate(name="Item 7", quantity=2.0, unit="kg"),
+        schemas.PantryCreate(name="Lime", quantity=3.0, unit="pieces"),
+    ]
+
+    query_counter.reset()
+    stocked = PantryService.add_pantry_items(db, items)
+    assert [sql.split()[0] for sql in without_catalog(query_counter.statements)] == ["INSERT"]
+    assert [item.name for item in stocked][-2:] == ["Beef", "Lime"]
+    by_name = {item.name: item for item in PantryService.get_all_pantry_items(db)}
+    assert len(by_name) == 302
+    assert (by_name["Beef"].quantity, by_name["Beef"].unit) == (pytest.approx(700.0), "g")
+    assert (by_name["Item 7"].quantity, by_name["Item 7"].unit) == (pytest.approx(2.001), "kg")
+    assert by_name["Item 7"].canonical_quantity == pytest.approx(2001.0)
+
+
+def test_concurrent_pantry_adds_do_not_lose_updates(db):
+    """Adds of one new name from parallel sessions all land (no unique-constraint error)"""
+    def add():
+        session = SessionLocal()
+        try:
+            PantryService.create_pantry_item(session, schemas.PantryCreate(name="Rice", quantity=1.0, unit="kg"))
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [pool.submit(add) for _ in range(8)]:
+            future.result()
+    (rice,) = PantryService.get_all_pantry_items(db)
+    assert (rice.quantity, rice.canonical_quantity) == (pytest.approx(8.0), pytest.approx(8000.0))
+
+
+def test_cook_recipe_decrements_pantry_in_one_update(db, query_counter):
+    recipe = make_recipe(db, servings=2, ingredients=[
+        ("Beef", 300.0, "g"), ("Basil", 20.0, "g"), ("Lime", 2.0, "pieces"), ("Beef", 0.1, "kg")
+    ])
+    PantryService.add_pantry_items(db, [
+        schemas.PantryCreate(name="Beef", quantity=1.0, unit="kg"),
+        schemas.PantryCreate(name="Basil", quantity=30.0, unit="g"),
+        schemas.PantryCreate(name="Lime", quantity=1.0, unit="tbsp"),
+    ])
+
+    query_counter.reset()
+    cooked = PantryService.cook_recipe(db, recipe.id, servings=3)
+    pantry_writes = [s for s in query_counter.statements if s.lstrip().upper().startswith(("UPDATE", "DELETE"))]
+    assert [s.split()[0].upper() for s in pantry_writes] == ["UPDATE"]
+    assert as_tuples(cooked.used) == [("Beef", "g", 600.0), ("Basil", "g", 30.0)]
+    assert as_tuples(cooked.shortfall) == [("Lime", "piece", 3.0)]
+
+    stock = {item.name: item for item in PantryService.get_all_pantry_items(db)}
+    assert sorted(stock) == ["Basil", "Beef", "Lime"]  # the used-up basil stays, at 0
+    assert stock["Basil"].quantity == pytest.approx(0.0)
+    assert RecipeService.rank_by_pantry_coverage(db)[0].missing_ingredients == ["basil"]
+    assert (stock["Beef"].quantity, stock["Beef"].unit) == (pytest.approx(0.4), "kg")
+    assert stock["Beef"].canonical_quantity == pytest.approx(400.0)
+    assert PantryService.cook_recipe(db, 999) is None
+
+
+def test_concurrent_cooks_do_not_lose_updates(db):
+    recipe = make_recipe(db, ingredients=[("Rice", 100.0, "g")])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Rice", quantity=1.0, unit="kg"))
+
+    def cook():
+        session = SessionLocal()
+        try:
+            return PantryService.cook_recipe(session, recipe.id)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = [future.result() for future in [pool.submit(cook) for _ in range(6)]]
+    assert all(not result.shortfall for result in results)
+    (rice,) = PantryService.get_all_pantry_items(db)
+    assert rice.quantity == pytest.approx(0.4)
+
+
+def test_catalog_matches_spellings_of_one_ingredient(db, query_counter):
+    assert [ingredient_key(name) for name in ("Onions", "Hành tây", "Cherry Tomatoes", "Berries", "Grass")] == [
+        "onion", "hanh tay", "cherry tomato", "berry", "grass"
+    ]
+    first = make_recipe(db, name="Bò kho", ingredients=[("Onion", 2.0, "pieces"), ("Beef", 500.0, "g")])
+    second = make_recipe(db, name="Cà ri", ingredients=[("onions", 1.0, "piece"), ("ONION", 1.0, "each")])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="onion", quantity=1.0, unit="pc"))
+
+    result = ShoppingListService.generate_shopping_list(db, [first.id, second.id])
+    assert as_tuples(result) == [("Onion", "piece", 3.0), ("Beef", "g", 500.0)]
+    assert as_tuples(result) == as_tuples(
+        ShoppingListService.generate_shopping_list_reference(db, [first.id, second.id])
+    )
+
+    # Known spellings resolve with a single alias lookup and register nothing
+    query_counter.reset()
+    make_recipe(db, name="Súp hành", ingredients=[("Onions", 3.0, "pieces")])
+    catalog_statements = [sql for sql in query_counter.statements if sql not in without_catalog([sql])]
+    assert [sql.split()[0] for sql in catalog_statements] == ["SELECT"]
+
+    # Pantry items are unique per catalog entry: a second spelling adds to the first
+    PantryService.add_pantry_items(db, [
+        schemas.PantryCreate(name="Salt", quantity=10.0, unit="g"),
+        schemas.PantryCreate(name="salt", quantity=5.0, unit="g"),
+    ])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="SALT", quantity=1.0, unit="g"))
+    salt = [item for item in PantryService.get_all_pantry_items(db) if ingredient_key(item.name) == "salt"]
+    assert [(item.name, item.quantity) for item in salt] == [("Salt", pytest.approx(16.0))]
+
+    # Pantry coverage matches on the catalog key too
+    ranked = {match.id: match for match in RecipeService.rank_by_pantry_coverage(db)}
+    assert ranked[second.id].coverage == 1.0
+    assert ranked[first.id].missing_ingredients == ["beef"]
+
+
+def test_unlinked_ingredients_still_count(db):
+    """Rows without a catalog_id match through their spelling's alias, or stand alone"""
+    recipe = make_recipe(db, name="Canh chua", ingredients=[("Tamarind", 2.0, "pieces"), ("tamarind", 1.0, "piece")])
+    PantryService.create_pantry_item(db, schemas.PantryCreate(name="Tamarind", quantity=1.0, unit="pc"))
+    # Written outside the services: one known spelling and one the catalog has never seen
+    db.query(Ingredient).filter(Ingredient.name == "tamarind").update({Ingredient.catalog_id: None})
+    db.add(Ingredient(
+        recipe_id=recipe.id, name="Galangal", quantity=30.0, unit="g",
+        normalized_name="galangal", canonical_quantity=30.0, canonical_unit="g"
+    ))
+    db.commit()
+
+    result = ShoppingListService.generate_shopping_list(db, [recipe.id])
+    assert as_tuples(result) == [("Tamarind", "piece", 2.0), ("Galangal", "g", 30.0)]
+    assert as_tuples(result) == as_tuples(ShoppingListService.generate_shopping_list_reference(db, [recipe.id]))
+
+    cooked = PantryService.cook_recipe(db, recipe.id)
+    assert as_tuples(cooked.used) == [("Tamarind", "piece", 1.0)]
+    assert as_tuples(cooked.shortfall) == [("Tamarind", "piece", 2.0), ("Galangal", "g", 30.0)]
+
+def test_batch_scaling_memoizes_base_quantities_by_version(db, query_counter):
+    first = make_recipe(db, servings=2, ingredients=[("Beef", 300.0, "g"), ("Beef", 0.2, "kg"), ("Lime", 1.0, "piece")])
+    second = make_recipe(db, name="Bún Chả", servings=4, ingredients=[("Pork", 1.0, "kg")])
+    recipe_cache.configure(enabled=True)
+    scale_memo.configure(enabled=True)
+    try:
+        RecipeService.get_recipes_batch(db, [first.id, second.id])  # warm the recipe cache
+
+        query_counter.reset()
+        results, missing = RecipeService.scale_recipes(db, [(first.id, 2.0), (second.id, 0.5), (999, 1.0)])
+        assert query_counter.count == 2  # versions of the uncached ID, then one prefetch of rows
+        assert missing == [999]
+        assert [(r.recipe_id, r.scaled_servings) for r in results] == [(first.id, 4), (second.id, 2)]
+        assert [(i.name, i.unit, pytest.approx(i.quantity)) for i in results[0].ingredients] == [
+            ("Beef", "g", 1000.0), ("Lime", "piece", 2.0)
+        ]
+
+        query_counter.reset()
+        results, _ = RecipeService.scale_recipes(db, [(second.id, 1.5), (first.id, 3.0), (second.id, 2.0)])
+        assert query_counter.count == 0
+        assert [pytest.approx(r.ingredients[0].quantity) for r in results] == [1.5, 1500.0, 2.0]
+
+        RecipeService.update_ingredient(db, second.id, second.ingredients[0].id,
+                                        schemas.IngredientUpdate(quantity=2.0))
+        results, _ = RecipeService.scale_recipes(db, [(second.id, 1.5)])
+        assert results[0].ingredients[0].quantity == pytest.approx(3.0)
+        assert RecipeService.scale_recipe(db, second.id, 1.5)["ingredients"][0]["quantity"] == pytest.approx(3.0)
+
+        # A deleted recipe's entry goes with it: SQLite hands its ID to the next recipe at version 1
+        RecipeService.scale_recipes(db, [(first.id, 1.0)])
+        RecipeService.delete_recipe(db, second.id)
+        RecipeService.delete_recipe(db, first.id)
+        reused = make_recipe(db, name="Gỏi Cuốn", servings=2, ingredients=[("Shrimp", 100.0, "g")])
+        results, _ = RecipeService.scale_recipes(db, [(reused.id, 2.0)])
+        assert [(i.name, i.quantity) for i in results[0].ingredients] == [("Shrimp", pytest.approx(200.0))]
+    finally:
+        recipe_cache.configure(enabled=False)
+        scale_memo.configure(enabled=False)